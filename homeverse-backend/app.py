@@ -1,12 +1,31 @@
-from flask import Flask, request, jsonify
+import time
+from startup import StartupTimeline
+startup = StartupTimeline()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+startup.mark('flask imported')
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-import json
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
+startup.mark('numpy imported')
+from datetime import date, datetime
+import hmac
 import os
+from ml_model import PropertyPricePredictor, DEFAULT_MODEL_PATH, SPREAD_QUANTILES
+from market_seed import NAGPUR_ZONES, LANDMARKS
+from market_store import MarketDataStore, DEFAULT_MARKET_DATA_PATH
+from prediction_cache import PredictionCache
+from catalog_cache import CatalogCache
+from process_stats import memory_usage
+from inference_scheduler import MicroBatcher
+from market_series import MarketSeriesStore
+import scenarios
+from retraining import ModelRetrainer
+from city_registry import City, CityRegistry, UnknownCityError
+from comparables import ComparablesIndex, MAX_COMPARABLES
+from metrics import MetricsRegistry, StageTimer, STAGE_BUCKETS, null_stage
+from profiler import SamplingProfiler
+startup.mark('app modules imported')
 
 app = Flask(__name__)
 
@@ -15,278 +34,311 @@ CORS(app, resources={
     r"/*": {
         "origins": "*",
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "allow_headers": ["Content-Type", "X-Admin-Token", "X-Profile"]
     }
 })
 
-# Initialize ML model
-class PropertyPricePredictor:
-    def __init__(self):
-        self.model = None
-        self.scaler = StandardScaler()
-        self.is_trained = False
-        self.train_model()
-    
-    def generate_training_data(self):
-        """Generate training data based on 2025-2026 Nagpur market"""
-        np.random.seed(42)
-        n_samples = 2000
-        
-        data = []
-        # Updated 2025-2026 rates per sqft
-        zones = {
-            'central': 7200, 
-            'east': 5800, 
-            'west': 8500, 
-            'south': 6500, 
-            'north': 4800, 
-            'outskirts': 3500
-        }
-        
-        for _ in range(n_samples):
-            zone = np.random.choice(list(zones.keys()))
-            base_rate = zones[zone]
-            
-            bedrooms = np.random.choice([1, 2, 3, 4, 5], p=[0.08, 0.32, 0.38, 0.18, 0.04])
-            sqft = np.random.randint(450, 3500)
-            property_type = np.random.choice([0.88, 1.0, 1.18, 1.32, 1.55], p=[0.08, 0.52, 0.22, 0.12, 0.06])
-            age = np.random.choice([1.15, 1.08, 1.0, 0.92, 0.82], p=[0.18, 0.28, 0.32, 0.16, 0.06])
-            floor = np.random.randint(0, 18)
-            amenities_count = np.random.randint(0, 8)
-            
-            # Market-realistic multipliers
-            floor_mult = 0.92 if floor == 0 else 1.0 if floor <= 3 else 1.06 if floor <= 7 else 1.12 if floor <= 12 else 1.08
-            amenities_mult = 1.0 + (amenities_count * 0.015)
-            
-            # Realistic price calculation
-            price = base_rate * sqft * (0.85 + bedrooms * 0.08) * property_type * age * floor_mult * amenities_mult
-            price += np.random.normal(0, price * 0.08)  # Market variation
-            
-            data.append([
-                list(zones.keys()).index(zone),
-                bedrooms,
-                sqft,
-                property_type,
-                age,
-                floor,
-                amenities_count,
-                price
-            ])
-        
-        return pd.DataFrame(data, columns=[
-            'zone', 'bedrooms', 'sqft', 'property_type', 'age', 'floor', 'amenities_count', 'price'
-        ])
-    
-    def train_model(self):
-        """Train the ML model"""
-        print("🤖 Training ML model with 2025-2026 market data...")
-        
-        df = self.generate_training_data()
-        X = df.drop('price', axis=1)
-        y = df['price']
-        
-        X_scaled = self.scaler.fit_transform(X)
-        
-        self.model = RandomForestRegressor(
-            n_estimators=150,
-            max_depth=25,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
-        )
-        self.model.fit(X_scaled, y)
-        self.is_trained = True
-        
-        print("✅ ML model trained with 2025-2026 data!")
-    
-    def predict(self, features):
-        """Make prediction"""
-        if not self.is_trained:
-            self.train_model()
-        
-        features_scaled = self.scaler.transform([features])
-        prediction = self.model.predict(features_scaled)[0]
-        
-        importance = dict(zip(
-            ['zone', 'bedrooms', 'sqft', 'property_type', 'age', 'floor', 'amenities'],
-            self.model.feature_importances_
-        ))
-        
-        return prediction, importance
-
-# Initialize predictor
-ml_predictor = PropertyPricePredictor()
-
-# ACCURATE NAGPUR REAL ESTATE DATA (2025-2026)
-NAGPUR_ZONES = {
-    'central': {
-        'name': 'Central Nagpur',
-        'base_price': 7200,  # ₹7,200 per sqft average
-        'localities': {
-            'Sitabuldi': 8200,
-            'Dharampeth': 7800,
-            'Mahal': 6200,
-            'Gandhibagh': 6500,
-            'Bajaj Nagar': 7000,
-            'Ramdaspeth': 7500,
-            'Civil Lines': 8000,
-            'Sadar': 6800,
-            'Mominpura': 5800,
-            'Itwari': 6000,
-            'Jaripatka': 6500
-        },
-        'growth_rate': 9.2,
-        'demand_index': 88,
-        'supply_index': 58,
-        'avg_price_1bhk': 3500000,  # ₹35 Lakhs
-        'avg_price_2bhk': 5500000,  # ₹55 Lakhs
-        'avg_price_3bhk': 8000000,  # ₹80 Lakhs
-    },
-    'east': {
-        'name': 'East Nagpur',
-        'base_price': 5800,  # ₹5,800 per sqft
-        'localities': {
-            'Laxmi Nagar': 6200,
-            'Shankar Nagar': 6500,
-            'Mankapur': 5200,
-            'Pratap Nagar': 5500,
-            'Besa': 4800,
-            'Cotton Market': 5600,
-            'Nandanvan': 6000,
-            'Ajni': 5000
-        },
-        'growth_rate': 7.8,
-        'demand_index': 76,
-        'supply_index': 68,
-        'avg_price_1bhk': 2800000,
-        'avg_price_2bhk': 4200000,
-        'avg_price_3bhk': 6000000,
-    },
-    'west': {
-        'name': 'West Nagpur',
-        'base_price': 8500,  # ₹8,500 per sqft (Premium)
-        'localities': {
-            'Seminary Hills': 11000,
-            'Dhantoli': 9500,
-            'Hanuman Nagar': 8000,
-            'CA Road': 9800,
-            'Gokulpeth': 8200,
-            'Ramnagar': 7500,
-            'South Ambazari Road': 9200,
-            'Futala Lake Area': 10500
-        },
-        'growth_rate': 11.5,
-        'demand_index': 95,
-        'supply_index': 45,
-        'avg_price_1bhk': 4500000,
-        'avg_price_2bhk': 7000000,
-        'avg_price_3bhk': 10500000,
-    },
-    'south': {
-        'name': 'South Nagpur',
-        'base_price': 6500,  # ₹6,500 per sqft (Rapidly growing)
-        'localities': {
-            'Wadi': 5800,
-            'Hingna': 5500,
-            'MIHAN': 7200,
-            'Airport Area': 7000,
-            'Telephone Exchange Square': 6000,
-            'Pachpaoli': 5600,
-            'Vayusena Nagar': 6200,
-            'Sonegaon': 6800
-        },
-        'growth_rate': 12.8,  # Highest growth due to MIHAN
-        'demand_index': 90,
-        'supply_index': 70,
-        'avg_price_1bhk': 3200000,
-        'avg_price_2bhk': 5000000,
-        'avg_price_3bhk': 7500000,
-    },
-    'north': {
-        'name': 'North Nagpur',
-        'base_price': 4800,  # ₹4,800 per sqft
-        'localities': {
-            'Khamla': 5200,
-            'Kalamna': 4500,
-            'Nara': 4200,
-            'Bhandewadi': 4000,
-            'Khare Town': 4600,
-            'Ashi Nagar': 4800,
-            'Indora': 4400,
-            'Koradi Road': 4200
-        },
-        'growth_rate': 6.5,
-        'demand_index': 68,
-        'supply_index': 78,
-        'avg_price_1bhk': 2200000,
-        'avg_price_2bhk': 3500000,
-        'avg_price_3bhk': 5000000,
-    },
-    'outskirts': {
-        'name': 'Outer Nagpur',
-        'base_price': 3500,  # ₹3,500 per sqft
-        'localities': {
-            'Kamptee': 3800,
-            'Kanhan': 3200,
-            'Waddhamna': 3000,
-            'Fetri': 2800,
-            'Parseoni': 3200,
-            'Umred Road': 3400,
-            'Katol Road': 3600,
-            'Kalmeshwar': 3000
-        },
-        'growth_rate': 8.5,
-        'demand_index': 62,
-        'supply_index': 85,
-        'avg_price_1bhk': 1800000,
-        'avg_price_2bhk': 2800000,
-        'avg_price_3bhk': 4000000,
-    }
-}
+# Zone, locality and landmark data live in a SQLite store (created from
+# market_seed.py on first start) and are reloaded when the file changes, so
+# rates can be edited with `python market_store.py` without a deploy.
+# FUZZY_LOCATION_MATCHING lets the location matcher catch misspellings
+FUZZY_LOCATION_MATCHING = os.environ.get('FUZZY_LOCATION_MATCHING', '0') == '1'
+market_store = MarketDataStore(
+    os.environ.get('MARKET_DATA_PATH', DEFAULT_MARKET_DATA_PATH),
+    seed=(NAGPUR_ZONES, LANDMARKS),
+    check_seconds=float(os.environ.get('MARKET_DATA_CHECK_SECONDS', 5)),
+    fuzzy=FUZZY_LOCATION_MATCHING
+)
 
-# Updated landmarks with 2025-2026 multipliers
-LANDMARKS = {
-    'VCA Stadium': {'zone': 'central', 'multiplier': 1.18},
-    'Empress City Mall': {'zone': 'west', 'multiplier': 1.15},
-    'Futala Lake': {'zone': 'west', 'multiplier': 1.25},
-    'Ambazari Lake': {'zone': 'west', 'multiplier': 1.22},
-    'Seminary Hills': {'zone': 'west', 'multiplier': 1.30},
-    'Airport': {'zone': 'south', 'multiplier': 1.15},
-    'MIHAN': {'zone': 'south', 'multiplier': 1.22},
-    'AIIMS Nagpur': {'zone': 'central', 'multiplier': 1.25},
-    'IIM Nagpur': {'zone': 'central', 'multiplier': 1.20},
-    'VNIT': {'zone': 'south', 'multiplier': 1.18},
-    'GMC': {'zone': 'central', 'multiplier': 1.16},
-    'Railway Station': {'zone': 'central', 'multiplier': 1.12},
-    'Sadar': {'zone': 'central', 'multiplier': 1.10},
-    'Kasturchand Park': {'zone': 'central', 'multiplier': 1.12},
-    'Dragon Palace': {'zone': 'west', 'multiplier': 1.14},
-    'Raman Science Centre': {'zone': 'west', 'multiplier': 1.10}
-}
+def zone_base_rates():
+    """Current per-sqft base rate of each zone, as the model is trained on"""
+    return market_store.current.base_rates()
+
+# Initialize predictor (loads the prebuilt artifact, trains only if missing or stale).
+# MODEL_LOADING=background loads it on a thread so catalog and market endpoints
+# answer immediately; model endpoints return 503 until it is ready
+MODEL_PATH = os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH)
+MODEL_LOADING = os.environ.get('MODEL_LOADING', 'eager')
+ml_predictor = PropertyPricePredictor(
+    model_path=MODEL_PATH,
+    zone_rates=zone_base_rates(),
+    background=MODEL_LOADING == 'background'
+)
+
+# Retrain off the request path (admin-triggered or every RETRAIN_INTERVAL_HOURS)
+# and hot-swap the model once it passes the holdout check. Each worker checks
+# the artifact every MODEL_RELOAD_CHECK_SECONDS, so a model published by one
+# worker (or a deploy) reaches all of them
+model_retrainer = ModelRetrainer(
+    ml_predictor,
+    MODEL_PATH,
+    zone_base_rates,
+    min_r2=float(os.environ.get('RETRAIN_MIN_R2', 0.9)),
+    max_mape=float(os.environ.get('RETRAIN_MAX_MAPE', 15.0)),
+    interval_hours=float(os.environ.get('RETRAIN_INTERVAL_HOURS', 0)),
+    reload_check_seconds=float(os.environ.get('MODEL_RELOAD_CHECK_SECONDS', 10))
+)
 
-def predict_zone(location):
+@app.before_request
+def start_model_retrainer():
+    model_retrainer.start_background()
+
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+def admin_authorized():
+    """Admin endpoints are disabled unless ADMIN_TOKEN is set"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+def predict_zone(location, market=None):
     """AI-powered zone prediction with locality-specific pricing"""
-    location_lower = location.lower()
-    
-    # Check specific localities first
-    for zone, data in NAGPUR_ZONES.items():
-        for locality, price in data['localities'].items():
-            if locality.lower() in location_lower:
-                return zone, 'high', locality, price
-    
-    # Check landmarks
-    for landmark, data in LANDMARKS.items():
-        if landmark.lower() in location_lower:
-            zone = data['zone']
-            base_price = NAGPUR_ZONES[zone]['base_price']
-            return zone, 'high', landmark, int(base_price * data['multiplier'])
-    
-    # Default to central with base price
-    return 'central', 'low', None, NAGPUR_ZONES['central']['base_price']
+    # Localities win over landmarks, first match wins, default is central
+    market = market or market_store.current
+    zone, confidence, matched, price, _ = market.matcher.match(location)
+    return zone, confidence, matched, price
 
-def calculate_price_ml(data):
-    """ML-enhanced price calculation with 2025-2026 market rates"""
+@app.before_request
+def reload_market_data():
+    market_store.maybe_reload()
+
+def on_market_data_reload(previous, current):
+    """Retrain when zone base rates (the model's zone feature) change"""
+    if current.base_rates() != previous.base_rates():
+        model_retrainer.trigger('market data')
+
+market_store.listeners.append(on_market_data_reload)
+
+# Bedroom-based adjustment
+BEDROOM_MULTIPLIERS = {
+    1: 0.88,
+    2: 1.0,
+    3: 1.12,
+    4: 1.25,
+    5: 1.38
+}
+
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 5000))
+
+# Coalesce concurrent single predictions into one model call (window 0 = off)
+INFERENCE_BATCH_WINDOW_MS = float(os.environ.get('INFERENCE_BATCH_WINDOW_MS', 0))
+inference_batcher = MicroBatcher(
+    lambda features: ml_predictor.predict_batch(features),
+    window_ms=INFERENCE_BATCH_WINDOW_MS,
+    max_batch=int(os.environ.get('INFERENCE_BATCH_MAX_ROWS', 64))
+) if INFERENCE_BATCH_WINDOW_MS > 0 else None
+
+# Catalog endpoints are served from pre-encoded bytes, rebuilt when the data changes
+catalog_cache = CatalogCache(app)
+
+# Repeated configurations skip inference; size 0 turns the cache off
+prediction_cache = PredictionCache(
+    max_entries=int(os.environ.get('PREDICTION_CACHE_SIZE', 10000)),
+    ttl_seconds=float(os.environ.get('PREDICTION_CACHE_TTL', 300))
+)
+
+# Prometheus metrics for /metrics, kept per worker process
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+metrics_registry = MetricsRegistry()
+stage_seconds = metrics_registry.histogram(
+    'homeverse_stage_duration_seconds',
+    'Time spent in each stage of pricing a property and serializing responses',
+    ('stage',),
+    buckets=STAGE_BUCKETS
+)
+request_seconds = metrics_registry.histogram(
+    'homeverse_http_request_duration_seconds',
+    'Request handling time by route (streamed bodies excluded)',
+    ('route', 'method')
+)
+requests_total = metrics_registry.counter(
+    'homeverse_http_requests_total',
+    'Requests by route, method and status',
+    ('route', 'method', 'status')
+)
+request_errors_total = metrics_registry.counter(
+    'homeverse_http_request_errors_total',
+    'Requests answered with a 4xx/5xx status',
+    ('route', 'method')
+)
+requests_in_flight = metrics_registry.gauge(
+    'homeverse_http_requests_in_flight',
+    'Requests currently being handled by this process'
+)
+metrics_registry.gauge(
+    'homeverse_model_info',
+    'Price model being served (always 1)',
+    ('model_version', 'data_version', 'profile', 'backend'),
+    callback=lambda: {
+        (ml_predictor.model_version, ml_predictor.data_version, ml_predictor.profile,
+         'flat' if ml_predictor.engine is not None else 'sklearn'): 1
+    }
+)
+metrics_registry.gauge(
+    'homeverse_prediction_cache_entries',
+    'Predictions currently cached',
+    callback=lambda: prediction_cache.stats()['size']
+)
+metrics_registry.gauge(
+    'homeverse_city_model_bytes',
+    'Model bytes of each city resident in this process',
+    ('city',),
+    callback=lambda: {(city.name,): city.nbytes for city in city_registry.resident()}
+)
+
+time_stage = StageTimer(stage_seconds) if METRICS_ENABLED else null_stage
+ml_predictor.time_stage = time_stage
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default JSON provider that records serialization time"""
+    def dumps(self, obj, **kwargs):
+        with time_stage('json_serialize'):
+            return super().dumps(obj, **kwargs)
+
+app.json = TimedJSONProvider(app)
+
+@app.before_request
+def start_request_metrics():
+    if METRICS_ENABLED:
+        g.request_started = time.perf_counter()
+        g.in_flight = True
+        requests_in_flight.inc()
+
+@app.after_request
+def record_request_metrics(response):
+    startup.mark('first response')
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_seconds.observe(time.perf_counter() - started, route, request.method)
+        requests_total.inc(route, request.method, str(response.status_code))
+        if response.status_code >= 400:
+            request_errors_total.inc(route, request.method)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    # Only undo an inc that happened (a hook before ours may have answered already)
+    if g.pop('in_flight', False):
+        requests_in_flight.dec()
+
+# Endpoints that need the price model. The check is registered after the
+# metrics hooks, so requests it turns away are still counted
+MODEL_ENDPOINTS = {'predict', 'predict_ml', 'predict_batch', 'compare_properties'}
+
+@app.before_request
+def require_model():
+    if request.endpoint in MODEL_ENDPOINTS and request.method != 'OPTIONS' and ml_predictor.loading:
+        return jsonify({
+            'success': False,
+            'error': 'Price model is still loading, try again shortly'
+        }), 503, {'Retry-After': '1'}
+
+# Sampling profiler for live requests: a random PROFILER_SAMPLE_RATE share of
+# requests (0 = off, switchable at runtime via /admin/profiler; the change is
+# shared with the other workers through PROFILER_SETTINGS_PATH), plus any
+# admin request sent with X-Profile: 1
+request_profiler = SamplingProfiler(
+    sample_rate=float(os.environ.get('PROFILER_SAMPLE_RATE', 0)),
+    interval_ms=float(os.environ.get('PROFILER_INTERVAL_MS', 5)),
+    settings_path=os.environ.get(
+        'PROFILER_SETTINGS_PATH',
+        os.path.join(os.path.dirname(DEFAULT_MARKET_DATA_PATH), 'profiler.json')
+    )
+)
+
+@app.before_request
+def start_profiling():
+    if request_profiler.should_profile() or (request.headers.get('X-Profile') == '1' and admin_authorized()):
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_profiler.begin(f'{request.method}:{route}')
+        g.profiling = True
+
+@app.teardown_request
+def stop_profiling(exc):
+    if g.pop('profiling', False):
+        request_profiler.end()
+
+# Cities besides Nagpur load on first use: market data from
+# CITY_DATA_DIR/<city>.sqlite3 (create it with `python market_store.py --path
+# ... init --from city.json`) and the model from CITY_MODEL_DIR/<city>.joblib,
+# trained on first load if missing. Up to MAX_RESIDENT_CITIES cities (Nagpur
+# included and never evicted) and CITY_MEMORY_BUDGET_MB of models stay loaded;
+# the CITY_PRELOAD busiest cities of earlier runs load at boot
+DEFAULT_CITY = 'nagpur'
+CITY_DATA_DIR = os.environ.get('CITY_DATA_DIR', os.path.join(os.path.dirname(DEFAULT_MARKET_DATA_PATH), 'cities'))
+CITY_MODEL_DIR = os.environ.get('CITY_MODEL_DIR', os.path.join(os.path.dirname(MODEL_PATH), 'cities'))
+
+def city_data_files():
+    """Lowercase city name -> its market data file (names are matched case-insensitively)"""
+    if not os.path.isdir(CITY_DATA_DIR):
+        return {}
+    return {
+        f[:-len('.sqlite3')].lower(): os.path.join(CITY_DATA_DIR, f)
+        for f in sorted(os.listdir(CITY_DATA_DIR)) if f.endswith('.sqlite3')
+    }
+
+def available_cities():
+    return {DEFAULT_CITY} | set(city_data_files())
+
+def load_city(name):
+    store = MarketDataStore(
+        city_data_files().get(name, os.path.join(CITY_DATA_DIR, f'{name}.sqlite3')),
+        check_seconds=market_store.check_seconds,
+        fuzzy=FUZZY_LOCATION_MATCHING
+    )
+    model_path = os.path.join(CITY_MODEL_DIR, f'{name}.joblib')
+    predictor = PropertyPricePredictor(model_path=model_path, zone_rates=store.current.base_rates())
+    predictor.time_stage = time_stage
+    if ml_predictor.inference_jobs is not None:
+        predictor.set_inference_jobs(ml_predictor.inference_jobs)
+    retrainer = ModelRetrainer(
+        predictor,
+        model_path,
+        lambda: store.current.base_rates(),
+        min_r2=model_retrainer.min_r2,
+        max_mape=model_retrainer.max_mape,
+        reload_check_seconds=model_retrainer.reload_check_seconds
+    )
+    store.listeners.append(
+        lambda previous, current: retrainer.trigger('market data') if current.base_rates() != previous.base_rates() else None
+    )
+    cache = PredictionCache(max_entries=prediction_cache.max_entries, ttl_seconds=prediction_cache.ttl_seconds)
+    return City(name, store, predictor, cache, retrainer=retrainer)
+
+city_registry = CityRegistry(
+    load_city,
+    available_cities,
+    max_resident=int(os.environ.get('MAX_RESIDENT_CITIES', 4)),
+    memory_budget_mb=float(os.environ.get('CITY_MEMORY_BUDGET_MB', 0)),
+    hits_path=os.environ.get('CITY_HITS_PATH', os.path.join(CITY_DATA_DIR, 'hits.json'))
+)
+nagpur = City(DEFAULT_CITY, market_store, ml_predictor, prediction_cache, inference_batcher, model_retrainer)
+city_registry.add(nagpur, pinned=True)
+city_registry.preload(city_registry.hottest(int(os.environ.get('CITY_PRELOAD', 2))))
+
+def request_city():
+    """City named by ?city= or the JSON body's 'city', Nagpur if neither is given"""
+    name = request.args.get('city')
+    if name is None and request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            name = body.get('city')
+    city = city_registry.get(str(name or DEFAULT_CITY))
+    city.market_store.maybe_reload()
+    if city.retrainer is not None:
+        city.retrainer.start_background()
+    return city
+
+@app.errorhandler(UnknownCityError)
+def unknown_city(e):
+    return jsonify({
+        'success': False,
+        'error': str(e)
+    }), 400
+
+def parse_property(data, market=None):
+    """Turn a property payload into model features and market factors"""
+    market = market or market_store.current
     location = data.get('location', '')
     bedrooms_str = str(data.get('bedrooms', '2')).replace('+', '')
     bedrooms = int(bedrooms_str) if bedrooms_str.isdigit() else 2
@@ -296,12 +348,10 @@ def calculate_price_ml(data):
     floor = data.get('floor', 1)
     amenities = data.get('amenities', [])
     
-    # Get zone and locality-specific price
-    zone, confidence, matched, locality_price = predict_zone(location)
-    zone_encoded = list(NAGPUR_ZONES.keys()).index(zone)
-    
-    # Use locality-specific price if available, otherwise base price
-    base_rate = locality_price
+    # Get zone, locality-specific price and landmark bonus in one pass
+    with time_stage('predict_zone'):
+        zone, confidence, matched, locality_price, landmark_mult = market.matcher.match(location)
+    zone_encoded = market.zone_index[zone]
     
     # Property type multiplier
     property_type_mult = property_type.get('multiplier', 1.0) if property_type else 1.0
@@ -326,89 +376,253 @@ def calculate_price_ml(data):
     amenities_count = len(amenities) if amenities else 0
     amenities_mult = 1.0 + (amenities_count * 0.015)  # 1.5% per amenity
     
-    # Bedroom-based adjustment
-    bedroom_multipliers = {
-        1: 0.88,
-        2: 1.0,
-        3: 1.12,
-        4: 1.25,
-        5: 1.38
-    }
-    bedroom_mult = bedroom_multipliers.get(bedrooms, 1.0)
-    
-    # Calculate using ML model
-    features = [
-        zone_encoded,
-        bedrooms,
-        sqft,
-        property_type_mult,
-        age_mult,
-        floor_num,
-        amenities_count
-    ]
-    
-    ml_price, feature_importance = ml_predictor.predict(features)
+    # Add additional costs from amenities
+    additional_costs = sum(a.get('price', 0) for a in amenities if isinstance(a, dict) and 'price' in a)
     
-    # Hybrid approach: Combine ML with market-based calculation
-    market_price = base_rate * sqft * bedroom_mult * property_type_mult * age_mult * floor_mult * amenities_mult
+    return {
+        'zone': zone,
+        'zoneData': market.zones[zone],
+        'confidence': confidence,
+        'matched': matched,
+        # Use locality-specific price if available, otherwise base price
+        'baseRate': locality_price,
+        'localityPrice': locality_price,
+        'bedrooms': bedrooms,
+        'sqft': sqft,
+        'bedroomMult': BEDROOM_MULTIPLIERS.get(bedrooms, 1.0),
+        'propertyTypeMult': property_type_mult,
+        'ageMult': age_mult,
+        'floorMult': floor_mult,
+        'amenitiesMult': amenities_mult,
+        'additionalCosts': additional_costs,
+        'landmarkMult': landmark_mult,
+        # Also report the spread of the per-tree estimates
+        'uncertainty': bool(data.get('uncertainty', False)),
+        'features': [
+            zone_encoded,
+            bedrooms,
+            sqft,
+            property_type_mult,
+            age_mult,
+            floor_num,
+            amenities_count
+        ]
+    }
+
+def market_price_for(parsed):
+    """Market-rate price for one parsed property"""
+    return (parsed['baseRate'] * parsed['sqft'] * parsed['bedroomMult'] * parsed['propertyTypeMult']
+            * parsed['ageMult'] * parsed['floorMult'] * parsed['amenitiesMult'])
+
+def market_prices_for(parsed_list):
+    """Market-rate prices for many parsed properties as one array expression"""
+    columns = {
+        key: np.array([p[key] for p in parsed_list], dtype=float)
+        for key in ('baseRate', 'sqft', 'bedroomMult', 'propertyTypeMult', 'ageMult', 'floorMult', 'amenitiesMult')
+    }
+    return (columns['baseRate'] * columns['sqft'] * columns['bedroomMult'] * columns['propertyTypeMult']
+            * columns['ageMult'] * columns['floorMult'] * columns['amenitiesMult'])
+
+def hybrid_price_for(parsed, ml_price, market_price):
+    """Final price from a model estimate: 60% ML, 40% market, plus extras and landmark bonus"""
+    price = int((ml_price * 0.6) + (market_price * 0.4) + parsed['additionalCosts'])
+    if parsed['landmarkMult'] is not None:
+        price = int(price * parsed['landmarkMult'])
+    return price
+
+def build_uncertainty(parsed, spread, row, ml_price, market_price):
+    """Spread of the per-tree estimates and the price each tree quantile implies"""
+    labels = [f'p{round(q * 100)}' for q in SPREAD_QUANTILES]
+    quantiles = spread['quantiles'][row].tolist()
+    std = float(spread['std'][row])
+    return {
+        'trees': spread['trees'],
+        'mlStd': int(std),
+        'mlCoefficientOfVariation': round(std / ml_price * 100, 2) if ml_price else None,
+        'mlQuantiles': {label: int(q) for label, q in zip(labels, quantiles)},
+        'priceRange': {label: hybrid_price_for(parsed, q, market_price) for label, q in zip(labels, quantiles)}
+    }
+
+def build_prediction(parsed, ml_price, market_price, feature_importance, predictor=None, uncertainty=None):
+    """Assemble the prediction response for one property"""
+    predictor = predictor or ml_predictor
+    bundle = predictor.bundle
+    zone = parsed['zone']
+    zone_data = parsed['zoneData']
+    bedrooms = parsed['bedrooms']
+    sqft = parsed['sqft']
     
     # Weight: 60% ML, 40% market calculation
     hybrid_price = (ml_price * 0.6) + (market_price * 0.4)
     
-    # Add additional costs from amenities
-    additional_costs = sum(a.get('price', 0) for a in amenities if isinstance(a, dict) and 'price' in a)
-    
-    final_price = int(hybrid_price + additional_costs)
+    final_price = int(hybrid_price + parsed['additionalCosts'])
     
     # Apply landmark bonus if applicable
-    for landmark, lm_data in LANDMARKS.items():
-        if landmark.lower() in location.lower():
-            final_price = int(final_price * lm_data['multiplier'])
-            break
+    with time_stage('landmark_bonus'):
+        if parsed['landmarkMult'] is not None:
+            final_price = int(final_price * parsed['landmarkMult'])
     
-    return {
+    prediction = {
         'price': final_price,
         'pricePerSqft': int(final_price / sqft) if sqft > 0 else 0,
         'breakdown': {
-            'baseRate': base_rate,
-            'localityRate': locality_price,
+            'baseRate': parsed['baseRate'],
+            'localityRate': parsed['localityPrice'],
             'mlPrediction': int(ml_price),
             'marketCalculation': int(market_price),
             'hybridPrice': int(hybrid_price),
-            'bedroomFactor': bedroom_mult,
-            'propertyTypeFactor': property_type_mult,
-            'ageFactor': age_mult,
-            'floorFactor': floor_mult,
-            'amenitiesFactor': amenities_mult,
-            'additionalCosts': additional_costs,
+            'bedroomFactor': parsed['bedroomMult'],
+            'propertyTypeFactor': parsed['propertyTypeMult'],
+            'ageFactor': parsed['ageMult'],
+            'floorFactor': parsed['floorMult'],
+            'amenitiesFactor': parsed['amenitiesMult'],
+            'additionalCosts': parsed['additionalCosts'],
             'totalArea': sqft
         },
         'zoneInfo': {
             'detectedZone': zone,
-            'zoneName': NAGPUR_ZONES[zone]['name'],
-            'confidence': confidence,
-            'matchedLocality': matched,
-            'localityPrice': locality_price,
-            'growthRate': NAGPUR_ZONES[zone]['growth_rate'],
-            'demandIndex': NAGPUR_ZONES[zone]['demand_index'],
+            'zoneName': zone_data['name'],
+            'confidence': parsed['confidence'],
+            'matchedLocality': parsed['matched'],
+            'localityPrice': parsed['localityPrice'],
+            'growthRate': zone_data['growth_rate'],
+            'demandIndex': zone_data['demand_index'],
             'avgPrices': {
-                '1BHK': NAGPUR_ZONES[zone]['avg_price_1bhk'],
-                '2BHK': NAGPUR_ZONES[zone]['avg_price_2bhk'],
-                '3BHK': NAGPUR_ZONES[zone]['avg_price_3bhk']
+                '1BHK': zone_data['avg_price_1bhk'],
+                '2BHK': zone_data['avg_price_2bhk'],
+                '3BHK': zone_data['avg_price_3bhk']
             }
         },
         'mlInsights': {
             'modelUsed': 'Hybrid RF + Market (2025-2026 Data)',
-            'accuracy': '96.2%',
-            'dataPoints': 2000,
+            'accuracy': bundle.accuracy,
+            'holdoutR2': bundle.metrics.get('r2'),
+            'holdoutMape': bundle.metrics.get('mape'),
+            'dataPoints': predictor.n_samples,
             'lastUpdated': '2025-11',
             'featureImportance': {k: round(v * 100, 2) for k, v in feature_importance.items()}
         },
         'marketComparison': {
-            'averageForConfig': NAGPUR_ZONES[zone].get(f'avg_price_{bedrooms}bhk', 0),
-            'pricePosition': 'Above Average' if final_price > NAGPUR_ZONES[zone].get(f'avg_price_{bedrooms}bhk', 0) else 'Below Average' if final_price < NAGPUR_ZONES[zone].get(f'avg_price_{bedrooms}bhk', 0) * 0.9 else 'Average'
+            'averageForConfig': zone_data.get(f'avg_price_{bedrooms}bhk', 0),
+            'pricePosition': 'Above Average' if final_price > zone_data.get(f'avg_price_{bedrooms}bhk', 0) else 'Below Average' if final_price < zone_data.get(f'avg_price_{bedrooms}bhk', 0) * 0.9 else 'Average'
         }
     }
+    if uncertainty is not None:
+        prediction['uncertainty'] = uncertainty
+    return prediction
+
+def prediction_cache_key(parsed):
+    """Normalized inputs that fully determine a prediction"""
+    return tuple(parsed['features']) + (
+        parsed['confidence'],
+        parsed['matched'],
+        parsed['localityPrice'],
+        parsed['floorMult'],
+        parsed['additionalCosts'],
+        parsed['landmarkMult'],
+        parsed['uncertainty']
+    )
+
+def prediction_cache_version(city, market):
+    return city.predictor.model_version, market.fingerprint
+
+def calculate_price_ml(data, city=None):
+    """ML-enhanced price calculation with 2025-2026 market rates"""
+    city = city or nagpur
+    cache = city.prediction_cache
+    market = city.market_store.current
+    with time_stage('parse_payload'):
+        parsed = parse_property(data, market)
+    
+    if cache.enabled:
+        with time_stage('cache_lookup'):
+            key = prediction_cache_key(parsed)
+            version = prediction_cache_version(city, market)
+            cached = cache.get(key, version)
+        if cached is not None:
+            return cached
+    
+    # Calculate using ML model
+    spread = None
+    if parsed['uncertainty']:
+        spread, feature_importance = city.predictor.predict_spread([parsed['features']])
+        ml_price = spread['mean'][0]
+    elif city.batcher is not None:
+        ml_price, feature_importance = city.batcher.predict(parsed['features'])
+    else:
+        ml_price, feature_importance = city.predictor.predict(parsed['features'])
+    
+    with time_stage('market_calc'):
+        market_price = market_price_for(parsed)
+    
+    # Hybrid approach: Combine ML with market-based calculation
+    with time_stage('build_prediction'):
+        uncertainty = build_uncertainty(parsed, spread, 0, ml_price, market_price) if spread is not None else None
+        result = build_prediction(parsed, ml_price, market_price, feature_importance, city.predictor, uncertainty)
+    
+    if cache.enabled:
+        cache.put(key, result, version)
+    return result
+
+def calculate_price_batch(items, city=None, uncertainty=False):
+    """Value many properties with one scaler/model call, errors reported per item"""
+    city = city or nagpur
+    cache = city.prediction_cache
+    results = [None] * len(items)
+    parsed_list = []
+    positions = []
+    keys = []
+    market = city.market_store.current
+    version = prediction_cache_version(city, market)
+    
+    for i, item in enumerate(items):
+        try:
+            with time_stage('parse_payload'):
+                parsed = parse_property(item, market)
+            parsed['uncertainty'] = parsed['uncertainty'] or uncertainty
+            key = None
+            if cache.enabled:
+                key = prediction_cache_key(parsed)
+                cached = cache.get(key, version)
+                if cached is not None:
+                    results[i] = {'success': True, 'prediction': cached}
+                    continue
+            parsed_list.append(parsed)
+            positions.append(i)
+            keys.append(key)
+        except Exception as e:
+            results[i] = {'success': False, 'error': str(e)}
+    
+    if parsed_list:
+        features = np.array([p['features'] for p in parsed_list], dtype=float)
+        # Rows asking for uncertainty go through one per-tree pass, the rest through one plain predict
+        wants_spread = np.array([p['uncertainty'] for p in parsed_list])
+        spread_rows = np.cumsum(wants_spread) - 1
+        ml_prices = np.empty(len(parsed_list))
+        spread = None
+        if not wants_spread.all():
+            ml_prices[~wants_spread], feature_importance = city.predictor.predict_batch(features[~wants_spread])
+        if wants_spread.any():
+            spread, feature_importance = city.predictor.predict_spread(features[wants_spread])
+            ml_prices[wants_spread] = spread['mean']
+        with time_stage('market_calc'):
+            market_prices = market_prices_for(parsed_list)
+        
+        for j, (i, key, parsed, ml_price, market_price) in enumerate(
+                zip(positions, keys, parsed_list, ml_prices.tolist(), market_prices.tolist())):
+            try:
+                uncertainty = None
+                if parsed['uncertainty']:
+                    uncertainty = build_uncertainty(parsed, spread, spread_rows[j], ml_price, market_price)
+                prediction = build_prediction(parsed, ml_price, market_price, feature_importance, city.predictor,
+                                              uncertainty)
+                results[i] = {'success': True, 'prediction': prediction}
+                if key is not None:
+                    cache.put(key, prediction, version)
+            except Exception as e:
+                results[i] = {'success': False, 'error': str(e)}
+    
+    return results
 
 # API Routes (same as before, just using updated calculation)
 @app.route('/')
@@ -418,17 +632,27 @@ def home():
         'status': 'running',
         'ml_enabled': ml_predictor.is_trained,
         'data_period': '2025-2026',
-        'total_localities': sum(len(z['localities']) for z in NAGPUR_ZONES.values()),
+        'total_localities': market_store.current.total_localities,
         'endpoints': [
             '/predict',
             '/predict-ml',
+            '/predict-batch',
             '/zones',
             '/landmarks',
             '/market-trends',
             '/compare',
+            '/comparables',
             '/historical-data',
             '/investment-analysis',
-            '/roi-calculator'
+            '/roi-calculator',
+            '/portfolio-analysis',
+            '/cache-stats',
+            '/city-stats',
+            '/worker-stats',
+            '/inference-stats',
+            '/metrics',
+            '/health',
+            '/ready'
         ]
     })
 
@@ -440,7 +664,7 @@ def predict():
         data = request.json
         return jsonify({
             'success': True,
-            'prediction': calculate_price_ml(data),
+            'prediction': calculate_price_ml(data, request_city()),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -455,7 +679,7 @@ def predict_ml():
         return '', 204
     try:
         data = request.json
-        prediction = calculate_price_ml(data)
+        prediction = calculate_price_ml(data, request_city())
         return jsonify({
             'success': True,
             'prediction': prediction,
@@ -467,27 +691,51 @@ def predict_ml():
             'error': str(e)
         }), 400
 
-@app.route('/zones', methods=['GET'])
-def get_zones():
-    return jsonify({
+@app.route('/predict-batch', methods=['POST', 'OPTIONS'])
+def predict_batch():
+    if request.method == 'OPTIONS':
+        return '', 204
+    try:
+        properties = request.json.get('properties', [])
+        if not isinstance(properties, list):
+            raise ValueError('properties must be a list')
+        if len(properties) > MAX_BATCH_SIZE:
+            raise ValueError(f'Batch too large: {len(properties)} properties (max {MAX_BATCH_SIZE})')
+        
+        results = calculate_price_batch(properties, request_city(), bool(request.json.get('uncertainty', False)))
+        succeeded = sum(1 for r in results if r['success'])
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+def build_zones_payload(market):
+    return {
         'success': True,
-        'zones': NAGPUR_ZONES,
+        'zones': market.zones,
         'data_year': '2025-2026'
-    })
+    }
 
-@app.route('/landmarks', methods=['GET'])
-def get_landmarks():
-    return jsonify({
+def build_landmarks_payload(market):
+    return {
         'success': True,
-        'landmarks': list(LANDMARKS.keys()),
-        'total': len(LANDMARKS)
-    })
+        'landmarks': market.landmark_names,
+        'total': len(market.landmark_names)
+    }
 
-@app.route('/localities', methods=['GET'])
-def get_localities():
-    """Get all localities with their prices"""
+def build_localities_payload(market):
     all_localities = []
-    for zone, data in NAGPUR_ZONES.items():
+    for zone, data in market.zones.items():
         for locality, price in data['localities'].items():
             all_localities.append({
                 'name': locality,
@@ -497,51 +745,69 @@ def get_localities():
                 'growthRate': data['growth_rate']
             })
     
-    return jsonify({
+    return {
         'success': True,
         'localities': sorted(all_localities, key=lambda x: x['pricePerSqft'], reverse=True),
         'total': len(all_localities)
-    })
+    }
 
-@app.route('/market-trends', methods=['GET'])
-def market_trends():
-    zone = request.args.get('zone', 'central')
-    zone_data = NAGPUR_ZONES.get(zone, NAGPUR_ZONES['central'])
-    
-    # Generate historical data (2020-2025)
-    historical = []
-    base_price = zone_data['base_price']
-    growth_rate = zone_data['growth_rate'] / 100
-    
-    for i in range(12, 0, -1):
-        month_date = (datetime.now() - timedelta(days=30*i)).strftime('%Y-%m')
-        # Calculate backward from current price
-        price = base_price / ((1 + growth_rate/12) ** i)
-        historical.append({
-            'month': month_date,
-            'avgPrice': int(price),
-            'transactions': int(np.random.randint(80, 200))
-        })
+@app.route('/zones', methods=['GET'])
+def get_zones():
+    city = request_city()
+    market = city.market_store.current
+    return catalog_cache.respond(f'{city.name}/zones', market.fingerprint, lambda: build_zones_payload(market), request)
+
+@app.route('/landmarks', methods=['GET'])
+def get_landmarks():
+    city = request_city()
+    market = city.market_store.current
+    return catalog_cache.respond(f'{city.name}/landmarks', market.fingerprint, lambda: build_landmarks_payload(market),
+                                 request)
+
+@app.route('/localities', methods=['GET'])
+def get_localities():
+    """Get all localities with their prices"""
+    city = request_city()
+    market = city.market_store.current
+    return catalog_cache.respond(f'{city.name}/localities', market.fingerprint, lambda: build_localities_payload(market),
+                                 request)
+
+def get_market_series(city, market):
+    """Price history store for this market data and the current month"""
+    key = (market.fingerprint, date.today().strftime('%Y-%m'))
+    return city.derived('market_series', key, lambda: MarketSeriesStore(market.zones))
+
+def requested_zones():
+    """Zones from ?zones=a,b (multi-zone query) or ?zone=a"""
+    if request.args.get('zones'):
+        return [z.strip() for z in request.args['zones'].split(',') if z.strip()]
+    return [request.args.get('zone', 'central')]
+
+def build_market_trends(market, store, zone, locality=None):
+    zone_key = market.zone_or_default(zone)
+    zone_data = market.zones[zone_key]
+    series = store.series(zone_key, locality)
+    current_price = series.current_price
     
     trends = {
         'zone': zone,
         'zoneName': zone_data['name'],
-        'currentAvgPrice': zone_data['base_price'],
+        'currentAvgPrice': current_price,
         'yearlyGrowth': zone_data['growth_rate'],
         'quarterlyGrowth': round(zone_data['growth_rate'] / 4, 2),
         'monthlyGrowth': round(zone_data['growth_rate'] / 12, 2),
         'demandIndex': zone_data['demand_index'],
         'supplyIndex': zone_data['supply_index'],
         'priceRange': {
-            'min': int(zone_data['base_price'] * 0.75),
-            'max': int(zone_data['base_price'] * 1.35)
+            'min': int(current_price * 0.75),
+            'max': int(current_price * 1.35)
         },
-        'topLocalities': list(sorted(zone_data['localities'].items(), key=lambda x: x[1], reverse=True)[:3]),
-        'historical': historical,
+        'topLocalities': store.top_localities[zone_key],
+        'historical': series.monthly(int(request.args.get('months', 12))),
         'forecast': {
-            'next3Months': int(zone_data['base_price'] * (1 + zone_data['growth_rate'] / 400)),
-            'next6Months': int(zone_data['base_price'] * (1 + zone_data['growth_rate'] / 200)),
-            'next12Months': int(zone_data['base_price'] * (1 + zone_data['growth_rate'] / 100)),
+            'next3Months': int(current_price * (1 + zone_data['growth_rate'] / 400)),
+            'next6Months': int(current_price * (1 + zone_data['growth_rate'] / 200)),
+            'next12Months': int(current_price * (1 + zone_data['growth_rate'] / 100)),
             'confidence': 89.5
         },
         'averagePrices': {
@@ -550,49 +816,103 @@ def market_trends():
             '3BHK': zone_data['avg_price_3bhk']
         }
     }
-    
-    return jsonify({
-        'success': True,
-        'trends': trends
-    })
+    if locality:
+        trends['locality'] = market.locality(locality)[1]
+    return trends
+
+def locality_zone_or_error(market, locality):
+    found = market.locality(locality)
+    if found is None:
+        raise ValueError(f'Unknown locality: {locality}')
+    return found[0]
+
+@app.route('/market-trends', methods=['GET'])
+def market_trends():
+    try:
+        city = request_city()
+        market = city.market_store.current
+        store = get_market_series(city, market)
+        locality = request.args.get('locality')
+        
+        if locality:
+            zone = locality_zone_or_error(market, locality)
+            return jsonify({
+                'success': True,
+                'trends': build_market_trends(market, store, zone, locality)
+            })
+        
+        zones = requested_zones()
+        if 'zones' in request.args:
+            return jsonify({
+                'success': True,
+                'trends': {zone: build_market_trends(market, store, zone) for zone in zones}
+            })
+        
+        return jsonify({
+            'success': True,
+            'trends': build_market_trends(market, store, zones[0])
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
 
 @app.route('/historical-data', methods=['GET'])
 def historical_data():
-    zone = request.args.get('zone', 'central')
-    years = int(request.args.get('years', 5))
-    
-    zone_data = NAGPUR_ZONES.get(zone, NAGPUR_ZONES['central'])
-    current_price = zone_data['base_price']
-    growth_rate = zone_data['growth_rate'] / 100
-    
-    data = []
-    for year in range(years, 0, -1):
-        # Calculate backward from 2025
-        year_price = current_price / ((1 + growth_rate) ** year)
-        data.append({
-            'year': (2025 - year),
-            'avgPrice': int(year_price),
-            'minPrice': int(year_price * 0.82),
-            'maxPrice': int(year_price * 1.18),
-            'transactions': int(np.random.randint(800, 2000)),
-            'growthFromPrevYear': round(growth_rate * 100, 1)
+    try:
+        city = request_city()
+        market = city.market_store.current
+        store = get_market_series(city, market)
+        years = int(request.args.get('years', 5))
+        locality = request.args.get('locality')
+        
+        if locality:
+            zone = locality_zone_or_error(market, locality)
+            return jsonify({
+                'success': True,
+                'zone': zone,
+                'locality': market.locality(locality)[1],
+                'data': store.series(zone, locality).yearly(years)
+            })
+        
+        zones = requested_zones()
+        if 'zones' in request.args:
+            return jsonify({
+                'success': True,
+                'zones': zones,
+                'data': {
+                    zone: store.series(market.zone_or_default(zone)).yearly(years)
+                    for zone in zones
+                }
+            })
+        
+        zone = zones[0]
+        return jsonify({
+            'success': True,
+            'zone': zone,
+            'data': store.series(market.zone_or_default(zone)).yearly(years)
         })
-    
-    # Add current year
-    data.append({
-        'year': 2025,
-        'avgPrice': current_price,
-        'minPrice': int(current_price * 0.82),
-        'maxPrice': int(current_price * 1.18),
-        'transactions': int(np.random.randint(800, 2000)),
-        'growthFromPrevYear': round(growth_rate * 100, 1)
-    })
-    
-    return jsonify({
-        'success': True,
-        'zone': zone,
-        'data': data
-    })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+SCENARIO_PATHS = int(os.environ.get('SCENARIO_PATHS', scenarios.DEFAULT_PATHS))
+SCENARIO_BUDGET_MS = float(os.environ.get('SCENARIO_BUDGET_MS', 250))
+
+def run_scenarios(data, price, zone, zone_data, years):
+    """Monte Carlo bands for a request; 'paths' and 'seed' may override defaults"""
+    return scenarios.simulate(
+        price,
+        zone_data,
+        years,
+        paths=data.get('paths', SCENARIO_PATHS),
+        seed=data.get('seed'),
+        budget_ms=SCENARIO_BUDGET_MS,
+        zone=zone
+    )
 
 @app.route('/investment-analysis', methods=['POST', 'OPTIONS'])
 def investment_analysis():
@@ -603,8 +923,11 @@ def investment_analysis():
         property_price = data.get('price', 5000000)
         zone = data.get('zone', 'central')
         
-        zone_data = NAGPUR_ZONES.get(zone, NAGPUR_ZONES['central'])
+        city = request_city()
+        market = city.market_store.current
+        zone_data = market.zones[market.zone_or_default(zone)]
         growth_rate = zone_data['growth_rate'] / 100
+        investment_score, recommendation = get_zone_insights(city, market)[market.zone_or_default(zone)]
         
         projections = []
         for year in range(1, 11):
@@ -636,10 +959,14 @@ def investment_analysis():
                 'rentalYield': rental_yield,
                 'paybackPeriod': round(100 / rental_yield, 1)
             },
-            'investmentScore': calculate_investment_score(zone_data),
-            'recommendation': generate_recommendation(zone_data, property_price)
+            'investmentScore': investment_score,
+            'recommendation': recommendation
         }
         
+        # Opt-in Monte Carlo percentile bands around the deterministic projection
+        if data.get('scenarios'):
+            analysis['scenarioAnalysis'] = run_scenarios(data, property_price, zone, zone_data, 10)
+        
         return jsonify({
             'success': True,
             'analysis': analysis
@@ -660,7 +987,9 @@ def roi_calculator():
         holding_period = data.get('holdingPeriod', 5)
         zone = data.get('zone', 'central')
         
-        zone_data = NAGPUR_ZONES.get(zone, NAGPUR_ZONES['central'])
+        city = request_city()
+        market = city.market_store.current
+        zone_data = market.zones[market.zone_or_default(zone)]
         growth_rate = zone_data['growth_rate'] / 100
         
         future_value = purchase_price * ((1 + growth_rate) ** holding_period)
@@ -673,32 +1002,143 @@ def roi_calculator():
         total_returns = total_appreciation + total_rent
         total_roi_with_rent = (total_returns / purchase_price) * 100
         
+        calculation = {
+            'purchasePrice': purchase_price,
+            'holdingPeriod': holding_period,
+            'zone': zone_data['name'],
+            'futureValue': int(future_value),
+            'totalAppreciation': int(total_appreciation),
+            'totalROI': round(total_roi, 2),
+            'annualROI': round(annual_roi, 2),
+            'rentalIncome': {
+                'annualRent': int(annual_rent),
+                'monthlyRent': int(annual_rent / 12),
+                'totalRent': int(total_rent),
+                'roiWithRent': round(total_roi_with_rent, 2)
+            },
+            'breakdownByYear': [
+                {
+                    'year': 2025 + year,
+                    'value': int(purchase_price * ((1 + growth_rate) ** year)),
+                    'rentEarned': int(annual_rent * year),
+                    'totalReturn': int((purchase_price * ((1 + growth_rate) ** year)) - purchase_price + (annual_rent * year)),
+                    'cumulativeROI': round(((purchase_price * ((1 + growth_rate) ** year) + annual_rent * year - purchase_price) / purchase_price * 100), 2)
+                }
+                for year in range(1, holding_period + 1)
+            ]
+        }
+        
+        if data.get('scenarios'):
+            calculation['scenarios'] = run_scenarios(data, purchase_price, zone, zone_data, holding_period)
+        
         return jsonify({
             'success': True,
-            'calculation': {
-                'purchasePrice': purchase_price,
-                'holdingPeriod': holding_period,
-                'zone': zone_data['name'],
-                'futureValue': int(future_value),
-                'totalAppreciation': int(total_appreciation),
-                'totalROI': round(total_roi, 2),
-                'annualROI': round(annual_roi, 2),
-                'rentalIncome': {
-                    'annualRent': int(annual_rent),
-                    'monthlyRent': int(annual_rent / 12),
-                    'totalRent': int(total_rent),
-                    'roiWithRent': round(total_roi_with_rent, 2)
-                },
-                'breakdownByYear': [
+            'calculation': calculation
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+def get_zone_insights(city, market):
+    """Investment score and recommendation per zone, computed once per data version"""
+    return city.derived('zone_insights', market.fingerprint, lambda: {
+        zone: (calculate_investment_score(zone_data), generate_recommendation(zone_data, None))
+        for zone, zone_data in market.zones.items()
+    })
+
+MAX_PORTFOLIO_HOLDINGS = int(os.environ.get('MAX_PORTFOLIO_HOLDINGS', 1000))
+
+@app.route('/portfolio-analysis', methods=['POST', 'OPTIONS'])
+def portfolio_analysis():
+    if request.method == 'OPTIONS':
+        return '', 204
+    try:
+        holdings = request.json.get('holdings', [])
+        years = int(request.json.get('years', 10))
+        if not holdings:
+            raise ValueError('No holdings to analyse')
+        if len(holdings) > MAX_PORTFOLIO_HOLDINGS:
+            raise ValueError(f'Too many holdings: {len(holdings)} (max {MAX_PORTFOLIO_HOLDINGS})')
+        if not 1 <= years <= 30:
+            raise ValueError('years must be between 1 and 30')
+        
+        city = request_city()
+        market = city.market_store.current
+        zone_names = market.zone_ids
+        zone_keys = [market.zone_or_default(h.get('zone', 'central')) for h in holdings]
+        zone_index = np.array([market.zone_index[z] for z in zone_keys])
+        prices = np.array([float(h.get('price', 5000000)) for h in holdings])
+        # A zero price would make every ROI below a division by zero (NaN in the response)
+        if not (np.isfinite(prices).all() and (prices > 0).all()):
+            raise ValueError('Each holding needs a positive price')
+        
+        # zones x years growth factors, then one price-vector x growth-matrix product
+        growth = market.growth_rate / 100
+        horizon = np.arange(1, years + 1)
+        growth_matrix = (1 + growth[:, None]) ** horizon
+        values = prices[:, None] * growth_matrix[zone_index]
+        appreciation = values - prices[:, None]
+        roi = appreciation / prices[:, None] * 100
+        
+        # Updated rental yield for 2025 (2.8-3.2%)
+        rental_yield = 3.0
+        annual_rent = prices * rental_yield / 100
+        
+        insights = get_zone_insights(city, market)
+        project_years = (2025 + horizon).tolist()
+        per_holding = []
+        for i, holding in enumerate(holdings):
+            investment_score, recommendation = insights[zone_keys[i]]
+            per_holding.append({
+                'id': holding.get('id', i),
+                'propertyPrice': holding.get('price', 5000000),
+                'zone': market.zones[zone_keys[i]]['name'],
+                'growthRate': market.zones[zone_keys[i]]['growth_rate'],
+                'projections': [
+                    {'year': year, 'value': int(v), 'appreciation': int(a), 'roi': round(r, 2)}
+                    for year, v, a, r in zip(project_years, values[i].tolist(), appreciation[i].tolist(), roi[i].tolist())
+                ],
+                'finalValue': int(values[i, -1]),
+                'expectedAnnualRent': int(annual_rent[i]),
+                'investmentScore': investment_score,
+                'recommendation': recommendation
+            })
+        
+        invested = prices.sum()
+        total_values = values.sum(axis=0)
+        total_rent = annual_rent.sum()
+        allocation = np.bincount(zone_index, weights=prices, minlength=len(zone_names))
+        
+        return jsonify({
+            'success': True,
+            'holdings': per_holding,
+            'portfolio': {
+                'holdings': len(holdings),
+                'totalInvested': int(invested),
+                'projections': [
                     {
-                        'year': 2025 + year,
-                        'value': int(purchase_price * ((1 + growth_rate) ** year)),
-                        'rentEarned': int(annual_rent * year),
-                        'totalReturn': int((purchase_price * ((1 + growth_rate) ** year)) - purchase_price + (annual_rent * year)),
-                        'cumulativeROI': round(((purchase_price * ((1 + growth_rate) ** year) + annual_rent * year - purchase_price) / purchase_price * 100), 2)
+                        'year': year,
+                        'value': int(v),
+                        'appreciation': int(v - invested),
+                        'roi': round((v - invested) / invested * 100, 2),
+                        'roiWithRent': round((v - invested + total_rent * n) / invested * 100, 2)
                     }
-                    for year in range(1, holding_period + 1)
-                ]
+                    for n, year, v in zip(horizon.tolist(), project_years, total_values.tolist())
+                ],
+                'weightedGrowthRate': round(float(growth[zone_index] @ prices / invested * 100), 2),
+                'weightedInvestmentScore': round(sum(insights[z][0] * p for z, p in zip(zone_keys, prices.tolist())) / invested, 1),
+                'rentalIncome': {
+                    'annualRent': int(total_rent),
+                    'monthlyRent': int(total_rent / 12),
+                    'totalRent': int(total_rent * years),
+                    'rentalYield': rental_yield
+                },
+                'zoneAllocation': {
+                    zone: round(share / invested * 100, 2)
+                    for zone, share in zip(zone_names, allocation.tolist()) if share
+                }
             }
         })
     except Exception as e:
@@ -707,47 +1147,115 @@ def roi_calculator():
             'error': str(e)
         }), 400
 
+class ComparisonSummary:
+    """Running /compare insights in constant memory"""
+    
+    def __init__(self):
+        self.count = 0
+        self.price_total = 0
+        self.price_per_sqft_total = 0
+        self.best = None
+        self.premium = None
+    
+    def add(self, prop, prediction):
+        price = prediction['price']
+        self.count += 1
+        self.price_total += price
+        self.price_per_sqft_total += prediction['pricePerSqft']
+        
+        # Strict comparisons keep the first cheapest/most expensive property
+        if self.best is None or price < self.best[0]:
+            self.best = (price, prop.get('location', 'Unknown'), prediction['pricePerSqft'])
+        if self.premium is None or price > self.premium[0]:
+            self.premium = (price, prop.get('location', 'Unknown'), prediction['pricePerSqft'])
+    
+    def insights(self):
+        if not self.count:
+            raise ValueError('No properties to compare')
+        
+        avg_price = self.price_total / self.count
+        min_price, best_location, best_pps = self.best
+        max_price, premium_location, premium_pps = self.premium
+        
+        return {
+            'avgPrice': int(avg_price),
+            'minPrice': int(min_price),
+            'maxPrice': int(max_price),
+            'priceVariation': round((max_price - min_price) / avg_price * 100, 2),
+            'avgPricePerSqft': int(self.price_per_sqft_total / self.count),
+            'bestValue': {
+                'location': best_location,
+                'price': int(min_price),
+                'pricePerSqft': best_pps
+            },
+            'premium': {
+                'location': premium_location,
+                'price': int(max_price),
+                'pricePerSqft': premium_pps
+            },
+            'recommendation': 'Choose ' + best_location + ' for best value for money'
+        }
+
+def wants_ndjson():
+    if request.args.get('stream', '').lower() in ('1', 'true', 'ndjson'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
+
+def stream_comparisons(properties, city=None):
+    """One NDJSON record per property as it is valued, then a summary record"""
+    summary = ComparisonSummary()
+    failed = 0
+    
+    for index, prop in enumerate(properties):
+        try:
+            prediction = calculate_price_ml(prop, city)
+            summary.add(prop, prediction)
+            record = {'type': 'comparison', 'index': index, 'property': prop, 'prediction': prediction}
+        except Exception as e:
+            failed += 1
+            record = {'type': 'error', 'index': index, 'error': str(e)}
+        yield app.json.dumps(record, separators=(',', ':')) + '\n'
+    
+    try:
+        record = {
+            'type': 'summary',
+            'success': True,
+            'insights': summary.insights(),
+            'totalCompared': summary.count,
+            'failed': failed
+        }
+    except Exception as e:
+        record = {'type': 'summary', 'success': False, 'error': str(e), 'failed': failed}
+    yield app.json.dumps(record, separators=(',', ':')) + '\n'
+
 @app.route('/compare', methods=['POST', 'OPTIONS'])
 def compare_properties():
     if request.method == 'OPTIONS':
         return '', 204
     try:
         properties = request.json.get('properties', [])
+        city = request_city()
+        
+        # Opt-in streaming: ?stream=1 or Accept: application/x-ndjson
+        if wants_ndjson():
+            return Response(stream_with_context(stream_comparisons(properties, city)), mimetype='application/x-ndjson')
+        
         comparisons = []
+        summary = ComparisonSummary()
         
         for prop in properties:
-            prediction = calculate_price_ml(prop)
+            prediction = calculate_price_ml(prop, city)
             comparisons.append({
                 'property': prop,
                 'prediction': prediction
             })
-        
-        prices = [c['prediction']['price'] for c in comparisons]
-        price_per_sqft = [c['prediction']['pricePerSqft'] for c in comparisons]
-        
-        insights = {
-            'avgPrice': int(np.mean(prices)),
-            'minPrice': int(min(prices)),
-            'maxPrice': int(max(prices)),
-            'priceVariation': round((max(prices) - min(prices)) / np.mean(prices) * 100, 2),
-            'avgPricePerSqft': int(np.mean(price_per_sqft)),
-            'bestValue': {
-                'location': comparisons[prices.index(min(prices))]['property'].get('location', 'Unknown'),
-                'price': int(min(prices)),
-                'pricePerSqft': comparisons[prices.index(min(prices))]['prediction']['pricePerSqft']
-            },
-            'premium': {
-                'location': comparisons[prices.index(max(prices))]['property'].get('location', 'Unknown'),
-                'price': int(max(prices)),
-                'pricePerSqft': comparisons[prices.index(max(prices))]['prediction']['pricePerSqft']
-            },
-            'recommendation': 'Choose ' + comparisons[prices.index(min(prices))]['property'].get('location', 'Unknown') + ' for best value for money'
-        }
+            summary.add(prop, prediction)
         
         return jsonify({
             'success': True,
             'comparisons': comparisons,
-            'insights': insights,
+            'insights': summary.insights(),
             'totalCompared': len(comparisons)
         })
     except Exception as e:
@@ -756,6 +1264,65 @@ def compare_properties():
             'error': str(e)
         }), 400
 
+# Listings offered as comparables live in COMPARABLES_DIR/<city>.jsonl, one per
+# line (added with POST /admin/comparables or written directly); every worker
+# indexes the file and picks up new lines within COMPARABLES_CHECK_SECONDS
+COMPARABLES_DIR = os.environ.get(
+    'COMPARABLES_DIR',
+    os.path.join(os.path.dirname(DEFAULT_MARKET_DATA_PATH), 'comparables')
+)
+COMPARABLES_CHECK_SECONDS = float(os.environ.get('COMPARABLES_CHECK_SECONDS', 5))
+
+def get_comparables(city, market):
+    """Comparables index of this city, re-featurized when its market data changes"""
+    index = city.derived('comparables', market.fingerprint, lambda: ComparablesIndex(
+        os.path.join(COMPARABLES_DIR, f'{city.name}.jsonl'),
+        lambda listing: parse_property(listing, market)['features'],
+        check_seconds=COMPARABLES_CHECK_SECONDS
+    ))
+    index.maybe_refresh()
+    return index
+
+def comparable_payload(distance, price, listing, same_zone):
+    sqft = float(listing.get('sqft') or 0)
+    return dict(
+        listing,
+        price=int(price),
+        pricePerSqft=int(price / sqft) if sqft > 0 else 0,
+        distance=round(distance, 4),
+        sameZone=same_zone
+    )
+
+@app.route('/comparables', methods=['POST', 'OPTIONS'])
+def comparables():
+    """The k listings nearest to a property in the price model's feature space"""
+    if request.method == 'OPTIONS':
+        return '', 204
+    try:
+        data = request.json
+        city = request_city()
+        market = city.market_store.current
+        k = int(data.get('k', 5))
+        if not 1 <= k <= MAX_COMPARABLES:
+            raise ValueError(f'k must be between 1 and {MAX_COMPARABLES}')
+
+        index = get_comparables(city, market)
+        with time_stage('parse_payload'):
+            parsed = parse_property(data, market)
+        with time_stage('comparables_query'):
+            found = index.query(parsed['features'], k)
+
+        return jsonify({
+            'success': True,
+            'comparables': [comparable_payload(*comparable) for comparable in found],
+            'index': index.stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
 def calculate_investment_score(zone_data):
     """Calculate investment score (2025 model)"""
     growth_score = min(zone_data['growth_rate'] * 4.5, 60)
@@ -803,16 +1370,161 @@ def generate_recommendation(zone_data, price):
             'expectedReturn': f'{int(growth * 5)}% in 5 years'
         }
 
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """Prediction cache of every resident city in this worker; predictionCache is Nagpur's"""
+    return jsonify({
+        'success': True,
+        'predictionCache': prediction_cache.stats(),
+        'cities': {city.name: city.prediction_cache.stats() for city in city_registry.resident()}
+    })
+
+@app.route('/city-stats', methods=['GET'])
+def city_stats():
+    """Per-city residency, load times and hit counts in this worker"""
+    return jsonify({
+        'success': True,
+        'cities': city_registry.stats()
+    })
+
+@app.route('/worker-stats', methods=['GET'])
+def worker_stats():
+    """Memory of the worker process that served this request"""
+    return jsonify({
+        'success': True,
+        'worker': memory_usage(),
+        'modelVersion': ml_predictor.model_version
+    })
+
+@app.route('/inference-stats', methods=['GET'])
+def inference_stats():
+    return jsonify({
+        'success': True,
+        'microBatching': inference_batcher.stats() if inference_batcher is not None else {'enabled': False}
+    })
+
+@app.route('/admin/retrain', methods=['GET', 'POST'])
+def admin_retrain():
+    """Start a background retrain (POST) or report on the last one (GET)"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+
+    if request.method == 'GET':
+        return jsonify({'success': True, 'retrain': model_retrainer.status()})
+
+    if not model_retrainer.trigger('admin'):
+        return jsonify({
+            'success': False,
+            'error': 'A retrain is already running',
+            'retrain': model_retrainer.status()
+        }), 409
+
+    return jsonify({'success': True, 'retrain': model_retrainer.status()}), 202
+
+@app.route('/admin/comparables', methods=['POST'])
+def admin_comparables():
+    """Add listings (each with a price) to the comparables index"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    try:
+        data = request.json
+        listings = data.get('listings') if isinstance(data, dict) else None
+        if not isinstance(listings, list) or not listings:
+            raise ValueError("'listings' must be a non-empty list")
+        if len(listings) > MAX_BATCH_SIZE:
+            raise ValueError(f'At most {MAX_BATCH_SIZE} listings per request')
+
+        city = request_city()
+        index = get_comparables(city, city.market_store.current)
+        stored = index.insert(listings)
+        return jsonify({
+            'success': True,
+            'inserted': len(stored),
+            'ids': [listing['id'] for listing in stored],
+            'index': index.stats()
+        }), 201
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/admin/profiler', methods=['GET', 'POST'])
+def admin_profiler():
+    """Profiler status (GET) or runtime settings (POST sampleRate / intervalMs / reset).
+
+    Settings reach every worker within a few seconds; the counts are those
+    of the worker that answered (its pid is in the response).
+    """
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+
+    try:
+        if request.method == 'POST':
+            data = request.json or {}
+            request_profiler.configure(
+                sample_rate=float(data['sampleRate']) if 'sampleRate' in data else None,
+                interval_ms=float(data['intervalMs']) if 'intervalMs' in data else None,
+                reset=bool(data.get('reset'))
+            )
+
+        return jsonify({'success': True, 'profiler': request_profiler.stats()})
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/admin/profiler/collapsed', methods=['GET'])
+def admin_profiler_collapsed():
+    """Collapsed stacks for flamegraph.pl, speedscope or inferno"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    response = Response(request_profiler.collapsed(), content_type='text/plain; charset=utf-8')
+    # Stacks are sampled per worker; say whose these are
+    response.headers['X-Profiler-Pid'] = str(os.getpid())
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of this worker's metrics.
+
+    Each gunicorn worker counts only the requests it served, and a scrape
+    lands on one worker. Series are labelled with the worker's pid, so sum
+    across pids in queries rather than reading one scrape as the whole app.
+    """
+    return Response(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the price model can serve, 503 while it loads"""
+    status = ml_predictor.status
+    if status == 'ready':
+        startup.mark('model ready', ml_predictor.ready_at)
+    return jsonify({
+        'ready': status == 'ready',
+        'model': status,
+        'error': ml_predictor.load_error,
+        'startup': startup.report()
+    }), 200 if status == 'ready' else 503
+
 @app.route('/health', methods=['GET'])
 def health():
+    bundle = ml_predictor.bundle
     return jsonify({
-        'status': 'healthy',
-        'ml_model': 'active',
-        'data_version': '2025-2026',
-        'accuracy': '96.2%',
+        'status': 'healthy' if bundle is not None else 'degraded',
+        'ml_model': 'active' if bundle is not None else 'not_trained',
+        'model_version': ml_predictor.model_version,
+        'data_version': ml_predictor.data_version,
+        'market_data_version': market_store.current.fingerprint,
+        'market_data_revision': market_store.current.version,
+        'accuracy': bundle.accuracy if bundle is not None else None,
+        'holdout': bundle.metrics if bundle is not None else None,
         'timestamp': datetime.now().isoformat()
     })
 
+startup.mark('app ready')
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     print("🚀 Starting Homeverse AI Backend API v2.1...")
@@ -0,0 +1,80 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.micro import latency_summary
+
+# Distinct requests generated per endpoint before timing starts
+REQUEST_POOL = 2000
+
+
+def request_pools(factory, size=REQUEST_POOL):
+    """endpoint -> list of (method, url, json body) shaped like frontend traffic"""
+    return {
+        '/predict': [('POST', '/predict', factory.property()) for _ in range(size)],
+        '/compare': [('POST', '/compare', factory.compare()) for _ in range(size)],
+        '/market-trends': [('GET', f'/market-trends?{factory.market_trends_query()}', None) for _ in range(size)],
+        '/investment-analysis': [('POST', '/investment-analysis', factory.investment()) for _ in range(size)]
+    }
+
+
+def drive(app, requests, concurrency, duration):
+    """Send requests round-robin from `concurrency` threads for `duration` seconds.
+
+    Runs in-process through Flask test clients, so it measures the app
+    (routing, parsing, model, serialization) without network or WSGI
+    server overhead.
+    """
+    deadline = time.perf_counter() + duration
+    counter = itertools.count()
+    lock = threading.Lock()
+    timings = []
+    errors = []
+
+    def worker():
+        client = app.test_client()
+        local_timings = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            method, url, body = requests[next(counter) % len(requests)]
+            t0 = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            local_timings.append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                local_errors += 1
+        with lock:
+            timings.extend(local_timings)
+            errors.append(local_errors)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    summary = latency_summary(timings, unit='ms')
+    summary.update({
+        'concurrency': concurrency,
+        'errors': sum(errors),
+        'throughput': round(len(timings) / elapsed, 1)
+    })
+    return summary
+
+
+def run_load(app_module, factory, concurrency=8, duration=5.0, endpoints=None):
+    """Throughput and latency percentiles per endpoint, each starting from a cold prediction cache"""
+    results = {}
+    cache = app_module.prediction_cache
+    for endpoint, requests in request_pools(factory).items():
+        if endpoints and endpoint not in endpoints:
+            continue
+        cache.clear()
+        hits, misses = cache.hits, cache.misses
+        results[endpoint] = drive(app_module.app, requests, concurrency, duration)
+
+        lookups = cache.hits - hits + cache.misses - misses
+        if lookups:
+            results[endpoint]['cacheHitRate'] = round((cache.hits - hits) / lookups, 3)
+    return results
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from comparables import ComparablesIndex
+from prediction_cache import PredictionCache
+
+
+def latency_summary(seconds, unit='ms'):
+    """Count, mean and p50/p95/p99 of per-call timings"""
+    scale = 1e3 if unit == 'ms' else 1e6
+    values = np.asarray(seconds) * scale
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': len(values),
+        f'mean{unit.capitalize()}': round(float(values.mean()), 3),
+        f'p50{unit.capitalize()}': round(float(p50), 3),
+        f'p95{unit.capitalize()}': round(float(p95), 3),
+        f'p99{unit.capitalize()}': round(float(p99), 3)
+    }
+
+
+def time_calls(fn, inputs, min_seconds=1.0, warmup=50):
+    """Call fn over inputs (cycling) for at least min_seconds, timing each call"""
+    for i in range(min(warmup, len(inputs))):
+        fn(inputs[i])
+
+    timings = []
+    started = time.perf_counter()
+    i = 0
+    while time.perf_counter() - started < min_seconds or i < len(inputs):
+        item = inputs[i % len(inputs)]
+        t0 = time.perf_counter()
+        fn(item)
+        timings.append(time.perf_counter() - t0)
+        i += 1
+
+    summary = latency_summary(timings, unit='us')
+    summary['opsPerSecond'] = round(len(timings) / sum(timings), 1)
+    return summary
+
+
+def run_micro(app_module, factory, min_seconds=1.0):
+    """Per-call latency of the pricing hot path, stage by stage"""
+    properties = [factory.property() for _ in range(2000)]
+    locations = [p['location'] for p in properties]
+    parsed = [app_module.parse_property(p) for p in properties]
+    features = [p['features'] for p in parsed]
+    batch = np.array(features[:256], dtype=float)
+    predictor = app_module.ml_predictor
+
+    results = {
+        'predict_zone': time_calls(app_module.predict_zone, locations, min_seconds),
+        'parse_property': time_calls(app_module.parse_property, properties, min_seconds),
+        'PropertyPricePredictor.predict': time_calls(predictor.predict, features, min_seconds),
+        'PropertyPricePredictor.predict_batch[256]': time_calls(predictor.predict_batch, [batch], min_seconds),
+        'PropertyPricePredictor.predict_spread': time_calls(predictor.predict_spread, [[f] for f in features], min_seconds),
+        'PropertyPricePredictor.predict_spread[256]': time_calls(predictor.predict_spread, [batch], min_seconds),
+        'calculate_price_ml': time_calls(app_module.calculate_price_ml, properties, min_seconds)
+    }
+
+    # Again with the cache off, so every call pays for parsing, inference and assembly
+    city = app_module.nagpur
+    cache = city.prediction_cache
+    city.prediction_cache = PredictionCache(max_entries=0)
+    try:
+        results['calculate_price_ml[uncached]'] = time_calls(app_module.calculate_price_ml, properties, min_seconds)
+        results['calculate_price_ml[uncached,uncertainty]'] = time_calls(
+            app_module.calculate_price_ml,
+            [dict(p, uncertainty=True) for p in properties],
+            min_seconds
+        )
+    finally:
+        city.prediction_cache = cache
+
+    # Nearest comparables among 20,000 listings, 100 of them not yet in the tree
+    with tempfile.TemporaryDirectory() as workdir:
+        index = ComparablesIndex(os.path.join(workdir, 'listings.jsonl'),
+                                 lambda listing: app_module.parse_property(listing)['features'])
+        listings = [factory.property() for _ in range(20100)]
+        for listing in listings:
+            listing['price'] = listing['sqft'] * 6500
+        index.insert(listings[:20000])
+        index.insert(listings[20000:])
+        results['ComparablesIndex.query[k=5]'] = time_calls(lambda f: index.query(f, 5), features, min_seconds)
+    return results
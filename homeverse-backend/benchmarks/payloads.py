@@ -0,0 +1,86 @@
+import random
+
+# Mirrors the options the frontend sends (homeverse-frontend/src/utils/data.js)
+PROPERTY_TYPES = [
+    {'id': 'apartment', 'name': 'Apartment', 'multiplier': 1.0},
+    {'id': 'independent', 'name': 'Independent House', 'multiplier': 1.15},
+    {'id': 'villa', 'name': 'Villa', 'multiplier': 1.30},
+    {'id': 'penthouse', 'name': 'Penthouse', 'multiplier': 1.50},
+    {'id': 'duplex', 'name': 'Duplex', 'multiplier': 1.25}
+]
+PROPERTY_TYPE_WEIGHTS = [0.55, 0.2, 0.1, 0.05, 0.1]
+
+BUILDING_AGES = [
+    {'id': 'new', 'name': 'Under Construction', 'multiplier': 1.10},
+    {'id': '0-5', 'name': '0-5 Years', 'multiplier': 1.05},
+    {'id': '5-10', 'name': '5-10 Years', 'multiplier': 1.0},
+    {'id': '10-15', 'name': '10-15 Years', 'multiplier': 0.95},
+    {'id': '15+', 'name': '15+ Years', 'multiplier': 0.85}
+]
+
+AMENITIES = [
+    {'id': 'parking', 'name': 'Covered Parking', 'price': 150000},
+    {'id': 'gym', 'name': 'Gymnasium', 'price': 0, 'priceImpact': 1.03},
+    {'id': 'pool', 'name': 'Swimming Pool', 'price': 0, 'priceImpact': 1.05},
+    {'id': 'garden', 'name': 'Garden', 'price': 0, 'priceImpact': 1.02},
+    {'id': 'security', 'name': '24/7 Security', 'price': 0, 'priceImpact': 1.02},
+    {'id': 'lift', 'name': 'Lift', 'price': 0, 'priceImpact': 1.04},
+    {'id': 'powerbackup', 'name': 'Power Backup', 'price': 0, 'priceImpact': 1.02},
+    {'id': 'clubhouse', 'name': 'Club House', 'price': 0, 'priceImpact': 1.04}
+]
+
+BEDROOMS = ['1', '2', '3', '4', '5+']
+BEDROOM_WEIGHTS = [0.1, 0.35, 0.35, 0.15, 0.05]
+FLOORS = ['ground'] + list(range(0, 21))
+
+
+class PayloadFactory:
+    """Seeded generator of request bodies shaped like real frontend traffic.
+
+    Locations are mostly known localities (as typed, lower-cased or with a
+    city suffix), some landmarks, and a share of free text that falls back
+    to the default zone.
+    """
+
+    def __init__(self, zones, landmarks, seed=42):
+        self.rng = random.Random(seed)
+        self.zones = list(zones)
+        self.localities = [locality for data in zones.values() for locality in data['localities']]
+        self.landmarks = list(landmarks)
+
+    def location(self):
+        roll = self.rng.random()
+        if roll < 0.6:
+            locality = self.rng.choice(self.localities)
+            return self.rng.choice([locality, locality.lower(), f'{locality}, Nagpur'])
+        if roll < 0.85:
+            return f'Near {self.rng.choice(self.landmarks)}'
+        return self.rng.choice(['Nagpur', 'New project on Wardha Road', 'Plot 42, Sector 7', ''])
+
+    def property(self):
+        return {
+            'location': self.location(),
+            'bedrooms': self.rng.choices(BEDROOMS, BEDROOM_WEIGHTS)[0],
+            'sqft': self.rng.randrange(450, 3500, 25),
+            'propertyType': self.rng.choices(PROPERTY_TYPES, PROPERTY_TYPE_WEIGHTS)[0],
+            'buildingAge': self.rng.choice(BUILDING_AGES),
+            'floor': self.rng.choice(FLOORS),
+            'amenities': self.rng.sample(AMENITIES, self.rng.randint(0, 6))
+        }
+
+    def compare(self):
+        return {'properties': [self.property() for _ in range(self.rng.randint(2, 5))]}
+
+    def market_trends_query(self):
+        roll = self.rng.random()
+        if roll < 0.4:
+            return f'zone={self.rng.choice(self.zones)}'
+        if roll < 0.8:
+            return f'locality={self.rng.choice(self.localities)}'
+        return 'zones=' + ','.join(self.rng.sample(self.zones, self.rng.randint(2, len(self.zones))))
+
+    def investment(self):
+        return {
+            'price': self.rng.randrange(2500000, 25000000, 50000),
+            'zone': self.rng.choice(self.zones)
+        }
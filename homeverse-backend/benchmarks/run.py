@@ -0,0 +1,168 @@
+# Benchmark and load-test suite. From homeverse-backend:
+#
+#   python -m benchmarks.run                      # run, save results/<timestamp>.json
+#   python -m benchmarks.run --save-baseline      # ...and make this run the baseline
+#   python -m benchmarks.run --baseline old.json  # compare; exit 1 on regression
+#
+# Results are plain JSON so two runs can also be diffed directly. Only
+# compare runs from the same machine and settings (see "meta").
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.load import run_load
+from benchmarks.micro import run_micro
+from benchmarks.payloads import PayloadFactory
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# Settings that change the numbers, recorded with every run
+SETTINGS = (
+    'INFERENCE_BACKEND',
+    'MODEL_PROFILE',
+    'MODEL_MEMORY_BUDGET_MB',
+    'TRAINING_SAMPLES',
+    'INFERENCE_BATCH_WINDOW_MS',
+    'PREDICTION_CACHE_SIZE',
+    'FUZZY_LOCATION_MATCHING'
+)
+
+# Metric -> True if bigger is better
+TRACKED = {
+    'p50Us': False,
+    'p95Us': False,
+    'p50Ms': False,
+    'p95Ms': False,
+    'p99Ms': False,
+    'opsPerSecond': True,
+    'throughput': True
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(results, baseline, tolerance):
+    """(section, name, metric, old, new) for every tracked metric worse than tolerance allows"""
+    regressions = []
+    for section in ('micro', 'load'):
+        for name, metrics in results.get(section, {}).items():
+            old_metrics = baseline.get(section, {}).get(name)
+            if not old_metrics:
+                continue
+            for metric, higher_is_better in TRACKED.items():
+                old = old_metrics.get(metric)
+                new = metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                if (-change if higher_is_better else change) > tolerance:
+                    regressions.append((section, name, metric, old, new))
+    return regressions
+
+
+def print_results(results):
+    for section, unit in (('micro', 'Us'), ('load', 'Ms')):
+        for name, m in results.get(section, {}).items():
+            rate = f"{m['throughput']} req/s" if 'throughput' in m else f"{m['opsPerSecond']} ops/s"
+            extra = f", {m['errors']} errors" if m.get('errors') else ''
+            if 'cacheHitRate' in m:
+                extra += f", {m['cacheHitRate']:.0%} cache hits"
+            print(
+                f"  {name:<44} p50 {m[f'p50{unit}']:>9} p95 {m[f'p95{unit}']:>9} "
+                f"p99 {m[f'p99{unit}']:>9} {unit.lower()}  {rate}{extra}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks and in-process load test for the Homeverse API')
+    parser.add_argument('--micro-seconds', type=float, default=1.0, help='minimum time per micro-benchmark')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds of load per endpoint')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads per endpoint')
+    parser.add_argument('--endpoint', action='append', help='only load-test this endpoint (repeatable)')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-load', action='store_true')
+    parser.add_argument('--seed', type=int, default=42, help='payload generator seed')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown before failing')
+    parser.add_argument('--save-baseline', action='store_true', help='copy this run to benchmarks/baseline.json')
+    args = parser.parse_args()
+
+    import app as app_module
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'modelVersion': app_module.ml_predictor.model_version,
+            'settings': {name: os.environ.get(name) for name in SETTINGS if os.environ.get(name) is not None},
+            'seed': args.seed
+        }
+    }
+
+    market = app_module.market_store.current
+    if not args.skip_micro:
+        print("⏱️ Micro-benchmarks (µs per call)")
+        results['micro'] = run_micro(app_module, PayloadFactory(market.zones, market.landmarks, args.seed),
+                                     args.micro_seconds)
+        print_results({'micro': results['micro']})
+
+    if not args.skip_load:
+        print(f"🔥 Load test ({args.concurrency} threads, {args.duration:g}s per endpoint, ms per request)")
+        results['load'] = run_load(
+            app_module,
+            # Different payloads from the micro-benchmarks, so nothing starts out cached
+            PayloadFactory(market.zones, market.landmarks, args.seed + 1),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            endpoints=args.endpoint
+        )
+        print_results({'load': results['load']})
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {output}")
+
+    if args.save_baseline:
+        shutil.copyfile(output, DEFAULT_BASELINE)
+        print(f"📌 Baseline updated: {DEFAULT_BASELINE}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ No baseline to compare against (run with --save-baseline)")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline} ({baseline['meta'].get('commit')})")
+        return
+
+    print(f"❌ {len(regressions)} REGRESSION(S) beyond {args.tolerance:.0%} against {args.baseline}:")
+    for section, name, metric, old, new in regressions:
+        print(f"   {section} {name} {metric}: {old} -> {new} ({(new - old) / old:+.0%})")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
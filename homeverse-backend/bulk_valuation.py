@@ -0,0 +1,307 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Payload field -> default listings column
+DEFAULT_COLUMNS = {
+    'id': 'id',
+    'location': 'location',
+    'bedrooms': 'bedrooms',
+    'sqft': 'sqft',
+    'propertyType': 'property_type_multiplier',
+    'buildingAge': 'building_age_multiplier',
+    'floor': 'floor',
+    'amenities': 'amenities'
+}
+
+# Flat columns written for --format csv, as (header, path into the prediction)
+CSV_FIELDS = (
+    ('price', ('price',)),
+    ('pricePerSqft', ('pricePerSqft',)),
+    ('mlPrediction', ('breakdown', 'mlPrediction')),
+    ('marketCalculation', ('breakdown', 'marketCalculation')),
+    ('zone', ('zoneInfo', 'detectedZone')),
+    ('confidence', ('zoneInfo', 'confidence')),
+    ('matchedLocality', ('zoneInfo', 'matchedLocality'))
+)
+
+
+def _missing(value):
+    return value is None or value == '' or (isinstance(value, float) and value != value)
+
+
+def _integral(value):
+    """'3', '3.0', 3 and 3.0 -> 3, so a listings file behaves like the JSON the frontend sends"""
+    if isinstance(value, str):
+        value = _number(value.strip())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _number(value):
+    """Numeric text -> float; anything else is passed on for parse_property to reject"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _amenities(value):
+    """A JSON list (as the API takes it) or ';'-separated amenity names"""
+    if isinstance(value, list):
+        return value
+    value = str(value).strip()
+    if value.startswith('['):
+        return json.loads(value)
+    return [name.strip() for name in value.split(';') if name.strip()]
+
+
+def row_to_payload(row, columns):
+    """One listings row -> the request body /predict would get for it"""
+    payload = {}
+    for field, column in columns.items():
+        if field == 'id':
+            continue
+        value = row.get(column)
+        if _missing(value):
+            continue
+        if field == 'location':
+            payload[field] = str(value)
+        elif field in ('bedrooms', 'floor'):
+            payload[field] = _integral(value)
+        elif field == 'sqft':
+            payload[field] = value
+        elif field in ('propertyType', 'buildingAge'):
+            payload[field] = {'multiplier': _number(value)}
+        elif field == 'amenities':
+            payload[field] = _amenities(value)
+    return payload
+
+
+def read_chunks(path, chunk_rows):
+    """Lists of row dicts, chunk_rows at a time, without loading the whole file"""
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit('Reading Parquet needs pyarrow (pip install pyarrow)')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pylist()
+        return
+
+    import pandas as pd
+
+    # Read everything as text so values reach parse_property as they would in JSON
+    for frame in pd.read_csv(path, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+        yield frame.to_dict('records')
+
+
+def count_rows(path):
+    """Row count when it is cheap to get (Parquet metadata), else None"""
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+# Set in each worker by _init_worker (the app is inherited from the parent by fork)
+_city = None
+
+
+def _init_worker(city_name):
+    global _city
+    import app
+    from prediction_cache import PredictionCache
+
+    _city = app.city_registry.get(city_name, count_hit=False)
+    # Parallelism comes from the processes; no point caching rows seen once
+    _city.predictor.set_inference_jobs(1)
+    _city.prediction_cache = PredictionCache(max_entries=0)
+
+
+def value_chunk(start, rows, columns):
+    """Value one chunk; returns encoded output records in input order"""
+    import app
+
+    payloads = []
+    bad_rows = {}
+    for offset, row in enumerate(rows):
+        try:
+            payloads.append(row_to_payload(row, columns))
+        except Exception as e:
+            bad_rows[offset] = {'success': False, 'error': str(e)}
+    results = iter(app.calculate_price_batch(payloads, _city))
+    records = []
+    for offset, row in enumerate(rows):
+        result = bad_rows.get(offset) or next(results)
+        record = {'row': start + offset}
+        if columns.get('id') in row:
+            record['id'] = row[columns['id']]
+        record.update(result)
+        records.append(record)
+    return records
+
+
+class JsonLinesWriter:
+    """One JSON record per row, predictions serialized exactly as the API does"""
+
+    def __init__(self, f):
+        import app
+
+        self.f = f
+        self.dumps = app.app.json.dumps
+
+    def write(self, records):
+        self.f.write(''.join(self.dumps(record, separators=(',', ':')) + '\n' for record in records))
+
+
+class CsvWriter:
+    """Key prediction fields as flat columns"""
+
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(['row', 'id', 'success'] + [name for name, _ in CSV_FIELDS] + ['error'])
+
+    def write(self, records):
+        for record in records:
+            values = []
+            for _, path in CSV_FIELDS:
+                value = record.get('prediction')
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                values.append(value)
+            self.writer.writerow([record['row'], record.get('id'), record['success']] + values + [record.get('error')])
+
+
+class Progress:
+    def __init__(self, total=None, every_seconds=5.0, stream=sys.stderr):
+        self.total = total
+        self.every_seconds = every_seconds
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.rows = 0
+        self.failed = 0
+
+    def add(self, records):
+        self.rows += len(records)
+        self.failed += sum(1 for record in records if not record['success'])
+        now = time.perf_counter()
+        if now - self.last_report >= self.every_seconds:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now=None):
+        elapsed = (now or time.perf_counter()) - self.started
+        rate = self.rows / elapsed if elapsed else 0.0
+        line = f"⏳ {self.rows:,} rows valued ({self.failed:,} failed), {rate:,.0f} rows/s, {elapsed:.1f}s elapsed"
+        if self.total:
+            remaining = (self.total - self.rows) / rate if rate else 0
+            line += f", {self.rows / self.total:.0%} done, ~{remaining:.0f}s left"
+        print(line, file=self.stream, flush=True)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'rows': self.rows,
+            'failed': self.failed,
+            'seconds': round(elapsed, 2),
+            'rowsPerSecond': round(self.rows / elapsed, 1) if elapsed else None
+        }
+
+
+def run(input_path, output_path, columns, city='nagpur', workers=None, chunk_rows=5000, output_format='jsonl',
+        progress_seconds=5.0):
+    """Value every row of input_path into output_path; returns a summary dict.
+
+    Chunks go to a pool of forked workers that share the parent's loaded
+    model and market data. At most two chunks per worker are in flight and
+    finished chunks are written in input order, so memory stays bounded by
+    the chunk size rather than the file size.
+    """
+    import app
+
+    app.ml_predictor.wait_until_loaded()
+    app.city_registry.get(city, count_hit=False)
+    workers = workers or os.cpu_count() or 1
+
+    progress = Progress(count_rows(input_path), progress_seconds)
+    context = multiprocessing.get_context('fork')
+    with open(output_path, 'w', newline='') as f, \
+            ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(city,)) as pool:
+        writer = CsvWriter(f) if output_format == 'csv' else JsonLinesWriter(f)
+        pending = {}
+        finished = {}
+        next_chunk = 0
+
+        def drain(block):
+            nonlocal next_chunk
+            done, _ = wait(pending, return_when=FIRST_COMPLETED) if block else (
+                [future for future in pending if future.done()], None)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+            while next_chunk in finished:
+                records = finished.pop(next_chunk)
+                writer.write(records)
+                progress.add(records)
+                next_chunk += 1
+
+        start = 0
+        for index, rows in enumerate(read_chunks(input_path, chunk_rows)):
+            while len(pending) >= 2 * workers:
+                drain(block=True)
+            pending[pool.submit(value_chunk, start, rows, columns)] = index
+            start += len(rows)
+            drain(block=False)
+        while pending:
+            drain(block=True)
+
+    progress.report()
+    return progress.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Value a CSV/Parquet listings file offline, with the same pricing as POST /predict'
+    )
+    parser.add_argument('input', help='listings file (.csv or .parquet)')
+    parser.add_argument('output', help='results file: JSON lines (one /predict-batch result per row) or CSV')
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help='output format (default: from the extension)')
+    parser.add_argument('--city', default='nagpur')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--chunk-rows', type=int, default=5000, help='rows valued per model call')
+    parser.add_argument(
+        '--column',
+        action='append',
+        default=[],
+        metavar='FIELD=COLUMN',
+        help=f"map a payload field to a listings column (fields: {', '.join(DEFAULT_COLUMNS)})"
+    )
+    parser.add_argument('--progress-seconds', type=float, default=5.0, help='seconds between progress lines')
+    args = parser.parse_args()
+
+    columns = dict(DEFAULT_COLUMNS)
+    for mapping in args.column:
+        field, _, column = mapping.partition('=')
+        if field not in DEFAULT_COLUMNS or not column:
+            parser.error(f"bad --column '{mapping}' (expected FIELD=COLUMN with FIELD in: {', '.join(DEFAULT_COLUMNS)})")
+        columns[field] = column
+    output_format = args.format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+
+    summary = run(args.input, args.output, columns, args.city, args.workers, args.chunk_rows, output_format,
+                  args.progress_seconds)
+    print(f"✅ Valued {summary['rows']:,} listings ({summary['failed']:,} failed) in {summary['seconds']}s "
+          f"({summary['rowsPerSecond']:,} rows/s) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
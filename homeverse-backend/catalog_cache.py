@@ -0,0 +1,69 @@
+import gzip
+import hashlib
+import threading
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+
+class EncodedPayload:
+    """One JSON body pre-encoded as identity, gzip and (if available) brotli"""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.encoded = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(body, quality=11)
+
+
+class CatalogCache:
+    """Pre-serialized responses for data that only changes with the market data.
+
+    Each named payload is built once per data version and kept as ready-to-send
+    bytes with a content hash, so repeated requests cost a dict lookup plus a
+    conditional/encoding check instead of walking and re-serializing the data.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, version, build):
+        entry = self._payloads.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        with self._lock:
+            entry = self._payloads.get(name)
+            if entry is None or entry[0] != version:
+                # Same bytes jsonify would produce for this payload
+                body = self.app.json.response(build()).get_data()
+                entry = (version, EncodedPayload(body))
+                self._payloads[name] = entry
+        return entry[1]
+
+    def respond(self, name, version, build, request):
+        payload = self.get(name, version, build)
+        headers = {
+            'ETag': f'W/"{payload.etag}"',
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': 'no-cache'
+        }
+
+        if request.if_none_match.contains_weak(payload.etag):
+            return Response(status=304, headers=headers)
+
+        body = payload.body
+        for coding in ('br', 'gzip'):
+            if coding in payload.encoded and request.accept_encodings[coding]:
+                body = payload.encoded[coding]
+                headers['Content-Encoding'] = coding
+                break
+
+        return Response(body, mimetype='application/json', headers=headers)
@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from ml_model import forest_nbytes
+
+
+class UnknownCityError(ValueError):
+    pass
+
+
+class City:
+    """Everything one city serves from: market data, price model and per-city caches"""
+
+    def __init__(self, name, market_store, predictor, prediction_cache, batcher=None, retrainer=None):
+        self.name = name
+        self.market_store = market_store
+        self.predictor = predictor
+        self.prediction_cache = prediction_cache
+        self.batcher = batcher
+        self.retrainer = retrainer
+        self._derived = {}
+
+    def derived(self, name, key, build):
+        """Value built once per key (e.g. market data version) and dropped with the city"""
+        entry = self._derived.get(name)
+        if entry is None or entry[0] != key:
+            entry = self._derived[name] = (key, build())
+        return entry[1]
+
+    def close(self):
+        """Stop the city's background threads so its model can be freed"""
+        if self.retrainer is not None:
+            self.retrainer.stop()
+
+    @property
+    def nbytes(self):
+        """Resident size of the model, which dominates a city's footprint"""
+        bundle = self.predictor.bundle
+        if bundle is None:
+            return 0
+        engine = getattr(bundle, 'engine', None)
+        return forest_nbytes(bundle.model) + (engine.nbytes if engine is not None else 0)
+
+
+class CityRegistry:
+    """Cities loaded on first use and kept resident in LRU order.
+
+    loader(name) builds a City; available() lists the names that can be
+    loaded. At most max_resident cities (and, with a memory budget, at most
+    that many model bytes) stay loaded; the least recently used unpinned
+    city is dropped to make room. A city is loaded by one thread at a time,
+    while requests for resident cities only take the registry lock for a
+    dict lookup.
+
+    With hits_path set, per-city request counts are written there every
+    hits_flush_seconds, and hottest() ranks cities by them so the next boot
+    can preload the busiest ones.
+    """
+
+    def __init__(self, loader, available, max_resident=4, memory_budget_mb=0, hits_path=None,
+                 hits_flush_seconds=60):
+        self.loader = loader
+        self.available = available
+        self.max_resident = max_resident
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.hits_path = hits_path
+        self.hits_flush_seconds = hits_flush_seconds
+
+        self._resident = OrderedDict()
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._stats = {}
+        self._saved_hits = self._read_hits()
+        self._next_flush = time.monotonic() + hits_flush_seconds
+
+    def _city_stats(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {
+                'hits': 0,
+                'loads': 0,
+                'evictions': 0,
+                'loadSeconds': None,
+                'totalLoadSeconds': 0.0,
+                'lastUsed': None
+            }
+        return stats
+
+    def add(self, city, pinned=False):
+        """Register an already-built city (pinned cities are never evicted)"""
+        with self._lock:
+            self._resident[city.name] = city
+            self._city_stats(city.name)
+            if pinned:
+                self._pinned.add(city.name)
+            self._evict(keep=city.name)
+
+    def get(self, name, count_hit=True):
+        name = name.strip().lower()
+        with self._lock:
+            city = self._resident.get(name)
+            if city is not None:
+                self._resident.move_to_end(name)
+                if count_hit:
+                    self._touch(name)
+                return city
+
+        if name not in self.available():
+            raise UnknownCityError(f'Unknown city: {name}')
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            with self._lock:
+                city = self._resident.get(name)
+            if city is None:
+                city = self._load(name)
+        if count_hit:
+            with self._lock:
+                self._touch(name)
+        return city
+
+    def _load(self, name):
+        started = time.perf_counter()
+        city = self.loader(name)
+        seconds = round(time.perf_counter() - started, 3)
+        with self._lock:
+            self._resident[name] = city
+            stats = self._city_stats(name)
+            stats['loads'] += 1
+            stats['loadSeconds'] = seconds
+            stats['totalLoadSeconds'] = round(stats['totalLoadSeconds'] + seconds, 3)
+            self._evict(keep=name)
+        print(f"🏙️ Loaded city {name} in {seconds}s ({city.nbytes / 1e6:.1f} MB model)")
+        return city
+
+    def _touch(self, name):
+        stats = self._city_stats(name)
+        stats['hits'] += 1
+        stats['lastUsed'] = time.time()
+        if self.hits_path and time.monotonic() >= self._next_flush:
+            self._next_flush = time.monotonic() + self.hits_flush_seconds
+            threading.Thread(target=self.save_hits, name='city-hits', daemon=True).start()
+
+    def _over_budget(self):
+        if len(self._resident) > self.max_resident:
+            return True
+        if self.memory_budget_bytes:
+            return sum(city.nbytes for city in self._resident.values()) > self.memory_budget_bytes
+        return False
+
+    def _evict(self, keep):
+        """Drop least recently used unpinned cities until within limits (called with the lock held)"""
+        while self._over_budget():
+            victim = next((name for name in self._resident if name not in self._pinned and name != keep), None)
+            if victim is None:
+                return
+            self._resident.pop(victim).close()
+            self._stats[victim]['evictions'] += 1
+            print(f"🧹 Evicted city {victim} from memory")
+
+    def preload(self, names):
+        """Load cities ahead of traffic (e.g. at boot, before workers fork)"""
+        for name in names:
+            try:
+                self.get(name, count_hit=False)
+            except Exception as e:
+                print(f"⚠️ Could not preload city {name}: {e}")
+
+    def resident(self):
+        with self._lock:
+            return list(self._resident.values())
+
+    def _read_hits(self):
+        if not self.hits_path:
+            return {}
+        try:
+            with open(self.hits_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def total_hits(self):
+        """Hits saved by earlier runs plus this process's"""
+        totals = dict(self._saved_hits)
+        for name, stats in list(self._stats.items()):
+            totals[name] = totals.get(name, 0) + stats['hits']
+        return totals
+
+    def save_hits(self):
+        tmp_path = f'{self.hits_path}.tmp-{os.getpid()}'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.hits_path)), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(self.total_hits(), f)
+            os.replace(tmp_path, self.hits_path)
+        except OSError as e:
+            print(f"⚠️ Could not save city hit counts: {e}")
+
+    def hottest(self, n):
+        """Up to n loadable cities that aren't resident yet, busiest first by saved hit counts"""
+        available = self.available()
+        ranked = sorted(self._saved_hits.items(), key=lambda item: item[1], reverse=True)
+        return [name for name, _ in ranked if name in available and name not in self._resident][:n]
+
+    def stats(self):
+        with self._lock:
+            resident = {name: city.nbytes for name, city in self._resident.items()}
+            cities = {name: dict(stats) for name, stats in self._stats.items()}
+        for name, stats in cities.items():
+            stats['resident'] = name in resident
+            stats['pinned'] = name in self._pinned
+            stats['modelBytes'] = resident.get(name)
+            if stats['lastUsed'] is not None:
+                stats['lastUsed'] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(stats['lastUsed']))
+        return {
+            'available': sorted(self.available()),
+            'resident': list(resident),
+            'maxResident': self.max_resident,
+            'memoryBudgetBytes': self.memory_budget_bytes or None,
+            'residentBytes': sum(resident.values()),
+            'cities': cities
+        }
@@ -0,0 +1,250 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+
+# Zone is categorical: listings in another zone are this much further away
+# (in standard deviations of the other features), whichever zone it is, so
+# comparables come from the property's own zone whenever it has enough
+ZONE_PENALTY = 10.0
+# Listings searched by brute force before the KD-trees are rebuilt to include them
+REBUILD_THRESHOLD = 512
+MAX_COMPARABLES = 50
+
+
+def listing_values(listing):
+    """(price, sqft) of a listing, both positive numbers, else ValueError"""
+    values = []
+    for field in ('price', 'sqft'):
+        try:
+            value = float(listing[field])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Each listing needs a numeric '{field}'")
+        if not np.isfinite(value) or value <= 0:
+            raise ValueError(f"Each listing needs a positive '{field}'")
+        values.append(value)
+    return tuple(values)
+
+
+class _Partition:
+    """One zone's listings: a KD-tree over the first rows and the scaled rows added since"""
+
+    def __init__(self, tree, indexed_rows, tail, tail_rows):
+        self.tree = tree
+        self.indexed_rows = indexed_rows
+        self.tail = tail
+        self.tail_rows = tail_rows
+
+    def query(self, x, k):
+        distances, rows = np.empty(0), np.empty(0, dtype=np.intp)
+        if len(self.indexed_rows):
+            found_distances, found = self.tree.query(x[np.newaxis], k=min(k, len(self.indexed_rows)))
+            distances, rows = found_distances[0], self.indexed_rows[found[0]]
+        if len(self.tail_rows):
+            distances = np.concatenate([distances, np.sqrt(((self.tail - x) ** 2).sum(axis=1))])
+            rows = np.concatenate([rows, self.tail_rows])
+            nearest = np.argsort(distances, kind='stable')[:k]
+            distances, rows = distances[nearest], rows[nearest]
+        return distances, rows
+
+
+class _Snapshot:
+    """What a query reads: per-zone partitions over one set of listings"""
+
+    def __init__(self, partitions, weights, listings, prices, size, n_indexed):
+        self.partitions = partitions
+        self.weights = weights
+        self.listings = listings
+        self.prices = prices
+        self.size = size
+        self.n_indexed = n_indexed
+
+
+class ComparablesIndex:
+    """Nearest listings to a property in the model's feature space.
+
+    Listings are stored one JSON object per line in path; every process
+    indexes the file and picks up lines appended by others (at most every
+    check_seconds), so inserts through any gunicorn worker reach all of them.
+    featurize(listing) turns a listing into the feature vector
+    calculate_price_ml builds for it, zone first.
+
+    Each zone has its own KD-tree over the remaining features, scaled to unit
+    standard deviation; listings from other zones only fill in (ZONE_PENALTY
+    further away) when the zone has fewer than k. New listings go to a small
+    per-zone tail that queries scan by brute force; once rebuild_threshold
+    rows are pending the trees are rebuilt over everything. Queries read one
+    immutable snapshot and never lock.
+    """
+
+    def __init__(self, path, featurize, check_seconds=5.0, rebuild_threshold=REBUILD_THRESHOLD, leaf_size=40):
+        self.path = path
+        self.featurize = featurize
+        self.check_seconds = check_seconds
+        self.rebuild_threshold = rebuild_threshold
+        self.leaf_size = leaf_size
+
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._features = np.empty((0, 0))
+        self._prices = np.empty(0)
+        self._listings = []
+        self._count = 0
+        self._next_check = 0.0
+        self._snapshot = _Snapshot({}, None, [], self._prices, 0, 0)
+        self.rebuilds = 0
+        self.last_rebuild_seconds = None
+        self.skipped = 0
+        self.refresh()
+
+    def maybe_refresh(self):
+        """Cheap per-request check; reads new lines at most every check_seconds"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_seconds
+            self.refresh()
+
+    def refresh(self):
+        """Index listings appended to the file since the last read; returns how many were added"""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            if size <= self._offset:
+                return 0
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            # A line still being written is picked up on the next refresh
+            end = data.rfind(b'\n') + 1
+            self._offset += end
+
+            rows = []
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    listing = json.loads(line)
+                    price, _ = listing_values(listing)
+                    rows.append((self.featurize(listing), price, listing))
+                except Exception as e:
+                    self.skipped += 1
+                    print(f"⚠️ Skipping unreadable listing in {self.path}: {e}")
+            self._append(rows)
+            return len(rows)
+
+    def _append(self, rows):
+        """Add rows to the arrays and publish a new snapshot (called with the lock held)"""
+        if not rows:
+            return
+        features = np.array([row[0] for row in rows], dtype=float)
+        start = self._count
+        needed = start + len(rows)
+        if needed > len(self._features):
+            # Grow by doubling; snapshots keep the arrays they were built from
+            capacity = max(needed, 2 * len(self._features), 64)
+            grown = np.empty((capacity, features.shape[1]))
+            prices = np.empty(capacity)
+            if start:
+                grown[:start] = self._features[:start]
+                prices[:start] = self._prices[:start]
+            self._features, self._prices = grown, prices
+        self._features[start:needed] = features
+        self._prices[start:needed] = [row[1] for row in rows]
+        self._listings.extend(row[2] for row in rows)
+        self._count = needed
+
+        snapshot = self._snapshot
+        if snapshot.weights is None or needed - snapshot.n_indexed >= self.rebuild_threshold:
+            self._rebuild()
+            return
+
+        # Only the zones that got listings need a new tail
+        partitions = dict(snapshot.partitions)
+        for zone in np.unique(features[:, 0]).astype(int).tolist():
+            new_rows = start + np.flatnonzero(features[:, 0] == zone)
+            old = partitions.get(zone) or _Partition(None, np.empty(0, dtype=np.intp), None, np.empty(0, dtype=np.intp))
+            tail_rows = np.concatenate([old.tail_rows, new_rows])
+            partitions[zone] = _Partition(old.tree, old.indexed_rows, self._features[tail_rows, 1:] * snapshot.weights,
+                                          tail_rows)
+        self._snapshot = _Snapshot(partitions, snapshot.weights, self._listings, self._prices, needed,
+                                   snapshot.n_indexed)
+
+    def _rebuild(self):
+        from sklearn.neighbors import KDTree
+
+        started = time.perf_counter()
+        features = self._features[:self._count]
+        std = features[:, 1:].std(axis=0)
+        weights = 1 / np.where(std > 0, std, 1.0)
+        zones = features[:, 0].astype(int)
+        partitions = {}
+        for zone in np.unique(zones).tolist():
+            rows = np.flatnonzero(zones == zone)
+            tree = KDTree(features[rows, 1:] * weights, leaf_size=self.leaf_size)
+            partitions[zone] = _Partition(tree, rows, None, np.empty(0, dtype=np.intp))
+        self._snapshot = _Snapshot(partitions, weights, self._listings, self._prices, self._count, self._count)
+        self.rebuilds += 1
+        self.last_rebuild_seconds = round(time.perf_counter() - started, 4)
+
+    def insert(self, listings):
+        """Validate, store and index new listings (each needs a price and sqft); returns them with ids"""
+        stored = []
+        for listing in listings:
+            if not isinstance(listing, dict):
+                raise ValueError('Each listing must be an object')
+            price, sqft = listing_values(listing)
+            self.featurize(listing)
+            stored.append(dict(listing, id=str(listing.get('id') or uuid.uuid4().hex[:12]), price=price, sqft=sqft))
+
+        if stored:
+            data = ''.join(json.dumps(listing, separators=(',', ':')) + '\n' for listing in stored).encode()
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # One O_APPEND write, so lines from concurrent workers never interleave
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            self.refresh()
+        return stored
+
+    def query(self, features, k=5):
+        """The k nearest listings as (distance, price, listing, same_zone), nearest first"""
+        snapshot = self._snapshot
+        if snapshot.size == 0:
+            return []
+        zone = int(features[0])
+        x = np.asarray(features[1:], dtype=float) * snapshot.weights
+
+        found = []
+        own = snapshot.partitions.get(zone)
+        if own is not None:
+            distances, rows = own.query(x, k)
+            found = [(float(d), row, True) for d, row in zip(distances, rows)]
+        if len(found) < k:
+            # Too few in the zone: the nearest of every other zone, all equally far apart
+            need = k - len(found)
+            others = []
+            for other_zone, partition in snapshot.partitions.items():
+                if other_zone != zone:
+                    distances, rows = partition.query(x, need)
+                    others.extend((float(d) + ZONE_PENALTY, row, False) for d, row in zip(distances, rows))
+            found += sorted(others, key=lambda item: item[0])[:need]
+        return [(d, float(snapshot.prices[row]), snapshot.listings[row], same_zone) for d, row, same_zone in found]
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'listings': snapshot.size,
+            'indexed': snapshot.n_indexed,
+            'pending': snapshot.size - snapshot.n_indexed,
+            'zones': len(snapshot.partitions),
+            'rebuilds': self.rebuilds,
+            'lastRebuildSeconds': self.last_rebuild_seconds,
+            'skipped': self.skipped
+        }
@@ -0,0 +1,214 @@
+import argparse
+import copy
+import os
+
+import numpy as np
+
+# sklearn marks leaves with -1 children
+TREE_LEAF = -1
+
+_SIGN_BIT = np.int64(-2 ** 63)
+
+
+class FlatForest:
+    """RandomForest flattened into contiguous node arrays for fast inference.
+
+    Every tree is appended to one set of arrays (feature, threshold, left,
+    right, value). Leaves point back at themselves so all trees can be walked
+    together for a fixed number of steps without branching per tree.
+
+    When a fitted StandardScaler is given its transform is folded into the
+    thresholds, so raw feature rows are compared directly. The folded
+    thresholds reproduce sklearn's float32 comparison of scaled values
+    exactly, which keeps predictions identical to RandomForest.predict.
+    """
+
+    def __init__(self, model, scaler=None):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees], dtype=np.intp)
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+
+        self.n_trees = len(trees)
+        self.n_features = model.n_features_in_
+        self.roots = offsets
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        feature = []
+        threshold = []
+        left = []
+        right = []
+        value = []
+        for tree, offset in zip(trees, offsets):
+            own = np.arange(tree.node_count, dtype=np.intp) + offset
+            is_leaf = tree.children_left == TREE_LEAF
+            feature.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.intp))
+            right.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.intp))
+            value.append(tree.value[:, 0, 0])
+
+        self.feature = np.ascontiguousarray(np.concatenate(feature))
+        self.left = np.ascontiguousarray(np.concatenate(left))
+        self.right = np.ascontiguousarray(np.concatenate(right))
+        self.value = np.ascontiguousarray(np.concatenate(value), dtype=np.float64)
+
+        threshold = np.concatenate(threshold)
+        if scaler is not None:
+            is_split = np.isfinite(threshold)
+            threshold[is_split] = fold_thresholds(
+                threshold[is_split],
+                self.feature[is_split],
+                scaler.mean_,
+                scaler.scale_
+            )
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.value))
+
+    def leaves(self, X):
+        """Leaf index reached in every tree, shape (n_rows, n_trees)"""
+        X = np.asarray(X, dtype=np.float64)
+        node = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+        rows = np.arange(X.shape[0])[:, None]
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict(self, X):
+        """Forest mean for every row of a raw (unscaled) feature matrix"""
+        leaf_values = self.value[self.leaves(X)]
+        # Sequential accumulation in tree order, as RandomForestRegressor does
+        return np.cumsum(leaf_values, axis=1)[:, -1] / self.n_trees
+
+    def tree_values(self, X):
+        """Leaf value of every tree for every row, shape (n_rows, n_trees)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.shape[0] == 1:
+            # One row: walk all trees as a single vector
+            x = X[0]
+            node = self.roots
+            for _ in range(self.max_depth):
+                go_left = x[self.feature[node]] <= self.threshold[node]
+                node = np.where(go_left, self.left[node], self.right[node])
+            return self.value[node][None, :]
+        return self.value[self.leaves(X)]
+
+    def predict_one(self, features):
+        """Forest mean for a single raw feature row"""
+        x = np.asarray(features, dtype=np.float64)
+        node = self.roots
+        for _ in range(self.max_depth):
+            go_left = x[self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return np.cumsum(self.value[node])[-1] / self.n_trees
+
+
+def _ordered(x):
+    """Map float64 values onto int64 keys that sort the same way"""
+    bits = x.view(np.int64)
+    return np.where(bits >= 0, bits, _SIGN_BIT - bits)
+
+
+def _unordered(keys):
+    return np.where(keys >= 0, keys, _SIGN_BIT - keys).view(np.float64)
+
+
+def fold_thresholds(threshold, feature, mean, scale):
+    """Raw-space thresholds T with  x <= T  <=>  float32((x - mean) / scale) <= t
+
+    sklearn scales in float64, casts to float32 and compares against the
+    float64 split threshold. That mapping is monotonic in x, so the exact
+    cut-off is found by bisecting over neighbouring float64 values around
+    t * scale + mean.
+    """
+    mean = np.asarray(mean, dtype=np.float64)[feature]
+    scale = np.asarray(scale, dtype=np.float64)[feature]
+
+    def passes(x):
+        scaled = ((x - mean) / scale).astype(np.float32).astype(np.float64)
+        return scaled <= threshold
+
+    estimate = threshold * scale + mean
+    margin = np.abs(estimate) * 1e-6 + scale * 1e-6 + 1e-12
+
+    lo = estimate - margin
+    hi = estimate + margin
+    while True:
+        bad_lo = ~passes(lo)
+        bad_hi = passes(hi)
+        if not bad_lo.any() and not bad_hi.any():
+            break
+        margin = margin * 2
+        lo = np.where(bad_lo, estimate - margin, lo)
+        hi = np.where(bad_hi, estimate + margin, hi)
+
+    lo_key = _ordered(lo)
+    hi_key = _ordered(hi)
+    while True:
+        open_ = hi_key - lo_key > 1
+        if not open_.any():
+            break
+        mid_key = lo_key + (hi_key - lo_key) // 2
+        mid_passes = passes(_unordered(mid_key))
+        lo_key = np.where(open_ & mid_passes, mid_key, lo_key)
+        hi_key = np.where(open_ & ~mid_passes, mid_key, hi_key)
+
+    return _unordered(lo_key)
+
+
+def parity_rows(forest, base_rows, n_boundary=2000, seed=0):
+    """Probe rows: the given rows plus values sitting exactly on split cut-offs"""
+    rng = np.random.RandomState(seed)
+    base_rows = np.asarray(base_rows, dtype=np.float64)
+    splits = np.flatnonzero(np.isfinite(forest.threshold))
+    picked = rng.choice(splits, size=min(n_boundary, len(splits)), replace=False)
+
+    rows = base_rows[rng.randint(0, len(base_rows), 2 * len(picked))].copy()
+    cut = forest.threshold[picked]
+    index = np.arange(len(picked))
+    rows[index, forest.feature[picked]] = cut
+    rows[index + len(picked), forest.feature[picked]] = np.nextafter(cut, np.inf)
+    return np.vstack([base_rows, rows])
+
+
+def check_parity(forest, model, scaler, rows):
+    """Compare the flat engine with sklearn; returns (identical, max_abs_diff)"""
+    # n_jobs=1 so sklearn sums the trees in order rather than as threads finish
+    reference = copy.copy(model)
+    reference.n_jobs = 1
+    expected = reference.predict(scaler.transform(rows))
+
+    batch = forest.predict(rows)
+    single = np.array([forest.predict_one(row) for row in rows[:200]])
+
+    max_diff = max(
+        float(np.max(np.abs(batch - expected))),
+        float(np.max(np.abs(single - expected[:200])))
+    )
+    identical = np.array_equal(batch, expected) and np.array_equal(single, expected[:200])
+    return identical, max_diff
+
+
+def main():
+    from ml_model import DEFAULT_MODEL_PATH, FEATURE_NAMES, PropertyPricePredictor
+
+    parser = argparse.ArgumentParser(description='Check the flat forest engine against scikit-learn')
+    parser.add_argument('--model', default=os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH))
+    args = parser.parse_args()
+
+    predictor = PropertyPricePredictor(model_path=args.model)
+    forest = FlatForest(predictor.model, predictor.scaler)
+    base_rows = predictor.generate_training_data(seed=7)[FEATURE_NAMES].to_numpy(dtype=float)
+    rows = parity_rows(forest, base_rows)
+
+    identical, max_diff = check_parity(forest, predictor.model, predictor.scaler, rows)
+    print(f"🌲 {forest.n_trees} trees, {len(forest.value)} nodes, {forest.nbytes / 1e6:.1f} MB")
+    print(f"{'✅' if identical else '❌'} {len(rows)} rows compared, max abs diff {max_diff}")
+    raise SystemExit(0 if identical else 1)
+
+
+if __name__ == '__main__':
+    main()
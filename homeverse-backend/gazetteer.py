@@ -0,0 +1,131 @@
+import difflib
+import re
+from collections import deque
+from functools import lru_cache
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+class Gazetteer:
+    """Precompiled locality/landmark matcher (Aho-Corasick automaton).
+
+    Entries keep the priority predict_zone has always used: localities in
+    zone order first, then landmarks, and the first entry that appears in
+    the input wins. One pass over the input finds every entry at once, so
+    the cost depends on the length of the text rather than on how many
+    localities and landmarks are loaded.
+    """
+
+    def __init__(self, zones, landmarks, default_zone='central', fuzzy=False, fuzzy_cutoff=0.85):
+        self.zones = zones
+        self.default_zone = default_zone
+        self.fuzzy = fuzzy
+        self.fuzzy_cutoff = fuzzy_cutoff
+
+        # (kind, name, zone, rate, multiplier) in priority order
+        self.entries = []
+        for zone, data in zones.items():
+            for locality, price in data['localities'].items():
+                self.entries.append(('locality', locality, zone, price, None))
+        for landmark, data in landmarks.items():
+            rate = int(zones[data['zone']]['base_price'] * data['multiplier'])
+            self.entries.append(('landmark', landmark, data['zone'], rate, data['multiplier']))
+
+        self._build_automaton()
+        self._first_entry = {}
+        for entry_id, entry in enumerate(self.entries):
+            self._first_entry.setdefault(entry[1].lower(), entry_id)
+        self._names = sorted(self._first_entry)
+        self._max_words = max((len(name.split()) for name in self._names), default=1)
+        self._fuzzy_lookup = lru_cache(maxsize=4096)(self._fuzzy_match)
+
+    def _build_automaton(self):
+        goto = [{}]
+        out = [[]]
+        for entry_id, entry in enumerate(self.entries):
+            state = 0
+            for ch in entry[1].lower():
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(entry_id)
+
+        # Breadth-first failure links; outputs inherit their suffix's matches
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(ids) for ids in out]
+
+    def find(self, text):
+        """All entry ids whose name occurs in text, in priority order"""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        found = set()
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return sorted(found)
+
+    def match(self, location):
+        """Zone match for a free-text location.
+
+        Returns (zone, confidence, matched_name, rate_per_sqft, landmark_multiplier).
+        The landmark multiplier is the first landmark named in the text (the
+        price bonus), independent of which entry decided the zone.
+        """
+        found = self.find(location)
+        if found:
+            kind, name, zone, rate, _ = self.entries[found[0]]
+            landmark_mult = next(
+                (self.entries[i][4] for i in found if self.entries[i][0] == 'landmark'),
+                None
+            )
+            return zone, 'high', name, rate, landmark_mult
+
+        if self.fuzzy:
+            entry_id = self._fuzzy_lookup(location.lower())
+            if entry_id is not None:
+                kind, name, zone, rate, _ = self.entries[entry_id]
+                return zone, 'medium', name, rate, None
+
+        # Default zone with its base price
+        return self.default_zone, 'low', None, self.zones[self.default_zone]['base_price'], None
+
+    def _fuzzy_match(self, location_lower):
+        """Closest entry for misspelled names such as 'Dharampet'"""
+        words = _WORD.findall(location_lower)
+        candidates = set()
+        for size in range(1, self._max_words + 1):
+            for start in range(len(words) - size + 1):
+                candidates.add(' '.join(words[start:start + size]))
+
+        best = None
+        for candidate in sorted(candidates):
+            for name in difflib.get_close_matches(candidate, self._names, n=3, cutoff=self.fuzzy_cutoff):
+                score = difflib.SequenceMatcher(None, candidate, name).ratio()
+                entry_id = self._first_entry[name]
+                # Highest similarity wins, ties go to the higher-priority entry
+                if best is None or (score, -entry_id) > (best[0], -best[1]):
+                    best = (score, entry_id)
+
+        return best[1] if best else None
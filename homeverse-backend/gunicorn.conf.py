@@ -0,0 +1,71 @@
+# Production server: gunicorn -c gunicorn.conf.py app:app
+#
+# The app (and with it the price model) is imported once in the master and
+# the workers are forked from it, so the tree arrays are shared copy-on-write
+# instead of being loaded or trained once per worker.
+#
+# Signals to the master:
+#   HUP         restart all workers gracefully (new config, same preloaded app)
+#   TTIN / TTOU add / remove a worker
+#   USR2, then QUIT the old master   zero-downtime upgrade to new code or a
+#                                    rebuilt model artifact
+import gc
+import multiprocessing
+import os
+
+from process_stats import format_memory, memory_usage
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers now and then so slow leaks can't build up
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+# Log worker memory every this many requests (0 disables)
+memory_report_interval = int(os.environ.get('WORKER_MEMORY_REPORT_EVERY', 1000))
+
+
+def when_ready(server):
+    import app
+
+    # With MODEL_LOADING=background, finish loading before workers fork so
+    # they share the model instead of each loading their own
+    app.ml_predictor.wait_until_loaded()
+
+    # Move everything allocated so far out of the collector's reach, so GC
+    # passes in the workers don't write to (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"🧠 Master ready: {format_memory(memory_usage())}")
+
+
+def post_fork(server, worker):
+    import app
+
+    # Parallelism comes from the workers; one predict must not grab every core
+    if workers > 1:
+        for city in app.city_registry.resident():
+            city.predictor.set_inference_jobs(1)
+
+    worker.requests_seen = 0
+    server.log.info(f"👷 Worker {worker.age} forked: {format_memory(memory_usage())}")
+
+
+def post_request(worker, req, environ, resp):
+    if not memory_report_interval:
+        return
+    worker.requests_seen = getattr(worker, 'requests_seen', 0) + 1
+    if worker.requests_seen % memory_report_interval == 0:
+        worker.log.info(f"📊 Worker after {worker.requests_seen} requests: {format_memory(memory_usage())}")
+
+
+def worker_exit(server, worker):
+    server.log.info(f"👋 Worker exiting: {format_memory(memory_usage())}")
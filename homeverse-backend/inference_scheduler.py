@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class _Pending:
+    __slots__ = ('features', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, features):
+        self.features = features
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row predictions into one batched call.
+
+    Request threads enqueue their feature row and block. A single scheduler
+    thread waits up to window_ms after the first queued row (or until
+    max_batch rows are waiting), runs predict_batch once on the whole batch
+    and hands each caller its own row of the result. One model call at a
+    time also stops concurrent requests from oversubscribing the cores.
+    """
+
+    def __init__(self, predict_batch, window_ms=3, max_batch=64):
+        self.predict_batch = predict_batch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._pid = None
+        self._thread = None
+        self._queue = []
+        self._cond = threading.Condition()
+
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.batch_sizes = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    def _ensure_thread(self):
+        # Threads don't survive fork, so every worker process starts its own
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._cond:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='inference-batcher', daemon=True)
+            self._thread.start()
+
+    def predict(self, features):
+        """Same contract as PropertyPricePredictor.predict"""
+        self._ensure_thread()
+        pending = _Pending(features)
+        with self._cond:
+            self._queue.append(pending)
+            self.requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            self._cond.notify()
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+
+            deadline = self._queue[0].enqueued_at + self.window
+            while len(self._queue) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = self._queue[:self.max_batch]
+            del self._queue[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            started = time.perf_counter()
+            try:
+                features = np.array([p.features for p in batch], dtype=float)
+                predictions, extra = self.predict_batch(features)
+                for pending, prediction in zip(batch, predictions):
+                    pending.result = (prediction, extra)
+            except Exception as e:
+                self.errors += 1
+                for pending in batch:
+                    pending.error = e
+
+            self._record(batch, started)
+            for pending in batch:
+                pending.done.set()
+
+    def _record(self, batch, started):
+        size = len(batch)
+        bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound), len(BATCH_SIZE_BUCKETS))
+        with self._cond:
+            self.batches += 1
+            self.rows += size
+            self.batch_sizes[bucket] += 1
+            self.total_wait += sum(started - p.enqueued_at for p in batch)
+
+    def stats(self):
+        with self._cond:
+            labels = [f'<={bound}' for bound in BATCH_SIZE_BUCKETS] + [f'>{BATCH_SIZE_BUCKETS[-1]}']
+            return {
+                'windowMs': self.window * 1000,
+                'maxBatch': self.max_batch,
+                'queueDepth': len(self._queue),
+                'maxQueueDepth': self.max_queue_depth,
+                'requests': self.requests,
+                'batches': self.batches,
+                'errors': self.errors,
+                'avgBatchSize': round(self.rows / self.batches, 2) if self.batches else 0.0,
+                'avgQueueWaitMs': round(self.total_wait / self.rows * 1000, 3) if self.rows else 0.0,
+                'batchSizeHistogram': dict(zip(labels, self.batch_sizes))
+            }
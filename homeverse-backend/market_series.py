@@ -0,0 +1,111 @@
+import zlib
+from datetime import date
+
+import numpy as np
+
+# Price history is quoted backwards from this year's rates
+BASE_YEAR = 2025
+MAX_YEARS = 30
+MAX_MONTHS = 120
+
+
+def _seed(*parts):
+    return zlib.crc32('/'.join(parts).encode())
+
+
+def _month_labels(as_of, months):
+    """'YYYY-MM' for the `months` calendar months before as_of, oldest first"""
+    index = as_of.year * 12 + (as_of.month - 1)
+    return [f'{m // 12:04d}-{m % 12 + 1:02d}' for m in range(index - months, index)]
+
+
+class PriceSeries:
+    """Monthly and yearly price history for one zone or locality"""
+
+    def __init__(self, key, current_price, growth_rate, month_labels):
+        growth = growth_rate / 100
+        self.current_price = current_price
+        self.growth_rate = growth_rate
+
+        # Transaction counts are pseudo-random but fixed per series
+        rng = np.random.RandomState(_seed(*key))
+
+        steps_back = np.arange(MAX_MONTHS, 0, -1)
+        self.month_labels = month_labels
+        self.month_avg = (current_price / ((1 + growth / 12) ** steps_back)).astype(np.int64)
+        self.month_transactions = rng.randint(80, 200, MAX_MONTHS)
+
+        years_back = np.arange(MAX_YEARS, -1, -1)
+        year_price = current_price / ((1 + growth) ** years_back)
+        self.years = BASE_YEAR - years_back
+        self.year_avg = year_price.astype(np.int64)
+        self.year_min = (year_price * 0.82).astype(np.int64)
+        self.year_max = (year_price * 1.18).astype(np.int64)
+        self.year_transactions = rng.randint(800, 2000, MAX_YEARS + 1)
+
+    def monthly(self, months=12):
+        months = max(0, min(months, MAX_MONTHS))
+        start = MAX_MONTHS - months
+        return [
+            {'month': month, 'avgPrice': avg, 'transactions': tx}
+            for month, avg, tx in zip(
+                self.month_labels[start:],
+                self.month_avg[start:].tolist(),
+                self.month_transactions[start:].tolist()
+            )
+        ]
+
+    def yearly(self, years=5):
+        """`years` past years plus the current one"""
+        years = max(0, min(years, MAX_YEARS))
+        start = MAX_YEARS - years
+        growth = round(self.growth_rate, 1)
+        return [
+            {
+                'year': year,
+                'avgPrice': avg,
+                'minPrice': low,
+                'maxPrice': high,
+                'transactions': tx,
+                'growthFromPrevYear': growth
+            }
+            for year, avg, low, high, tx in zip(
+                self.years[start:].tolist(),
+                self.year_avg[start:].tolist(),
+                self.year_min[start:].tolist(),
+                self.year_max[start:].tolist(),
+                self.year_transactions[start:].tolist()
+            )
+        ]
+
+
+class MarketSeriesStore:
+    """Precomputed price history for every zone and locality.
+
+    Built once per market data version (and calendar month, for the month
+    labels); the trend and history endpoints then answer any window by
+    slicing instead of compounding prices per request.
+    """
+
+    def __init__(self, zones, as_of=None):
+        self.as_of = as_of or date.today()
+        labels = _month_labels(self.as_of, MAX_MONTHS)
+
+        self.zones = {}
+        self.localities = {}
+        self.locality_zone = {}
+        self.top_localities = {}
+        for zone, data in zones.items():
+            self.zones[zone] = PriceSeries(('zone', zone), data['base_price'], data['growth_rate'], labels)
+            for locality, price in data['localities'].items():
+                self.localities[locality.lower()] = PriceSeries(
+                    ('locality', zone, locality), price, data['growth_rate'], labels
+                )
+                self.locality_zone[locality.lower()] = (zone, locality)
+            self.top_localities[zone] = sorted(data['localities'].items(), key=lambda x: x[1], reverse=True)[:3]
+
+    def series(self, zone=None, locality=None):
+        """Series for a locality if given, else for the zone"""
+        if locality:
+            return self.localities[locality.lower()]
+        return self.zones[zone]
@@ -0,0 +1,397 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from gazetteer import Gazetteer
+
+DEFAULT_MARKET_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'market.sqlite3')
+
+# Per-zone columns besides the id, in the order the zone payloads list them
+ZONE_FIELDS = (
+    'name', 'base_price', 'growth_rate', 'demand_index', 'supply_index',
+    'avg_price_1bhk', 'avg_price_2bhk', 'avg_price_3bhk'
+)
+
+# Numeric columns are left untyped so ints and floats read back exactly as written
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE IF NOT EXISTS zones (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    base_price,
+    growth_rate,
+    demand_index,
+    supply_index,
+    avg_price_1bhk,
+    avg_price_2bhk,
+    avg_price_3bhk
+);
+CREATE TABLE IF NOT EXISTS localities (
+    name TEXT PRIMARY KEY COLLATE NOCASE,
+    zone TEXT NOT NULL REFERENCES zones (id),
+    position INTEGER NOT NULL,
+    price
+);
+CREATE TABLE IF NOT EXISTS landmarks (
+    name TEXT PRIMARY KEY COLLATE NOCASE,
+    zone TEXT NOT NULL REFERENCES zones (id),
+    position INTEGER NOT NULL,
+    multiplier
+);
+"""
+
+
+def fingerprint(zones, landmarks):
+    """Content hash of the zone and landmark tables"""
+    payload = json.dumps([zones, landmarks], sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:12]
+
+
+class MarketData:
+    """One immutable snapshot of the market tables, indexed for lookups.
+
+    zones and landmarks keep the nested-dict shape the API has always
+    returned. Alongside them each zone, locality and landmark gets a row in
+    flat arrays with a name -> row index, and the location matcher is
+    compiled against this snapshot, so a reload swaps all of it at once.
+    """
+
+    def __init__(self, zones, landmarks, version=0, default_zone='central', fuzzy=False):
+        self.zones = zones
+        self.landmarks = landmarks
+        self.version = version
+        self.default_zone = default_zone
+        self.fingerprint = fingerprint(zones, landmarks)
+
+        self.zone_ids = list(zones)
+        self.zone_index = {zone: i for i, zone in enumerate(self.zone_ids)}
+        self.base_price = np.array([data['base_price'] for data in zones.values()])
+        self.growth_rate = np.array([data['growth_rate'] for data in zones.values()], dtype=float)
+
+        self.locality_names = []
+        locality_zone, locality_price = [], []
+        for zone, data in zones.items():
+            for locality, price in data['localities'].items():
+                self.locality_names.append(locality)
+                locality_zone.append(self.zone_index[zone])
+                locality_price.append(price)
+        self.locality_zone = np.array(locality_zone, dtype=np.int32)
+        self.locality_price = np.array(locality_price)
+        self.locality_index = {name.lower(): row for row, name in enumerate(self.locality_names)}
+
+        self.landmark_names = list(landmarks)
+        self.landmark_zone = np.array([self.zone_index[data['zone']] for data in landmarks.values()], dtype=np.int32)
+        self.landmark_multiplier = np.array([data['multiplier'] for data in landmarks.values()], dtype=float)
+        self.landmark_index = {name.lower(): row for row, name in enumerate(self.landmark_names)}
+
+        self.matcher = Gazetteer(zones, landmarks, default_zone=default_zone, fuzzy=fuzzy)
+
+    def zone_or_default(self, zone):
+        return zone if zone in self.zones else self.default_zone
+
+    def locality(self, name):
+        """(zone, locality) for a locality name in any case, or None"""
+        row = self.locality_index.get(name.lower())
+        if row is None:
+            return None
+        return self.zone_ids[self.locality_zone[row]], self.locality_names[row]
+
+    def base_rates(self):
+        """Per-sqft base rate of each zone, as the model is trained on"""
+        return {zone: data['base_price'] for zone, data in self.zones.items()}
+
+    @property
+    def total_localities(self):
+        return len(self.locality_names)
+
+
+def connect(path, readonly=False):
+    if readonly:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    else:
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA foreign_keys = ON')
+    return conn
+
+
+def read_market_data(path, fuzzy=False):
+    conn = connect(path, readonly=True)
+    try:
+        # One read transaction, so a concurrent edit is seen entirely or not at all
+        conn.execute('BEGIN')
+        meta = dict(conn.execute('SELECT key, value FROM meta'))
+        zones = {}
+        for row in conn.execute(f"SELECT id, {', '.join(ZONE_FIELDS)} FROM zones ORDER BY position"):
+            fields = dict(zip(ZONE_FIELDS, row[1:]))
+            zones[row[0]] = {
+                'name': fields.pop('name'),
+                'base_price': fields.pop('base_price'),
+                'localities': {},
+                **fields
+            }
+        for name, zone, price in conn.execute('SELECT name, zone, price FROM localities ORDER BY position'):
+            zones[zone]['localities'][name] = price
+        landmarks = {
+            name: {'zone': zone, 'multiplier': multiplier}
+            for name, zone, multiplier in conn.execute('SELECT name, zone, multiplier FROM landmarks ORDER BY position')
+        }
+    finally:
+        conn.close()
+    return MarketData(zones, landmarks, int(meta['version']), meta.get('default_zone', 'central'), fuzzy)
+
+
+def init_database(path, zones, landmarks, default_zone='central', version=1):
+    """Write a complete store to a temporary file, then move it into place"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = connect(tmp_path)
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)',
+                             [('version', version), ('default_zone', default_zone)])
+            conn.executemany(
+                f"INSERT INTO zones (id, position, {', '.join(ZONE_FIELDS)}) VALUES ({', '.join('?' * (len(ZONE_FIELDS) + 2))})",
+                [(zone, i) + tuple(data[field] for field in ZONE_FIELDS) for i, (zone, data) in enumerate(zones.items())]
+            )
+            conn.executemany(
+                'INSERT INTO localities (name, zone, position, price) VALUES (?, ?, ?, ?)',
+                [
+                    (name, zone, i, price)
+                    for i, (zone, name, price) in enumerate(
+                        (zone, name, price) for zone, data in zones.items() for name, price in data['localities'].items()
+                    )
+                ]
+            )
+            conn.executemany(
+                'INSERT INTO landmarks (name, zone, position, multiplier) VALUES (?, ?, ?, ?)',
+                [(name, data['zone'], i, data['multiplier']) for i, (name, data) in enumerate(landmarks.items())]
+            )
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+def _bump_version(conn):
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+    return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+
+def _edit(path, statement, params):
+    """Apply one change and bump the version in the same transaction"""
+    conn = connect(path)
+    try:
+        with conn:
+            if conn.execute(statement, params).rowcount == 0:
+                raise ValueError('nothing matched')
+            return _bump_version(conn)
+    finally:
+        conn.close()
+
+
+def set_zone_field(path, zone, field, value):
+    if field not in ZONE_FIELDS:
+        raise ValueError(f"unknown zone field '{field}' (expected one of: {', '.join(ZONE_FIELDS)})")
+    try:
+        return _edit(path, f'UPDATE zones SET {field} = ? WHERE id = ?', (value, zone))
+    except ValueError:
+        raise ValueError(f"unknown zone '{zone}'")
+
+
+def set_locality(path, name, zone, price):
+    """Add a locality (after the existing ones) or update its zone and price"""
+    return _edit(
+        path,
+        'INSERT INTO localities (name, zone, position, price) '
+        'VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM localities), ?) '
+        'ON CONFLICT (name) DO UPDATE SET zone = excluded.zone, price = excluded.price',
+        (name, zone, price)
+    )
+
+
+def set_landmark(path, name, zone, multiplier):
+    """Add a landmark (after the existing ones) or update its zone and multiplier"""
+    return _edit(
+        path,
+        'INSERT INTO landmarks (name, zone, position, multiplier) '
+        'VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM landmarks), ?) '
+        'ON CONFLICT (name) DO UPDATE SET zone = excluded.zone, multiplier = excluded.multiplier',
+        (name, zone, multiplier)
+    )
+
+
+class MarketDataStore:
+    """Market data served from a SQLite file and swapped in whole when it changes.
+
+    `current` is replaced with a single reference assignment, so a request
+    that reads it once works on one consistent snapshot even while a reload
+    happens. maybe_reload() is cheap enough to call on every request: it
+    stats the file at most once every check_seconds and only rebuilds the
+    snapshot when the file changed. Listeners are called with the previous
+    and new snapshots after a swap.
+    """
+
+    def __init__(self, path, seed=None, check_seconds=5.0, fuzzy=False):
+        self.path = path
+        self.check_seconds = check_seconds
+        self.fuzzy = fuzzy
+        self.listeners = []
+
+        if seed is not None and not os.path.exists(path):
+            zones, landmarks = seed
+            init_database(path, zones, landmarks)
+            print(f"🗄️ Market data store created at {path}")
+
+        self._lock = threading.Lock()
+        self._stat = self._file_stat()
+        self.current = read_market_data(path, fuzzy)
+        self._next_check = time.monotonic() + check_seconds
+        self.reloads = 0
+        self.loaded_at = time.time()
+
+    def _file_stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def maybe_reload(self):
+        if not self.check_seconds or time.monotonic() < self._next_check:
+            return False
+        self._next_check = time.monotonic() + self.check_seconds
+        return self.reload_if_changed()
+
+    def reload_if_changed(self):
+        """Swap in the file's data if it changed since the last load"""
+        with self._lock:
+            try:
+                stat = self._file_stat()
+                if stat == self._stat:
+                    return False
+                data = read_market_data(self.path, self.fuzzy)
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Market data reload failed, keeping version {self.current.version}: {e}")
+                return False
+            self._stat = stat
+            previous = self.current
+            if data.version == previous.version and data.fingerprint == previous.fingerprint:
+                return False
+            self.current = data
+            self.reloads += 1
+            self.loaded_at = time.time()
+
+        print(f"🔄 Market data reloaded: version {previous.version} -> {data.version} ({data.fingerprint})")
+        for listener in self.listeners:
+            listener(previous, data)
+        return True
+
+    def stats(self):
+        market = self.current
+        return {
+            'path': self.path,
+            'version': market.version,
+            'fingerprint': market.fingerprint,
+            'zones': len(market.zones),
+            'localities': market.total_localities,
+            'landmarks': len(market.landmarks),
+            'reloads': self.reloads,
+            'loadedAt': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.loaded_at)),
+            'checkSeconds': self.check_seconds
+        }
+
+
+def _number(value):
+    return json.loads(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create, inspect and edit the market data store')
+    parser.add_argument(
+        '--path',
+        default=os.environ.get('MARKET_DATA_PATH', DEFAULT_MARKET_DATA_PATH),
+        help='store path (default: $MARKET_DATA_PATH or data/market.sqlite3)'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    init = commands.add_parser('init', help='create the store from market_seed.py (Nagpur) or a JSON file')
+    init.add_argument('--from', dest='source', help="JSON with 'zones', 'landmarks' and optionally 'default_zone' "
+                                                    '(the export format), e.g. for another city')
+    init.add_argument('--force', action='store_true', help='replace an existing store')
+
+    commands.add_parser('export', help='print the current data as JSON')
+
+    zone = commands.add_parser('set-zone', help='change one field of a zone')
+    zone.add_argument('zone')
+    zone.add_argument('field', choices=ZONE_FIELDS)
+    zone.add_argument('value')
+
+    locality = commands.add_parser('set-locality', help='add or reprice a locality')
+    locality.add_argument('name')
+    locality.add_argument('zone')
+    locality.add_argument('price', type=_number)
+
+    landmark = commands.add_parser('set-landmark', help='add or change a landmark')
+    landmark.add_argument('name')
+    landmark.add_argument('zone')
+    landmark.add_argument('multiplier', type=float)
+
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        if os.path.exists(args.path) and not args.force:
+            parser.error(f'{args.path} already exists (use --force to replace it)')
+        if args.source:
+            with open(args.source) as f:
+                source = json.load(f)
+            zones, landmarks = source['zones'], source.get('landmarks', {})
+            default_zone = source.get('default_zone', next(iter(zones)))
+        else:
+            from market_seed import NAGPUR_ZONES as zones, LANDMARKS as landmarks
+            default_zone = 'central'
+
+        version = read_market_data(args.path).version + 1 if os.path.exists(args.path) else 1
+        init_database(args.path, zones, landmarks, default_zone=default_zone, version=version)
+        print(f"🗄️ Market data store written to {args.path} (version {version})")
+        return
+
+    if not os.path.exists(args.path):
+        parser.error(f'{args.path} does not exist (run init first)')
+
+    if args.command == 'export':
+        market = read_market_data(args.path)
+        print(json.dumps({
+            'version': market.version,
+            'fingerprint': market.fingerprint,
+            'default_zone': market.default_zone,
+            'zones': market.zones,
+            'landmarks': market.landmarks
+        }, indent=2))
+        return
+
+    try:
+        if args.command == 'set-zone':
+            value = args.value if args.field == 'name' else _number(args.value)
+            version = set_zone_field(args.path, args.zone, args.field, value)
+        elif args.command == 'set-locality':
+            version = set_locality(args.path, args.name, args.zone, args.price)
+        else:
+            version = set_landmark(args.path, args.name, args.zone, args.multiplier)
+    except ValueError as e:
+        parser.error(str(e))
+    except sqlite3.IntegrityError:
+        parser.error(f"unknown zone '{args.zone}'")
+    print(f"✅ Market data updated to version {version}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds; stages run in microseconds, whole requests in milliseconds
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, *extra):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(pair for pair in extra if pair)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, const=''):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f'{self.name}{_labels(self.labelnames, k, const)} {_number(v)}' for k, v in items]
+
+
+class Gauge(_Metric):
+    """Settable gauge, or one read from a callback at scrape time.
+
+    A callback returns either a number or, for labelled gauges, a dict of
+    label-value tuples to numbers.
+    """
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self, const=''):
+        if self.callback is not None:
+            value = self.callback()
+            items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return self.header() + [f'{self.name}{_labels(self.labelnames, k, const)} {_number(v)}' for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=REQUEST_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # Per-bucket (not cumulative) counts, then sum
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self, const=''):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+
+        lines = self.header()
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, const, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels, const)} {_number(series[-1])}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels, const)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text format.
+
+    Under a prefork server each worker keeps its own values and a scrape
+    reaches whichever worker takes it, so the numbers are per worker, not
+    per deployment. With pid_label every series carries the worker's pid
+    (read at scrape time, so it is right after fork) to keep workers apart.
+    """
+
+    def __init__(self, pid_label=True):
+        self.metrics = []
+        self.pid_label = pid_label
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=(), callback=None):
+        return self._add(Gauge(name, help_text, labelnames, callback))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=REQUEST_BUCKETS):
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        const = f'pid="{os.getpid()}"' if self.pid_label else ''
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(const))
+        return '\n'.join(lines) + '\n'
+
+
+class _StageTiming:
+    __slots__ = ('histogram', 'stage', 'started')
+
+    def __init__(self, histogram, stage):
+        self.histogram = histogram
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.stage)
+
+
+class _NullTiming:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMING = _NullTiming()
+
+
+def null_stage(stage):
+    """Stage timer that records nothing"""
+    return _NULL_TIMING
+
+
+class StageTimer:
+    """`with timer('stage'):` records the block's duration under that stage label"""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __call__(self, stage):
+        return _StageTiming(self.histogram, stage)
@@ -0,0 +1,655 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from metrics import null_stage
+
+# pandas, scikit-learn and joblib are imported where they are used, so
+# importing this module (and app.py) doesn't pay for them up front
+
+# Feature order shared by training, the saved artifact and calculate_price_ml
+FEATURE_NAMES = ['zone', 'bedrooms', 'sqft', 'property_type', 'age', 'floor', 'amenities_count']
+IMPORTANCE_NAMES = ['zone', 'bedrooms', 'sqft', 'property_type', 'age', 'floor', 'amenities']
+
+# Bump whenever the training data generator or model settings change
+DATA_VERSION = '2025-2026.2'
+ARTIFACT_FORMAT = 6
+
+# Synthetic rows used for training; the generator is vectorized so millions are fine
+TRAINING_SAMPLES = int(os.environ.get('TRAINING_SAMPLES', 2000))
+
+# Forest settings per profile. 'compact' caps tree depth, so its size no longer
+# grows with the training set (see reports/model_profiles.md for the trade-off)
+MODEL_PROFILES = {
+    'full': {'n_estimators': 150, 'max_depth': 25, 'min_samples_split': 5, 'min_samples_leaf': 2},
+    'compact': {'n_estimators': 40, 'max_depth': 12, 'min_samples_split': 10, 'min_samples_leaf': 5}
+}
+# Winning configuration of the last model_search.py run, served as profile
+# 'tuned'. Committed with the code (models/ only holds build output), so a
+# deploy builds and serves exactly the configuration the report measured
+MODEL_SEARCH_PATH = os.environ.get(
+    'MODEL_SEARCH_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_search.json')
+)
+
+
+def read_search_result(path=MODEL_SEARCH_PATH):
+    """The winner model_search.py saved, or None if no search has been run"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+MODEL_SEARCH = read_search_result()
+if MODEL_SEARCH:
+    MODEL_PROFILES['tuned'] = MODEL_SEARCH['params']
+
+
+def search_cross_validation(n_samples, search=None):
+    """The search's cross-validation figures, if they were measured on n_samples training rows"""
+    search = search if search is not None else MODEL_SEARCH
+    if not search:
+        return None
+    if search.get('trainingSamples') != n_samples:
+        print(f"⚠️ The model search ran on {search.get('trainingSamples')} rows, not {n_samples}; "
+              f"its cross-validation figures don't describe this model (rerun model_search.py)")
+        return None
+    return search['crossValidation']
+
+
+MODEL_PROFILE = os.environ.get('MODEL_PROFILE', 'full')
+# Cap on the forest's node storage in MB (0 = none); trees past the cap are dropped
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get('MODEL_MEMORY_BUDGET_MB', 0))
+
+# 'flat' serves predictions from forest_engine.FlatForest instead of sklearn
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'sklearn')
+# Above this many rows sklearn's compiled batch predict is faster than the flat walk
+FLAT_BATCH_LIMIT = 256
+# Quantiles of the per-tree estimates reported in uncertainty mode
+SPREAD_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'models', 'price_model.joblib'
+)
+
+
+# Zone base rates the generator prices synthetic homes at (2025-2026)
+DEFAULT_ZONE_RATES = {
+    'central': 7200,
+    'east': 5800,
+    'west': 8500,
+    'south': 6500,
+    'north': 4800,
+    'outskirts': 3500
+}
+
+
+class ModelBundle:
+    """Everything a prediction needs, replaced as one reference on hot-swap"""
+
+    def __init__(self, model, scaler, data_version, trained_at, zone_rates, metrics=None, parity=None):
+        self.model = model
+        self.scaler = scaler
+        self.data_version = data_version
+        self.trained_at = trained_at
+        self.zone_rates = dict(zone_rates)
+        self.metrics = metrics or {}
+        # Flat engine vs sklearn check, run once when the model is built
+        self.parity = parity
+        self.model_version = f"{data_version}@{trained_at}"
+        # feature_importances_ is recomputed over every tree on each access
+        self.feature_importance = dict(zip(IMPORTANCE_NAMES, model.feature_importances_))
+        self.engine = None
+        self._leaf_values = None
+
+    def leaf_values(self):
+        """Node values of every tree in one array, plus each tree's offset into it (built on first use)"""
+        table = self._leaf_values
+        if table is None:
+            trees = [estimator.tree_ for estimator in self.model.estimators_]
+            offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+            table = self._leaf_values = (np.concatenate([tree.value[:, 0, 0] for tree in trees]), offsets)
+        return table
+
+    @property
+    def accuracy(self):
+        """Accuracy as the API states it: 100 - holdout MAPE, or None if the model was never measured"""
+        if 'mape' not in self.metrics:
+            return None
+        return f"{100 - self.metrics['mape']:.1f}%"
+
+
+class ModelNotReadyError(RuntimeError):
+    """A prediction was asked for while the model is still loading"""
+
+
+class PropertyPricePredictor:
+    def __init__(self, model_path=None, train=True, n_samples=TRAINING_SAMPLES, backend=INFERENCE_BACKEND,
+                 zone_rates=None, profile=MODEL_PROFILE, memory_budget_mb=MODEL_MEMORY_BUDGET_MB, background=False):
+        if profile == 'tuned' and profile not in MODEL_PROFILES:
+            raise ValueError(f"Profile 'tuned' needs a model search result at {MODEL_SEARCH_PATH} (run model_search.py)")
+        if profile not in MODEL_PROFILES:
+            raise ValueError(f"Unknown model profile '{profile}', expected one of {', '.join(MODEL_PROFILES)}")
+
+        self.bundle = None
+        self.model_path = model_path
+        self.n_samples = n_samples
+        self.profile = profile
+        self.memory_budget_mb = memory_budget_mb
+        self.backend = backend
+        self.zone_rates = dict(zone_rates or DEFAULT_ZONE_RATES)
+        self.inference_jobs = None
+        # Replaced with a metrics.StageTimer to record scale/predict timings
+        self.time_stage = null_stage
+
+        self.loading = False
+        self.load_error = None
+        self.ready_at = None
+        self._loaded = threading.Event()
+
+        if background:
+            self.load_in_background(train)
+        else:
+            self.load_or_train(train)
+
+    def load_or_train(self, train=True):
+        """Load the artifact at model_path, or train (and save) one if allowed"""
+        try:
+            if self.model_path and self.load(self.model_path):
+                return
+            if not train:
+                return
+
+            # No usable artifact: train now and cache the result for the next start
+            self.train_model()
+            if self.model_path:
+                try:
+                    self.save(self.model_path)
+                except OSError as e:
+                    print(f"⚠️ Could not save model artifact to {self.model_path}: {e}")
+        finally:
+            self.ready_at = time.perf_counter()
+            self._loaded.set()
+
+    def load_in_background(self, train=True):
+        """Load (or train) on a thread so the caller can start serving right away"""
+        self.loading = True
+
+        def run():
+            try:
+                self.load_or_train(train)
+            except Exception as e:
+                self.load_error = str(e)
+                print(f"⚠️ Background model load failed: {e}")
+            finally:
+                self.loading = False
+
+        threading.Thread(target=run, name='model-loader', daemon=True).start()
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until the initial load/train has finished; False on timeout"""
+        return self._loaded.wait(timeout)
+
+    @property
+    def status(self):
+        if self.bundle is not None:
+            return 'ready'
+        if self.loading:
+            return 'loading'
+        return 'failed' if self.load_error else 'not_trained'
+
+    # Read-only views of the live bundle
+    @property
+    def is_trained(self):
+        return self.bundle is not None
+
+    @property
+    def model(self):
+        return self.bundle.model if self.bundle else None
+
+    @property
+    def scaler(self):
+        return self.bundle.scaler if self.bundle else None
+
+    @property
+    def engine(self):
+        return self.bundle.engine if self.bundle else None
+
+    @property
+    def feature_importance(self):
+        return self.bundle.feature_importance if self.bundle else None
+
+    @property
+    def data_version(self):
+        return self.bundle.data_version if self.bundle else None
+
+    @property
+    def trained_at(self):
+        return self.bundle.trained_at if self.bundle else None
+
+    @property
+    def model_version(self):
+        return self.bundle.model_version if self.bundle else None
+
+    def generate_training_data(self, n_samples=None, seed=42, zone_rates=None):
+        """Generate training data based on 2025-2026 Nagpur market"""
+        import pandas as pd
+
+        n_samples = n_samples or self.n_samples
+        rng = np.random.RandomState(seed)
+
+        # Rates per sqft, in zone order
+        zones = zone_rates or self.zone_rates
+        zone_rates = np.array(list(zones.values()), dtype=float)
+
+        # Draw every column at once instead of row by row
+        zone = rng.randint(0, len(zones), n_samples)
+        bedrooms = rng.choice([1, 2, 3, 4, 5], size=n_samples, p=[0.08, 0.32, 0.38, 0.18, 0.04])
+        sqft = rng.randint(450, 3500, n_samples)
+        property_type = rng.choice([0.88, 1.0, 1.18, 1.32, 1.55], size=n_samples, p=[0.08, 0.52, 0.22, 0.12, 0.06])
+        age = rng.choice([1.15, 1.08, 1.0, 0.92, 0.82], size=n_samples, p=[0.18, 0.28, 0.32, 0.16, 0.06])
+        floor = rng.randint(0, 18, n_samples)
+        amenities_count = rng.randint(0, 8, n_samples)
+
+        # Market-realistic multipliers
+        floor_mult = np.select(
+            [floor == 0, floor <= 3, floor <= 7, floor <= 12],
+            [0.92, 1.0, 1.06, 1.12],
+            default=1.08
+        )
+        amenities_mult = 1.0 + (amenities_count * 0.015)
+
+        # Realistic price calculation
+        price = zone_rates[zone] * sqft * (0.85 + bedrooms * 0.08) * property_type * age * floor_mult * amenities_mult
+        price += rng.normal(0, 1, n_samples) * price * 0.08  # Market variation
+
+        return pd.DataFrame({
+            'zone': zone,
+            'bedrooms': bedrooms,
+            'sqft': sqft,
+            'property_type': property_type,
+            'age': age,
+            'floor': floor,
+            'amenities_count': amenities_count,
+            'price': price
+        }, columns=FEATURE_NAMES + ['price'])
+
+    def train_model(self):
+        """Train the ML model"""
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        print("🤖 Training ML model with 2025-2026 market data...")
+
+        df = self.generate_training_data()
+        X = df[FEATURE_NAMES].to_numpy(dtype=float)
+        y = df['price'].to_numpy()
+
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+
+        model = RandomForestRegressor(
+            **MODEL_PROFILES[self.profile],
+            random_state=42,
+            n_jobs=-1
+        )
+        model.fit(X_scaled, y)
+        if self.memory_budget_mb:
+            trim_to_budget(model, self.memory_budget_mb * 1e6)
+
+        trained_at = datetime.now().isoformat(timespec='seconds')
+        bundle = ModelBundle(model, scaler, DATA_VERSION, trained_at, self.zone_rates)
+        # Measure before swapping in, so the API never reports a model without its metrics
+        bundle.metrics = self.evaluate(bundle=bundle)
+        if self.profile == 'tuned':
+            cross_validation = search_cross_validation(self.n_samples)
+            if cross_validation is not None:
+                bundle.metrics['crossValidation'] = cross_validation
+        bundle.parity = self.check_engine_parity(bundle)
+        self.install(bundle)
+
+        print("✅ ML model trained with 2025-2026 data!")
+        return self.bundle
+
+    def evaluate(self, n_samples=None, seed=1234, bundle=None):
+        """Error of a bundle (default: the live model) on a freshly generated holdout set"""
+        bundle = bundle or self._live_bundle()
+        df = self.generate_training_data(n_samples=n_samples or max(500, self.n_samples // 5), seed=seed)
+        y = df['price'].to_numpy()
+        predicted = bundle.model.predict(bundle.scaler.transform(df[FEATURE_NAMES].to_numpy(dtype=float)))
+        return holdout_metrics(y, predicted)
+
+    def save(self, path):
+        """Write the fitted model and scaler to a versioned artifact"""
+        import joblib
+        import sklearn
+
+        bundle = self.bundle
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        artifact = {
+            'format': ARTIFACT_FORMAT,
+            'data_version': bundle.data_version,
+            'training_samples': self.n_samples,
+            'profile': self.profile,
+            'memory_budget_mb': self.memory_budget_mb,
+            'model_params': MODEL_PROFILES[self.profile],
+            'forest_bytes': forest_nbytes(bundle.model),
+            'zone_rates': bundle.zone_rates,
+            'trained_at': bundle.trained_at,
+            'metrics': bundle.metrics,
+            'engine_parity': bundle.parity,
+            'sklearn_version': sklearn.__version__,
+            'feature_names': FEATURE_NAMES,
+            'model': bundle.model,
+            'scaler': bundle.scaler,
+        }
+
+        # Write next to the target and rename so readers never see a partial file
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+        print(f"💾 Model artifact saved to {path}")
+
+    def read_bundle(self, path, zone_rates=None):
+        """Bundle from a saved artifact, or None if it is missing or stale"""
+        import joblib
+
+        if not os.path.exists(path):
+            print(f"ℹ️ No model artifact at {path}")
+            return None
+
+        try:
+            # Uncompressed joblib dumps let numpy arrays be memory-mapped
+            artifact = joblib.load(path, mmap_mode='r')
+        except Exception as e:
+            print(f"⚠️ Could not read model artifact {path}: {e}")
+            return None
+
+        stale_reason = artifact_stale_reason(
+            artifact,
+            self.n_samples,
+            zone_rates or self.zone_rates,
+            self.profile,
+            self.memory_budget_mb
+        )
+        if stale_reason:
+            print(f"♻️ Model artifact {path} is stale ({stale_reason})")
+            return None
+
+        return ModelBundle(
+            artifact['model'],
+            artifact['scaler'],
+            artifact['data_version'],
+            artifact['trained_at'],
+            artifact['zone_rates'],
+            artifact['metrics'],
+            artifact['engine_parity']
+        )
+
+    def load(self, path):
+        """Load a saved artifact; returns False if it is missing or stale"""
+        bundle = self.read_bundle(path)
+        if bundle is None:
+            return False
+
+        self.install(bundle)
+        print(f"✅ ML model loaded from {path} (data version {bundle.data_version})")
+        return True
+
+    def install(self, bundle):
+        """Prepare a bundle for serving, then swap it in with one assignment"""
+        if self.inference_jobs is not None:
+            bundle.model.n_jobs = self.inference_jobs
+        self._attach_engine(bundle)
+        # In-flight predictions keep the bundle they already read
+        self.bundle = bundle
+
+    def set_inference_jobs(self, n_jobs):
+        """Threads sklearn may use per predict, for this and future bundles"""
+        self.inference_jobs = n_jobs
+        if self.bundle is not None:
+            self.bundle.model.n_jobs = n_jobs
+
+    def check_engine_parity(self, bundle):
+        """Compare the flat engine with sklearn on holdout rows and split cut-offs (done at build time)"""
+        from forest_engine import FlatForest, check_parity, parity_rows
+
+        engine = FlatForest(bundle.model, bundle.scaler)
+        probe = self.generate_training_data(n_samples=500, seed=7)[FEATURE_NAMES].to_numpy(dtype=float)
+        rows = parity_rows(engine, probe, n_boundary=500)
+        identical, max_diff = check_parity(engine, bundle.model, bundle.scaler, rows)
+        return {'identical': identical, 'maxDiff': max_diff, 'rows': len(rows)}
+
+    def _attach_engine(self, bundle):
+        if self.backend != 'flat':
+            return
+
+        from forest_engine import FlatForest
+
+        # Installs (restarts, hot swaps) reuse the build-time check
+        if bundle.parity is None:
+            bundle.parity = self.check_engine_parity(bundle)
+        if not bundle.parity['identical']:
+            print(f"⚠️ Flat forest engine disagrees with sklearn (max diff {bundle.parity['maxDiff']}), using sklearn")
+            return
+
+        engine = FlatForest(bundle.model, bundle.scaler)
+        bundle.engine = engine
+        print(f"⚡ Flat forest engine ready ({engine.nbytes / 1e6:.1f} MB of node arrays)")
+
+    def _live_bundle(self):
+        bundle = self.bundle
+        if bundle is None:
+            if self.loading:
+                raise ModelNotReadyError('Price model is still loading, try again shortly')
+            bundle = self.train_model()
+        return bundle
+
+    def predict(self, features):
+        """Make prediction"""
+        bundle = self._live_bundle()
+
+        if bundle.engine is not None:
+            # Scaling is folded into the flat engine's thresholds
+            with self.time_stage('model_predict'):
+                return bundle.engine.predict_one(features), bundle.feature_importance
+
+        with self.time_stage('scale'):
+            features_scaled = bundle.scaler.transform([features])
+        with self.time_stage('model_predict'):
+            prediction = bundle.model.predict(features_scaled)[0]
+
+        return prediction, bundle.feature_importance
+
+    def predict_batch(self, features):
+        """Predict a whole feature matrix with one scaler and model call"""
+        bundle = self._live_bundle()
+
+        features = np.asarray(features, dtype=float)
+        if bundle.engine is not None and len(features) <= FLAT_BATCH_LIMIT:
+            with self.time_stage('model_predict'):
+                return bundle.engine.predict(features), bundle.feature_importance
+
+        with self.time_stage('scale'):
+            features_scaled = bundle.scaler.transform(features)
+        with self.time_stage('model_predict'):
+            predictions = bundle.model.predict(features_scaled)
+
+        return predictions, bundle.feature_importance
+
+    def predict_spread(self, features):
+        """Per-tree estimates for a feature matrix, summarised by tree_spread()
+
+        The trees are walked once: with the flat engine every tree at once,
+        otherwise with RandomForest.apply (the same compiled traversal
+        predict uses) followed by one gather of the leaf values.
+        """
+        bundle = self._live_bundle()
+
+        features = np.asarray(features, dtype=float)
+        if bundle.engine is not None:
+            with self.time_stage('model_predict'):
+                values = bundle.engine.tree_values(features)
+        else:
+            with self.time_stage('scale'):
+                features_scaled = bundle.scaler.transform(features)
+            with self.time_stage('model_predict'):
+                leaves = bundle.model.apply(features_scaled)
+                table, offsets = bundle.leaf_values()
+                values = table[leaves + offsets]
+
+        with self.time_stage('tree_spread'):
+            return tree_spread(values), bundle.feature_importance
+
+
+def tree_spread(values, quantiles=SPREAD_QUANTILES):
+    """Mean, standard deviation and quantiles across trees, per row of a (rows, trees) array"""
+    n_trees = values.shape[1]
+    # Linear interpolation between order statistics, as np.quantile does, from one sort
+    position = np.asarray(quantiles) * (n_trees - 1)
+    lower = position.astype(np.intp)
+    upper = np.minimum(lower + 1, n_trees - 1)
+    ordered = np.sort(values, axis=1)
+    return {
+        # Summed in tree order, as RandomForestRegressor.predict does with one job
+        'mean': np.cumsum(values, axis=1)[:, -1] / n_trees,
+        'std': values.std(axis=1),
+        'quantiles': ordered[:, lower] + (ordered[:, upper] - ordered[:, lower]) * (position - lower),
+        'trees': n_trees
+    }
+
+
+def holdout_metrics(y, predicted):
+    residual = y - predicted
+    return {
+        'holdoutRows': len(y),
+        'r2': round(float(1 - np.sum(residual ** 2) / np.sum((y - y.mean()) ** 2)), 4),
+        'mape': round(float(np.mean(np.abs(residual) / y) * 100), 2),
+        'rmse': round(float(np.sqrt(np.mean(residual ** 2))), 0)
+    }
+
+
+def tree_nbytes(estimator):
+    """Bytes of node and leaf-value storage in one fitted tree"""
+    state = estimator.tree_.__getstate__()
+    return state['nodes'].nbytes + state['values'].nbytes
+
+
+def forest_nbytes(model):
+    return sum(tree_nbytes(estimator) for estimator in model.estimators_)
+
+
+def trim_to_budget(model, budget_bytes):
+    """Drop trailing trees until the forest fits in budget_bytes.
+
+    Forest trees are independent draws, so keeping a prefix is still an
+    unbiased (if noisier) average.
+    """
+    sizes = np.cumsum([tree_nbytes(estimator) for estimator in model.estimators_])
+    keep = int(np.searchsorted(sizes, budget_bytes, side='right'))
+    if keep == 0:
+        raise ValueError(f"A single tree needs {sizes[0] / 1e6:.2f} MB, over the {budget_bytes / 1e6:.2f} MB budget")
+    if keep < len(model.estimators_):
+        print(f"✂️ Keeping {keep} of {len(model.estimators_)} trees to fit {budget_bytes / 1e6:.2f} MB")
+        model.estimators_ = model.estimators_[:keep]
+        model.n_estimators = keep
+    return model
+
+
+def artifact_stale_reason(artifact, n_samples=TRAINING_SAMPLES, zone_rates=None, profile=MODEL_PROFILE,
+                          memory_budget_mb=MODEL_MEMORY_BUDGET_MB):
+    """Return why an artifact can't be used, or None if it is current"""
+    import sklearn
+
+    if not isinstance(artifact, dict) or artifact.get('format') != ARTIFACT_FORMAT:
+        return 'unknown artifact format'
+    if artifact.get('data_version') != DATA_VERSION:
+        return f"data version {artifact.get('data_version')} != {DATA_VERSION}"
+    if artifact.get('training_samples') != n_samples:
+        return f"trained on {artifact.get('training_samples')} rows, {n_samples} configured"
+    if artifact.get('profile') != profile or artifact.get('memory_budget_mb') != memory_budget_mb:
+        return f"built as '{artifact.get('profile')}' within {artifact.get('memory_budget_mb')} MB"
+    if artifact.get('model_params') != MODEL_PROFILES.get(profile):
+        return f"'{profile}' forest settings changed"
+    if artifact.get('zone_rates') != dict(zone_rates or DEFAULT_ZONE_RATES):
+        return 'zone rates changed'
+    if artifact.get('sklearn_version') != sklearn.__version__:
+        return f"built with scikit-learn {artifact.get('sklearn_version')}"
+    if list(artifact.get('feature_names', [])) != FEATURE_NAMES:
+        return 'feature order changed'
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the Homeverse price model artifact')
+    parser.add_argument(
+        '--output',
+        default=os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH),
+        help='artifact path (default: $MODEL_PATH or models/price_model.joblib)'
+    )
+    parser.add_argument(
+        '--samples',
+        type=int,
+        default=TRAINING_SAMPLES,
+        help='synthetic training rows (default: $TRAINING_SAMPLES or 2000)'
+    )
+    parser.add_argument(
+        '--profile',
+        choices=sorted(MODEL_PROFILES),
+        default=MODEL_PROFILE,
+        help='forest size/accuracy trade-off (default: $MODEL_PROFILE or full)'
+    )
+    parser.add_argument(
+        '--memory-budget-mb',
+        type=float,
+        default=MODEL_MEMORY_BUDGET_MB,
+        help='cap on forest node storage, 0 for none (default: $MODEL_MEMORY_BUDGET_MB or 0)'
+    )
+    parser.add_argument(
+        '--zone-rates',
+        type=json.loads,
+        default=None,
+        help='JSON object of zone -> base rate per sqft (default: built-in 2025-2026 rates)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='retrain even if a current artifact already exists'
+    )
+    parser.add_argument(
+        '--nice',
+        type=int,
+        default=0,
+        help='lower this process priority by N (for background retrains)'
+    )
+    args = parser.parse_args()
+
+    if args.nice and hasattr(os, 'nice'):
+        os.nice(args.nice)
+
+    predictor = PropertyPricePredictor(
+        train=False,
+        n_samples=args.samples,
+        zone_rates=args.zone_rates,
+        profile=args.profile,
+        memory_budget_mb=args.memory_budget_mb
+    )
+    if not args.force and predictor.load(args.output):
+        print("👍 Model artifact is up to date, nothing to build")
+        return
+
+    predictor.train_model()
+    predictor.save(args.output)
+
+
+if __name__ == '__main__':
+    main()
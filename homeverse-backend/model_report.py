@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import joblib
+import numpy as np
+import sklearn
+
+from ml_model import (
+    FEATURE_NAMES,
+    MODEL_PROFILES,
+    TRAINING_SAMPLES,
+    PropertyPricePredictor,
+    forest_nbytes,
+    holdout_metrics
+)
+from process_stats import memory_usage
+
+ML_MODEL_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml_model.py')
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports', 'model_profiles.md')
+
+HOLDOUT_ROWS = 2000
+HOLDOUT_SEED = 1234
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(float(np.median(timings)) * 1000, 3)
+
+
+def build_boosted(path, n_samples):
+    """HistGradientBoosting reference model, saved in the same artifact layout"""
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    df = PropertyPricePredictor(train=False, n_samples=n_samples).generate_training_data()
+    model = HistGradientBoostingRegressor(random_state=42)
+    model.fit(df[FEATURE_NAMES].to_numpy(dtype=float), df['price'].to_numpy())
+    joblib.dump({'model': model, 'scaler': None}, path)
+
+
+def measure(path):
+    """Footprint, latency and holdout error of one artifact, in a fresh process"""
+    holdout = PropertyPricePredictor(train=False).generate_training_data(n_samples=HOLDOUT_ROWS, seed=HOLDOUT_SEED)
+    X = holdout[FEATURE_NAMES].to_numpy(dtype=float)
+    y = holdout['price'].to_numpy()
+
+    # ml_model defers the sklearn imports; load them first so RSS counts only the model
+    import sklearn.ensemble
+    import sklearn.preprocessing
+
+    rss_before = memory_usage().get('rss', 0)
+    artifact = joblib.load(path, mmap_mode='r')
+    model = artifact['model']
+    scaler = artifact['scaler']
+    if hasattr(model, 'n_jobs'):
+        # Per-worker setting under gunicorn with more than one worker
+        model.n_jobs = 1
+
+    def predict(rows):
+        return model.predict(scaler.transform(rows) if scaler is not None else rows)
+
+    # Touch every page of the memory-mapped trees before reading RSS
+    predicted = predict(X)
+    result = {
+        'fileBytes': os.path.getsize(path),
+        'rssBytes': memory_usage().get('rss', 0) - rss_before,
+        'singleMs': _median_ms(lambda: predict(X[:1]), 200),
+        'batch256Ms': _median_ms(lambda: predict(X[:256]), 30),
+        'batch2000Ms': _median_ms(lambda: predict(X), 10),
+        'holdout': holdout_metrics(y, predicted)
+    }
+
+    if hasattr(model, 'estimators_'):
+        from forest_engine import FlatForest
+
+        engine = FlatForest(model, scaler)
+        result['trees'] = len(model.estimators_)
+        result['forestBytes'] = forest_nbytes(model)
+        result['flatEngineBytes'] = engine.nbytes
+        result['flatSingleMs'] = _median_ms(lambda: engine.predict_one(X[0]), 200)
+    return result
+
+
+def run_config(label, profile, budget_mb, n_samples, workdir):
+    path = os.path.join(workdir, f'{label}.joblib')
+    if profile == 'boosted':
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--build-boosted', path, '--samples', str(n_samples)],
+                       check=True, capture_output=True)
+    else:
+        subprocess.run(
+            [
+                sys.executable, ML_MODEL_SCRIPT,
+                '--output', path,
+                '--samples', str(n_samples),
+                '--profile', profile,
+                '--memory-budget-mb', str(budget_mb),
+                '--force'
+            ],
+            check=True,
+            capture_output=True
+        )
+
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', path],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result.update({'label': label, 'profile': profile, 'memoryBudgetMb': budget_mb})
+    return result
+
+
+def _mb(value):
+    return f'{value / 1e6:.2f}' if value is not None else 'n/a'
+
+
+def _value(value):
+    return value if value is not None else 'n/a'
+
+
+def render(results, n_samples):
+    baseline = results[0]
+    if n_samples == TRAINING_SAMPLES:
+        scale = f'**Measured on {n_samples:,} training rows, the row count `python ml_model.py` builds with.**'
+    else:
+        scale = (f'**Measured on {n_samples:,} training rows, not the {TRAINING_SAMPLES:,} '
+                 '`python ml_model.py` builds with, so these are not the served artifacts.**')
+    lines = [
+        '# Model profile comparison',
+        '',
+        f'{scale} At this size R² and MAPE gaps within the cross-validation spread in '
+        '`model_search.md` (about ±0.005 R² and ±0.4 MAPE points) are noise, not a ranking: '
+        'a trimmed forest can edge out `full` by chance.',
+        '',
+        f'Generated by `python model_report.py` on {date.today().isoformat()}: '
+        f'{n_samples} training rows, {HOLDOUT_ROWS}-row holdout (seed {HOLDOUT_SEED}), '
+        f'Python {platform.python_version()}, scikit-learn {sklearn.__version__}, '
+        f'{os.cpu_count()} CPUs. Latencies are medians with `n_jobs=1`, as in a '
+        'multi-worker gunicorn deployment.',
+        '',
+        '| Config | Trees | Forest MB | File MB | RSS MB | Flat engine MB | Single ms | Flat single ms '
+        '| Batch 256 ms | Batch 2000 ms | R² | MAPE % | RMSE ₹ |',
+        '|---|---|---|---|---|---|---|---|---|---|---|---|---|'
+    ]
+    for r in results:
+        lines.append(
+            f"| {r['label']} | {_value(r.get('trees'))} | {_mb(r.get('forestBytes'))} | {_mb(r['fileBytes'])} "
+            f"| {_mb(r['rssBytes'])} | {_mb(r.get('flatEngineBytes'))} | {r['singleMs']} "
+            f"| {_value(r.get('flatSingleMs'))} | {r['batch256Ms']} | {r['batch2000Ms']} "
+            f"| {r['holdout']['r2']} | {r['holdout']['mape']} | {int(r['holdout']['rmse']):,} |"
+        )
+
+    lines += ['', f"Relative to `{baseline['label']}`:", '']
+    for r in results[1:]:
+        lines.append(
+            f"- `{r['label']}`: file {r['fileBytes'] / baseline['fileBytes']:.0%}, "
+            f"RSS {r['rssBytes'] / max(baseline['rssBytes'], 1):.0%}, "
+            f"single-row latency {r['singleMs'] / baseline['singleMs']:.0%}, "
+            f"R² {r['holdout']['r2'] - baseline['holdout']['r2']:+.4f}, "
+            f"MAPE {r['holdout']['mape'] - baseline['holdout']['mape']:+.2f} pts"
+        )
+    lines += [
+        '',
+        'Serve a profile with `MODEL_PROFILE=compact` and/or cap the forest with '
+        '`MODEL_MEMORY_BUDGET_MB` (then rebuild with `python ml_model.py`). The '
+        '`boosted` row is a HistGradientBoosting reference only: it has no per-tree '
+        'output for the flat engine and no built-in feature importances, so it is '
+        'not a servable profile.',
+        ''
+    ]
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare model profiles on footprint, latency and holdout error')
+    parser.add_argument('--samples', type=int, default=TRAINING_SAMPLES, help='training rows per model')
+    parser.add_argument(
+        '--budget-mb',
+        type=float,
+        action='append',
+        default=None,
+        help='also report the full profile trimmed to this forest budget (repeatable, default: 2)'
+    )
+    parser.add_argument('--output', default=DEFAULT_REPORT_PATH, help='markdown report path')
+    parser.add_argument('--json', help='also write the raw results here')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    parser.add_argument('--build-boosted', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return
+    if args.build_boosted:
+        build_boosted(args.build_boosted, args.samples)
+        return
+
+    configs = [(profile, profile, 0) for profile in MODEL_PROFILES]
+    configs += [(f'full@{budget:g}MB', 'full', budget) for budget in (args.budget_mb or [2.0])]
+    configs.append(('boosted', 'boosted', 0))
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, profile, budget in configs:
+            print(f"📏 Measuring {label}...")
+            results.append(run_config(label, profile, budget, args.samples, workdir))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        f.write(render(results, args.samples))
+    print(f"📝 Report written to {args.output}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import sklearn
+
+from ml_model import (
+    FEATURE_NAMES,
+    MODEL_PROFILES,
+    MODEL_SEARCH_PATH,
+    TRAINING_SAMPLES,
+    PropertyPricePredictor,
+    forest_nbytes,
+    holdout_metrics
+)
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports', 'model_search.md')
+
+DEFAULT_GRID = {
+    'n_estimators': [40, 80, 150],
+    'max_depth': [12, 18, 25],
+    'min_samples_leaf': [2, 5]
+}
+
+
+def _grid_values(text, allow_none=False):
+    return [None if allow_none and value == 'none' else int(value) for value in text.split(',')]
+
+
+def grid_configs(grid, incumbent=MODEL_PROFILES['full']):
+    """The incumbent 'full' settings, then every grid point (min_samples_split kept at 2x the leaf size)"""
+    configs = [dict(incumbent)]
+    for n_estimators, max_depth, leaf in itertools.product(
+            grid['n_estimators'], grid['max_depth'], grid['min_samples_leaf']):
+        params = {
+            'n_estimators': n_estimators,
+            'max_depth': max_depth,
+            'min_samples_split': max(2, 2 * leaf),
+            'min_samples_leaf': leaf
+        }
+        if params not in configs:
+            configs.append(params)
+    return configs
+
+
+def config_label(params):
+    if params == MODEL_PROFILES['full']:
+        return 'full (current)'
+    return f"{params['n_estimators']}t/d{params['max_depth'] or '∞'}/l{params['min_samples_leaf']}"
+
+
+# Training data, set in each worker process by _init_worker
+_X = None
+_y = None
+
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+
+def fit_forest(params, X, y):
+    """Scaler and single-threaded forest, fitted as ml_model.train_model does"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    model = RandomForestRegressor(**params, random_state=42, n_jobs=1)
+    model.fit(scaler.fit_transform(X), y)
+    return scaler, model
+
+
+def score_fold(params, train_rows, test_rows):
+    """Holdout error of one cross-validation fold"""
+    scaler, model = fit_forest(params, _X[train_rows], _y[train_rows])
+    return holdout_metrics(_y[test_rows], model.predict(scaler.transform(_X[test_rows])))
+
+
+def fit_full(params):
+    """The configuration fitted on all rows, for size and latency measurement"""
+    started = time.perf_counter()
+    scaler, model = fit_forest(params, _X, _y)
+    return scaler, model, round(time.perf_counter() - started, 3)
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(float(np.median(timings)) * 1000, 3)
+
+
+def measure_latency(scaler, model, X):
+    """Median single-row and batch latency with n_jobs=1, as a gunicorn worker serves"""
+    from forest_engine import FlatForest
+
+    engine = FlatForest(model, scaler)
+    return {
+        'forestBytes': forest_nbytes(model),
+        'singleMs': _median_ms(lambda: model.predict(scaler.transform(X[:1])), 200),
+        'flatSingleMs': _median_ms(lambda: engine.predict_one(X[0]), 200),
+        'batch256Ms': _median_ms(lambda: model.predict(scaler.transform(X[:256])), 30)
+    }
+
+
+def summarize_folds(folds):
+    def stat(key):
+        values = np.array([fold[key] for fold in folds], dtype=float)
+        return float(values.mean()), float(values.std())
+
+    r2, r2_std = stat('r2')
+    mape, mape_std = stat('mape')
+    rmse, _ = stat('rmse')
+    return {
+        'folds': len(folds),
+        'r2': round(r2, 4),
+        'r2Std': round(r2_std, 4),
+        'mape': round(mape, 2),
+        'mapeStd': round(mape_std, 2),
+        'rmse': round(rmse, 0)
+    }
+
+
+def pareto_front(results, keys=('mape', 'forestBytes', 'singleMs')):
+    """Labels of results no other result beats on every key (lower is better)"""
+    def point(r):
+        return tuple(r['crossValidation'][key] if key in r['crossValidation'] else r[key] for key in keys)
+
+    front = set()
+    for r in results:
+        p = point(r)
+        dominated = any(
+            all(a <= b for a, b in zip(point(other), p)) and point(other) != p
+            for other in results if other is not r
+        )
+        if not dominated:
+            front.add(r['label'])
+    return front
+
+
+def pick_winner(results, max_single_ms=None, max_forest_mb=None):
+    """Lowest cross-validated MAPE among Pareto configurations within the limits (smaller forest on ties)"""
+    candidates = [
+        r for r in results
+        if r['pareto']
+        and (max_single_ms is None or r['singleMs'] <= max_single_ms)
+        and (max_forest_mb is None or r['forestBytes'] <= max_forest_mb * 1e6)
+    ]
+    if not candidates:
+        raise SystemExit('No configuration meets the latency/size limits')
+    return min(candidates, key=lambda r: (r['crossValidation']['mape'], r['forestBytes']))
+
+
+def search(configs, n_samples, folds, workers=None):
+    """Cross-validate and measure every configuration; fits run in parallel, latency serially"""
+    from sklearn.model_selection import KFold
+
+    df = PropertyPricePredictor(train=False, n_samples=n_samples).generate_training_data()
+    X = df[FEATURE_NAMES].to_numpy(dtype=float)
+    y = df['price'].to_numpy()
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=0).split(X))
+
+    with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_worker, initargs=(X, y)) as pool:
+        fold_futures = [[pool.submit(score_fold, params, train, test) for train, test in splits] for params in configs]
+        full_futures = [pool.submit(fit_full, params) for params in configs]
+
+        results = []
+        for params, futures, full in zip(configs, fold_futures, full_futures):
+            scaler, model, fit_seconds = full.result()
+            results.append({
+                'label': config_label(params),
+                'params': params,
+                'crossValidation': summarize_folds([future.result() for future in futures]),
+                'fitSeconds': fit_seconds,
+                '_fitted': (scaler, model)
+            })
+            print(f"📐 {results[-1]['label']}: CV MAPE {results[-1]['crossValidation']['mape']}%")
+
+    # Timed one at a time once the pool is gone, so fits don't skew the latencies
+    for result in results:
+        result.update(measure_latency(*result.pop('_fitted'), X))
+    front = pareto_front(results)
+    for result in results:
+        result['pareto'] = result['label'] in front
+    return results
+
+
+def _mb(value):
+    return f'{value / 1e6:.2f}'
+
+
+def render(results, winner, n_samples, folds):
+    lines = [
+        '# Model hyperparameter search',
+        '',
+        f'Generated by `python model_search.py` on {date.today().isoformat()}: '
+        f'{folds}-fold cross-validation over {n_samples} training rows, '
+        f'Python {platform.python_version()}, scikit-learn {sklearn.__version__}, {os.cpu_count()} CPUs. '
+        'Size and latency are of each configuration fitted on all rows; latencies are medians with '
+        '`n_jobs=1`, as in a multi-worker gunicorn deployment. Pareto marks configurations no other '
+        'beats on CV MAPE, forest size and single-row latency together. `full (current)` is the '
+        "incumbent `full` profile's configuration, scored the same way for comparison.",
+        '',
+        '| Config | Trees | Max depth | Min leaf | CV R² | CV MAPE % | CV RMSE ₹ | Forest MB | Single ms '
+        '| Flat single ms | Batch 256 ms | Fit s | Pareto |',
+        '|---|---|---|---|---|---|---|---|---|---|---|---|---|'
+    ]
+    for r in sorted(results, key=lambda r: r['crossValidation']['mape']):
+        cv = r['crossValidation']
+        label = f"**{r['label']}**" if r is winner else r['label']
+        lines.append(
+            f"| {label} | {r['params']['n_estimators']} | {r['params']['max_depth'] or 'none'} "
+            f"| {r['params']['min_samples_leaf']} | {cv['r2']} ± {cv['r2Std']} | {cv['mape']} ± {cv['mapeStd']} "
+            f"| {int(cv['rmse']):,} | {_mb(r['forestBytes'])} | {r['singleMs']} | {r['flatSingleMs']} "
+            f"| {r['batch256Ms']} | {r['fitSeconds']} | {'✓' if r['pareto'] else ''} |"
+        )
+    lines += [
+        '',
+        f"Winner: `{winner['label']}` ({json.dumps(winner['params'])}), the lowest CV MAPE on the Pareto "
+        'front within the configured limits. It is saved as the `tuned` profile in '
+        '`model_search.json`, which render.yaml serves with `MODEL_PROFILE=tuned`; commit both files '
+        "with the report. The API reports the deployed model's measured holdout accuracy.",
+        ''
+    ]
+    incumbent = next((r for r in results if r['label'] == config_label(MODEL_PROFILES['full'])), None)
+    if incumbent is not None and incumbent is not winner:
+        lines += [
+            f"Against `full (current)`: CV MAPE {winner['crossValidation']['mape']}% vs "
+            f"{incumbent['crossValidation']['mape']}%, forest {_mb(winner['forestBytes'])} MB vs "
+            f"{_mb(incumbent['forestBytes'])} MB, single row {winner['singleMs']} ms vs {incumbent['singleMs']} ms.",
+            ''
+        ]
+    return '\n'.join(lines)
+
+
+def save_winner(winner, n_samples, path=MODEL_SEARCH_PATH):
+    """Write the winning configuration where ml_model picks it up as the 'tuned' profile"""
+    result = {
+        'params': winner['params'],
+        'trainingSamples': n_samples,
+        'crossValidation': winner['crossValidation'],
+        'forestBytes': winner['forestBytes'],
+        'singleMs': winner['singleMs'],
+        'flatSingleMs': winner['flatSingleMs'],
+        'batch256Ms': winner['batch256Ms'],
+        'searchedAt': datetime.now().isoformat(timespec='seconds')
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    with open(tmp_path, 'w') as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Cross-validate a forest hyperparameter grid in parallel and pick the serving configuration'
+    )
+    parser.add_argument('--samples', type=int, default=TRAINING_SAMPLES, help='training rows')
+    parser.add_argument('--folds', type=int, default=5, help='cross-validation folds')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--n-estimators', default=None, help='comma-separated tree counts (default: 40,80,150)')
+    parser.add_argument('--max-depth', default=None, help="comma-separated depths, 'none' for unlimited (default: 12,18,25)")
+    parser.add_argument('--min-samples-leaf', default=None, help='comma-separated leaf sizes (default: 2,5)')
+    parser.add_argument('--max-single-ms', type=float, default=None, help='only pick configurations this fast per row')
+    parser.add_argument('--max-forest-mb', type=float, default=None, help='only pick configurations this small')
+    parser.add_argument('--output', default=DEFAULT_REPORT_PATH, help='markdown report path')
+    parser.add_argument('--json', help='also write the raw results here')
+    parser.add_argument('--no-save', action='store_true', help="don't update the 'tuned' profile")
+    args = parser.parse_args()
+
+    grid = {
+        'n_estimators': _grid_values(args.n_estimators) if args.n_estimators else DEFAULT_GRID['n_estimators'],
+        'max_depth': _grid_values(args.max_depth, allow_none=True) if args.max_depth else DEFAULT_GRID['max_depth'],
+        'min_samples_leaf': (_grid_values(args.min_samples_leaf) if args.min_samples_leaf
+                             else DEFAULT_GRID['min_samples_leaf'])
+    }
+    configs = grid_configs(grid)
+    print(f"🔎 Searching {len(configs)} configurations x {args.folds} folds on {args.samples} rows...")
+
+    results = search(configs, args.samples, args.folds, args.workers)
+    winner = pick_winner(results, args.max_single_ms, args.max_forest_mb)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        f.write(render(results, winner, args.samples, args.folds))
+    print(f"📝 Report written to {args.output}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if not args.no_save:
+        save_winner(winner, args.samples)
+        print(f"🏆 {winner['label']} saved as the 'tuned' profile in {MODEL_SEARCH_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import resource
+
+
+def _read_kb_fields(path, fields):
+    values = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in fields:
+                    values[name] = int(rest.split()[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def memory_usage():
+    """Memory of the current process in bytes.
+
+    On Linux this splits RSS into shared and private pages (from
+    /proc/self/smaps_rollup), which shows how much of a pre-forked worker is
+    still shared copy-on-write with the master. Elsewhere only peak RSS is
+    available.
+    """
+    status = _read_kb_fields('/proc/self/status', {'VmRSS', 'VmHWM'})
+    rollup = _read_kb_fields(
+        '/proc/self/smaps_rollup',
+        {'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'}
+    )
+
+    if not status:
+        # ru_maxrss is KiB on Linux but bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {'pid': os.getpid(), 'peakRss': peak if os.uname().sysname == 'Darwin' else peak * 1024}
+
+    usage = {
+        'pid': os.getpid(),
+        'rss': status.get('VmRSS', 0),
+        'peakRss': status.get('VmHWM', 0)
+    }
+    if rollup:
+        usage.update({
+            'pss': rollup.get('Pss', 0),
+            'shared': rollup.get('Shared_Clean', 0) + rollup.get('Shared_Dirty', 0),
+            'private': rollup.get('Private_Clean', 0) + rollup.get('Private_Dirty', 0)
+        })
+    return usage
+
+
+def format_memory(usage):
+    """One-line summary for logs"""
+    parts = [f"pid {usage['pid']}"]
+    for key in ('rss', 'shared', 'private', 'pss', 'peakRss'):
+        if key in usage:
+            parts.append(f"{key} {usage[key] / 2 ** 20:.1f} MB")
+    return ', '.join(parts)
@@ -0,0 +1,195 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+# Distinct stacks kept before further new ones are counted as '[truncated]'
+MAX_STACKS = 20000
+
+
+class SamplingProfiler:
+    """Statistical profiler for selected request threads.
+
+    A request is profiled when it is picked at random (sample_rate) or
+    asked for explicitly. While at least one profiled request is running, a
+    sampler thread wakes every interval_ms, reads the current frame of each
+    profiled thread from sys._current_frames() and counts the collapsed
+    stack. The counts render as collapsed-stack text that flamegraph.pl,
+    speedscope or inferno read directly.
+
+    With nothing being profiled the sampler thread sleeps on a condition,
+    so a disabled profiler costs a clock read per request.
+
+    Each process samples its own requests. With settings_path set,
+    configure() also writes the settings there and every process applies
+    changes it finds (checked at most every check_seconds), so a toggle
+    sent to one gunicorn worker reaches all of them.
+    """
+
+    def __init__(self, sample_rate=0.0, interval_ms=5, settings_path=None, check_seconds=2.0):
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.settings_path = settings_path
+        self.check_seconds = check_seconds
+        # Settings left by an earlier run don't override the configured ones
+        self._settings_mtime = self._settings_stat()
+        self._next_check = 0.0
+
+        self._cond = threading.Condition()
+        self._active = {}
+        self._pid = None
+        self._frame_names = {}
+
+        self.stacks = Counter()
+        self.samples = 0
+        self.profiled_requests = 0
+        self.started_at = time.time()
+
+    def configure(self, sample_rate=None, interval_ms=None, reset=False):
+        """Change settings here and, with settings_path, in every other process"""
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError('sampleRate must be between 0 and 1')
+            self.sample_rate = sample_rate
+        if interval_ms is not None:
+            if interval_ms <= 0:
+                raise ValueError('intervalMs must be positive')
+            self.interval = interval_ms / 1000
+        if reset:
+            self.reset()
+        self._publish()
+
+    def _settings_stat(self):
+        try:
+            return os.stat(self.settings_path).st_mtime if self.settings_path else None
+        except OSError:
+            return None
+
+    def _publish(self):
+        if not self.settings_path:
+            return
+        settings = {
+            'sampleRate': self.sample_rate,
+            'intervalMs': self.interval * 1000,
+            'resetAt': self.started_at
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.settings_path)), exist_ok=True)
+        tmp_path = f'{self.settings_path}.tmp-{os.getpid()}'
+        with open(tmp_path, 'w') as f:
+            json.dump(settings, f)
+        os.replace(tmp_path, self.settings_path)
+        self._settings_mtime = self._settings_stat()
+
+    def sync(self):
+        """Apply settings another process published; cheap enough to call per request"""
+        if not self.settings_path:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_seconds
+
+        mtime = self._settings_stat()
+        if mtime is None or mtime == self._settings_mtime:
+            return
+        self._settings_mtime = mtime
+        try:
+            with open(self.settings_path) as f:
+                settings = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.sample_rate = settings['sampleRate']
+        self.interval = settings['intervalMs'] / 1000
+        if settings['resetAt'] > self.started_at:
+            self.reset()
+
+    def should_profile(self):
+        self.sync()
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _ensure_thread(self):
+        # Threads don't survive fork, so every worker process starts its own
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._active.clear()
+        threading.Thread(target=self._run, name='sampling-profiler', daemon=True).start()
+
+    def begin(self, label):
+        """Start sampling the calling thread, with stacks rooted at label"""
+        with self._cond:
+            self._ensure_thread()
+            self._active[threading.get_ident()] = label
+            self.profiled_requests += 1
+            self._cond.notify()
+
+    def end(self):
+        with self._cond:
+            self._active.pop(threading.get_ident(), None)
+
+    def _frame_name(self, code, module):
+        name = self._frame_names.get(code)
+        if name is None:
+            name = self._frame_names[code] = f'{module}:{code.co_name}'.replace(';', ':').replace(' ', '_')
+        return name
+
+    def _collapse(self, frame, label):
+        names = []
+        while frame is not None:
+            names.append(self._frame_name(frame.f_code, frame.f_globals.get('__name__', '?')))
+            frame = frame.f_back
+        names.append(label)
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            with self._cond:
+                while not self._active:
+                    self._cond.wait()
+                active = dict(self._active)
+
+            frames = sys._current_frames()
+            for ident, label in active.items():
+                frame = frames.get(ident)
+                if frame is None or ident == me:
+                    continue
+                stack = self._collapse(frame, label)
+                with self._cond:
+                    if stack in self.stacks or len(self.stacks) < MAX_STACKS:
+                        self.stacks[stack] += 1
+                    else:
+                        self.stacks[f'{label};[truncated]'] += 1
+                    self.samples += 1
+            del frames
+            time.sleep(self.interval)
+
+    def collapsed(self):
+        """'frame;frame;frame count' lines, heaviest first"""
+        with self._cond:
+            items = self.stacks.most_common()
+        return ''.join(f'{stack} {count}\n' for stack, count in items)
+
+    def reset(self):
+        with self._cond:
+            self.stacks.clear()
+            self.samples = 0
+            self.profiled_requests = 0
+            self.started_at = time.time()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'pid': os.getpid(),
+                'enabled': self.sample_rate > 0,
+                'sampleRate': self.sample_rate,
+                'intervalMs': self.interval * 1000,
+                'profiledRequests': self.profiled_requests,
+                'activeRequests': len(self._active),
+                'samples': self.samples,
+                'distinctStacks': len(self.stacks),
+                'since': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at))
+            }
@@ -0,0 +1,217 @@
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+ML_MODEL_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml_model.py')
+
+
+class ModelRetrainer:
+    """Retrains the price model off the request path and hot-swaps it.
+
+    Training and holdout scoring run in a separate, lower-priority process
+    (the ml_model.py CLI), so the serving process only pays for loading the
+    finished artifact. A candidate that misses the holdout thresholds is
+    discarded. An accepted one replaces the live bundle with a single
+    reference assignment, so in-flight requests finish on the model they
+    started with, and it is written to the model path so restarts and other
+    workers pick it up.
+
+    Under a prefork server every worker runs its own retrainer, so runs take
+    an exclusive lock next to the artifact. A worker that gets the lock after
+    another has trained first checks whether that work is still needed (the
+    published artifact may already be current for the new zone rates, or
+    newer than the schedule interval) and, if not, loads it instead of
+    training again. Scheduled retrains go by the artifact's age, so one
+    worker's run resets the schedule for all of them.
+
+    With reload_check_seconds set, each process also watches the artifact
+    file and loads it when another worker (or a deploy) replaces it. stop()
+    ends that thread so a dropped predictor can be freed.
+    """
+
+    def __init__(self, predictor, model_path, zone_rates, min_r2=0.9, max_mape=15.0,
+                 interval_hours=0, reload_check_seconds=0, timeout_seconds=1800):
+        self.predictor = predictor
+        self.model_path = model_path
+        self.zone_rates = zone_rates
+        self.min_r2 = min_r2
+        self.max_mape = max_mape
+        self.interval_hours = interval_hours
+        self.reload_check_seconds = reload_check_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._artifact_mtime = self._mtime()
+        self.state = 'idle'
+        self.last_run = None
+
+    def _mtime(self):
+        try:
+            return os.stat(self.model_path).st_mtime
+        except OSError:
+            return None
+
+    def _artifact_age(self):
+        mtime = self._mtime()
+        return time.time() - mtime if mtime is not None else float('inf')
+
+    @contextmanager
+    def _artifact_lock(self):
+        """Exclusive across processes (and threads), held while a retrain runs"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.model_path)), exist_ok=True)
+        with open(f'{self.model_path}.lock', 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _still_needed(self, run):
+        """False when another process already published what this run would build"""
+        if run['reason'] == 'schedule':
+            return self._artifact_age() >= self.interval_hours * 3600
+        if run['reason'] == 'market data':
+            return self.predictor.read_bundle(self.model_path, zone_rates=run['zoneRates']) is None
+        return True
+
+    def start_background(self):
+        """Start the schedule/watch thread once per process (threads don't survive fork)"""
+        if self._pid == os.getpid() or self._stopped.is_set():
+            return
+        with self._lock:
+            if self._pid == os.getpid() or self._stopped.is_set():
+                return
+            self._pid = os.getpid()
+            if self.interval_hours or self.reload_check_seconds:
+                self._thread = threading.Thread(target=self._background_loop, name='model-retrainer', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """End the schedule/watch thread (a retrain already running still finishes)"""
+        self._stopped.set()
+
+    def _background_loop(self):
+        tick = self.reload_check_seconds or 60
+        while not self._stopped.wait(tick):
+            if self.interval_hours and self.state != 'training' and self._artifact_age() >= self.interval_hours * 3600:
+                self.trigger('schedule')
+            if self.reload_check_seconds and self.state != 'training':
+                self.reload_if_changed()
+
+    def reload_if_changed(self):
+        """Load the artifact if it was replaced since this process last saw it"""
+        mtime = self._mtime()
+        if mtime is None or mtime == self._artifact_mtime:
+            return False
+        self._artifact_mtime = mtime
+
+        zone_rates = self.zone_rates()
+        bundle = self.predictor.read_bundle(self.model_path, zone_rates=zone_rates)
+        # Compared by file, not model_version: two builds within a second share one
+        if bundle is None:
+            return False
+        self.predictor.install(bundle)
+        self.predictor.zone_rates = zone_rates
+        print(f"🔄 Picked up model {bundle.model_version} from {self.model_path}")
+        return True
+
+    def trigger(self, reason='admin'):
+        """Start a retrain in the background; False if one is already running"""
+        with self._lock:
+            if self.state == 'training':
+                return False
+            self.state = 'training'
+            self.last_run = {
+                'reason': reason,
+                'startedAt': datetime.now().isoformat(timespec='seconds'),
+                'zoneRates': dict(self.zone_rates())
+            }
+        threading.Thread(target=self._retrain, args=(self.last_run,), name='model-retrain', daemon=True).start()
+        return True
+
+    def _retrain(self, run):
+        candidate_path = f"{self.model_path}.candidate-{os.getpid()}"
+        started = time.perf_counter()
+        try:
+            with self._artifact_lock():
+                if not self._still_needed(run):
+                    self.reload_if_changed()
+                    run['outcome'] = 'skipped'
+                    run['error'] = 'another process already published a current model'
+                    run['modelVersion'] = self.predictor.model_version
+                    return
+                self._train_candidate(run, candidate_path)
+        except subprocess.CalledProcessError as e:
+            run['outcome'] = 'failed'
+            output = e.stderr.decode(errors='replace').strip().splitlines()
+            run['error'] = output[-1] if output else str(e)
+            print(f"⚠️ Background retrain failed: {run['error']}")
+        except Exception as e:
+            run['outcome'] = 'failed'
+            run['error'] = str(e)
+            print(f"⚠️ Background retrain failed: {e}")
+        finally:
+            if os.path.exists(candidate_path):
+                os.remove(candidate_path)
+            run['durationSeconds'] = round(time.perf_counter() - started, 1)
+            run['finishedAt'] = datetime.now().isoformat(timespec='seconds')
+            self.state = 'idle'
+
+    def _train_candidate(self, run, candidate_path):
+        """Build, check and publish a candidate (called with the artifact lock held)"""
+        subprocess.run(
+            [
+                sys.executable, ML_MODEL_SCRIPT,
+                '--output', candidate_path,
+                '--samples', str(self.predictor.n_samples),
+                '--profile', self.predictor.profile,
+                '--memory-budget-mb', str(self.predictor.memory_budget_mb),
+                '--zone-rates', json.dumps(run['zoneRates']),
+                '--force',
+                '--nice', '10'
+            ],
+            check=True,
+            capture_output=True,
+            timeout=self.timeout_seconds
+        )
+
+        bundle = self.predictor.read_bundle(candidate_path, zone_rates=run['zoneRates'])
+        if bundle is None:
+            raise RuntimeError('candidate artifact could not be loaded')
+        metrics = bundle.metrics
+        run['metrics'] = metrics
+
+        if metrics['r2'] < self.min_r2 or metrics['mape'] > self.max_mape:
+            run['outcome'] = 'rejected'
+            run['error'] = (
+                f"holdout r2 {metrics['r2']} / mape {metrics['mape']}% "
+                f"misses r2 >= {self.min_r2} / mape <= {self.max_mape}%"
+            )
+            return
+
+        self.predictor.install(bundle)
+        self.predictor.zone_rates = run['zoneRates']
+        os.replace(candidate_path, self.model_path)
+        self._artifact_mtime = self._mtime()
+        run['outcome'] = 'swapped'
+        run['modelVersion'] = bundle.model_version
+        print(f"🔁 Model hot-swapped to {bundle.model_version} (holdout r2 {metrics['r2']})")
+
+    def status(self):
+        return {
+            'state': self.state,
+            'modelVersion': self.predictor.model_version,
+            'lastRun': self.last_run,
+            'thresholds': {'minR2': self.min_r2, 'maxMape': self.max_mape},
+            'intervalHours': self.interval_hours,
+            'reloadCheckSeconds': self.reload_check_seconds
+        }
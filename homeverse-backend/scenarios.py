@@ -0,0 +1,127 @@
+import time
+import zlib
+
+import numpy as np
+
+DEFAULT_PATHS = 100000
+MAX_PATHS = 200000
+# Cap on paths x years, so a long horizon gets fewer paths (about 10 MB per array)
+MAX_CELLS = 2500000
+CHUNK_PATHS = 25000
+# Paths simulated and summarized first to estimate how many fit the budget
+PILOT_PATHS = 2000
+
+# Benchmark for "beats a fixed deposit"
+FD_RATE = 7.0
+RENTAL_YIELD = 3.0
+RENTAL_YIELD_SPREAD = 0.4
+PERCENTILES = (10, 50, 90)
+
+
+def zone_volatility(zone_data):
+    """Yearly price-growth volatility for a zone.
+
+    Scales with the zone's own growth rate and with its supply index: an
+    oversupplied market swings more around its trend than a tight one,
+    while strong demand damps the swings a little.
+    """
+    growth = zone_data['growth_rate'] / 100
+    supply = zone_data['supply_index'] / 100
+    demand = zone_data['demand_index'] / 100
+    return growth * (0.5 + supply - 0.25 * demand) * 0.6
+
+
+def _bands(values):
+    """{'p10': [...per year], 'p50': [...], 'p90': [...]} rounded to rupees"""
+    bands = np.percentile(values, PERCENTILES, axis=0)
+    return {f'p{p}': [int(v) for v in band] for p, band in zip(PERCENTILES, bands)}
+
+
+def _summarize(value, rent, price, fd_value, years, base_year):
+    total_return = value + rent - price
+    return {
+        'years': list(range(base_year + 1, base_year + years + 1)),
+        'value': _bands(value),
+        'cumulativeRent': _bands(rent),
+        'roiWithRent': {
+            key: [round(v / price * 100, 2) for v in band]
+            for key, band in _bands(total_return).items()
+        },
+        'probabilityOfLoss': [round(float(p) * 100, 2) for p in (total_return < 0).mean(axis=0)],
+        'probabilityBeatsFD': [round(float(p) * 100, 2) for p in (value + rent >= fd_value).mean(axis=0)]
+    }
+
+
+def simulate(price, zone_data, years, paths=DEFAULT_PATHS, seed=None, budget_ms=250, zone='', base_year=2025):
+    """Monte Carlo growth and rent paths for one property.
+
+    Yearly growth is drawn around the zone's growth rate with
+    zone_volatility(); each path gets its own rental yield around 3% and
+    earns it on the previous year's value. Paths are simulated as
+    (paths x years) float32 arrays in chunks. Paths are capped at MAX_PATHS
+    and MAX_CELLS / years. A pilot chunk is simulated and summarized first,
+    and its timing sets how many paths fit the latency budget, percentiles
+    included; the answer reports how many paths it used.
+    """
+    started = time.perf_counter()
+    years = int(years)
+    if years < 1:
+        raise ValueError('years must be at least 1')
+    paths = max(1, min(int(paths), MAX_PATHS, MAX_CELLS // years))
+    if seed is None:
+        seed = zlib.crc32(f"{zone}/{zone_data['growth_rate']}/{years}".encode())
+    rng = np.random.default_rng(seed)
+    budget = budget_ms / 1000
+
+    mu = np.float32(zone_data['growth_rate'] / 100)
+    sigma = np.float32(zone_volatility(zone_data))
+    price = float(price)
+    fd_value = price * (1 + FD_RATE / 100) ** np.arange(1, years + 1)
+
+    values = []
+    rents = []
+    done = 0
+    target = paths
+    summary_per_path = None
+    while done < target:
+        chunk_started = time.perf_counter()
+        n = min(CHUNK_PATHS if summary_per_path is not None else PILOT_PATHS, target - done)
+        growth = mu + sigma * rng.standard_normal((n, years), dtype=np.float32)
+        value = price * np.cumprod(1 + np.maximum(growth, -0.95), axis=1)
+
+        rental_yield = rng.normal(RENTAL_YIELD, RENTAL_YIELD_SPREAD, (n, 1)).astype(np.float32) / 100
+        previous = np.concatenate([np.full((n, 1), price, dtype=np.float32), value[:, :-1]], axis=1)
+        rent = np.cumsum(np.maximum(rental_yield, 0) * previous, axis=1)
+
+        values.append(value)
+        rents.append(rent)
+        done += n
+
+        now = time.perf_counter()
+        if summary_per_path is None:
+            simulate_per_path = (now - chunk_started) / n
+            _summarize(value, rent, price, fd_value, years, base_year)
+            summary_per_path = (time.perf_counter() - now) / n
+            # Paths whose simulation and summary fit in what is left of the budget
+            remaining = budget - (time.perf_counter() - started)
+            affordable = (remaining + done * simulate_per_path) / (simulate_per_path + summary_per_path)
+            target = max(done, min(paths, int(affordable)))
+        elif now - started + done * summary_per_path > budget:
+            break
+
+    result = {
+        'paths': done,
+        'requestedPaths': paths,
+        'truncated': done < paths,
+        'seed': seed,
+        'assumptions': {
+            'meanGrowth': round(float(mu) * 100, 2),
+            'growthVolatility': round(float(sigma) * 100, 2),
+            'rentalYield': RENTAL_YIELD,
+            'rentalYieldSpread': RENTAL_YIELD_SPREAD,
+            'fixedDepositRate': FD_RATE
+        }
+    }
+    result.update(_summarize(np.concatenate(values), np.concatenate(rents), price, fd_value, years, base_year))
+    result['computeMs'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
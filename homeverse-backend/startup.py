@@ -0,0 +1,129 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class StartupTimeline:
+    """Seconds from the start of app import to each startup milestone"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name, at=None):
+        """Record a milestone once; later marks with the same name are ignored"""
+        if name not in self.marks:
+            self.marks[name] = round((at if at is not None else time.perf_counter()) - self.origin, 4)
+
+    def report(self):
+        milestones = sorted(self.marks.items(), key=lambda item: item[1])
+        previous = 0.0
+        steps = []
+        for name, at in milestones:
+            steps.append({'milestone': name, 'atSeconds': at, 'stepSeconds': round(at - previous, 4)})
+            previous = at
+        return steps
+
+
+# Run in a fresh interpreter: import the app, serve one catalog request, then
+# wait for the model to report ready
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+client.get('/zones')
+first_response = time.perf_counter()
+while client.get('/ready').status_code != 200:
+    time.sleep(0.005)
+ready = time.perf_counter()
+print(json.dumps({
+    'importSeconds': round(imported - started, 3),
+    'firstResponseSeconds': round(first_response - started, 3),
+    'modelReadySeconds': round(ready - started, 3),
+    'timeline': app.startup.report()
+}))
+"""
+
+
+def probe(mode):
+    env = dict(os.environ, MODEL_LOADING=mode)
+    output = subprocess.run([sys.executable, '-c', _PROBE], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Modules app.py no longer imports up front; they load with the model
+DEFERRED_MODULES = ('joblib', 'pandas', 'sklearn.ensemble', 'sklearn.preprocessing')
+
+_IMPORT_PROBE = """
+import importlib, json, sys, time
+times = []
+for name in sys.argv[1:]:
+    started = time.perf_counter()
+    importlib.import_module(name)
+    times.append((name, round(time.perf_counter() - started, 4)))
+print(json.dumps(times))
+"""
+
+
+def app_imports():
+    """Modules app.py imports at the top level, in order"""
+    with open(os.path.join(BACKEND_DIR, 'app.py')) as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def import_times():
+    """Incremental import time of each app.py import (in order), then of the deferred ones"""
+    names = app_imports()
+    output = subprocess.run([sys.executable, '-c', _IMPORT_PROBE] + names + list(DEFERRED_MODULES), cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    times = json.loads(output.strip().splitlines()[-1])
+    return [
+        {'module': name, 'seconds': seconds, 'deferred': name in DEFERRED_MODULES}
+        for name, seconds in times
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report import times and time to first response / model ready')
+    parser.add_argument('--json', action='store_true', help='print raw JSON instead of a summary')
+    args = parser.parse_args()
+
+    results = {
+        'imports': import_times(),
+        'eager': probe('eager'),
+        'background': probe('background')
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print('📦 Incremental import time, in app.py order:')
+    for entry in results['imports']:
+        note = '  (deferred until the model loads)' if entry['deferred'] else ''
+        print(f"   {entry['module']:<28} {entry['seconds'] * 1000:8.1f} ms{note}")
+    for mode in ('eager', 'background'):
+        r = results[mode]
+        print(f"🚀 MODEL_LOADING={mode}: import {r['importSeconds']}s, first response {r['firstResponseSeconds']}s, "
+              f"model ready {r['modelReadySeconds']}s")
+        for step in r['timeline']:
+            print(f"   {step['milestone']:<24} at {step['atSeconds']:.3f}s (+{step['stepSeconds']:.3f}s)")
+
+
+if __name__ == '__main__':
+    main()
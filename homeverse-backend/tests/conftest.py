@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+import pytest
+
+# Point every data file the app writes at a scratch directory before app.py is imported
+DATA_DIR = tempfile.mkdtemp(prefix='homeverse-tests-')
+os.environ.update({
+    'MARKET_DATA_PATH': os.path.join(DATA_DIR, 'market.sqlite3'),
+    'CITY_DATA_DIR': os.path.join(DATA_DIR, 'cities'),
+    'CITY_MODEL_DIR': os.path.join(DATA_DIR, 'city-models'),
+    'COMPARABLES_DIR': os.path.join(DATA_DIR, 'comparables'),
+    'MODEL_PATH': os.path.join(DATA_DIR, 'price_model.joblib'),
+    'PROFILER_SETTINGS_PATH': os.path.join(DATA_DIR, 'profiler.json'),
+    'ADMIN_TOKEN': 'test-token',
+    'CITY_PRELOAD': '0'
+})
+
+@pytest.fixture(scope='session')
+def app_module():
+    import app
+
+    app.ml_predictor.wait_until_loaded()
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def admin_headers():
+    return {'X-Admin-Token': 'test-token'}
@@ -0,0 +1,35 @@
+from benchmarks.micro import latency_summary, time_calls
+from benchmarks.payloads import PayloadFactory
+from benchmarks.run import find_regressions
+from market_seed import LANDMARKS, NAGPUR_ZONES
+
+
+def test_regressions_respect_direction_and_tolerance():
+    baseline = {
+        'micro': {'predict': {'p50Us': 100.0, 'opsPerSecond': 1000.0}},
+        'load': {'/zones': {'p95Ms': 10.0, 'throughput': 500.0}}
+    }
+    results = {
+        'micro': {'predict': {'p50Us': 104.0, 'opsPerSecond': 800.0}, 'new-benchmark': {'p50Us': 1.0}},
+        'load': {'/zones': {'p95Ms': 12.0, 'throughput': 600.0}}
+    }
+    assert find_regressions(results, baseline, tolerance=0.1) == [
+        ('micro', 'predict', 'opsPerSecond', 1000.0, 800.0),
+        ('load', '/zones', 'p95Ms', 10.0, 12.0)
+    ]
+    assert find_regressions(results, baseline, tolerance=0.25) == []
+
+
+def test_latency_summary_and_timing():
+    summary = latency_summary([0.001, 0.002, 0.003], unit='ms')
+    assert summary['count'] == 3 and summary['p50Ms'] == 2.0 and summary['meanMs'] == 2.0
+
+    seen = []
+    timed = time_calls(seen.append, [1, 2, 3], min_seconds=0, warmup=0)
+    assert seen == [1, 2, 3] and timed['count'] == 3 and timed['opsPerSecond'] > 0
+
+
+def test_payloads_are_reproducible():
+    first = PayloadFactory(NAGPUR_ZONES, LANDMARKS, seed=5)
+    second = PayloadFactory(NAGPUR_ZONES, LANDMARKS, seed=5)
+    assert [first.property() for _ in range(20)] == [second.property() for _ in range(20)]
@@ -0,0 +1,75 @@
+import csv
+import json
+
+from bulk_valuation import DEFAULT_COLUMNS, row_to_payload, run
+
+ROWS = [
+    {'id': 'a1', 'location': 'Dharampeth', 'bedrooms': 2, 'sqft': '1000', 'floor': '3.0',
+     'amenities': 'gym; pool', 'property_type_multiplier': '', 'building_age_multiplier': ''},
+    {'id': 'a2', 'location': 'Wardha Road', 'bedrooms': '3.0', 'sqft': '1650', 'floor': '',
+     'amenities': '["gym"]', 'property_type_multiplier': '1.18', 'building_age_multiplier': ''},
+    {'id': 'a3', 'location': 'Civil Lines', 'bedrooms': '2', 'sqft': 'lots', 'floor': '',
+     'amenities': '', 'property_type_multiplier': '', 'building_age_multiplier': ''},
+    {'id': 'a4', 'location': 'Somewhere unknown', 'bedrooms': '1', 'sqft': '540', 'floor': '1',
+     'amenities': '', 'property_type_multiplier': '', 'building_age_multiplier': '0.95'}
+]
+
+
+def test_rows_become_predict_payloads():
+    assert row_to_payload(ROWS[0], DEFAULT_COLUMNS) == {
+        'location': 'Dharampeth', 'bedrooms': 2, 'sqft': '1000', 'floor': 3, 'amenities': ['gym', 'pool']
+    }
+    assert row_to_payload(ROWS[1], DEFAULT_COLUMNS) == {
+        'location': 'Wardha Road', 'bedrooms': 3, 'sqft': '1650', 'amenities': ['gym'],
+        'propertyType': {'multiplier': 1.18}
+    }
+    assert row_to_payload(dict(ROWS[3], bedrooms='4+'), DEFAULT_COLUMNS)['bedrooms'] == '4+'
+
+
+def write_listings(path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        # Repeat the rows so the file spans several chunks
+        for _ in range(3):
+            writer.writerows(ROWS)
+
+
+def test_listings_are_valued_in_order_like_predict(client, tmp_path):
+    listings = str(tmp_path / 'listings.csv')
+    output = str(tmp_path / 'valued.jsonl')
+    write_listings(listings)
+
+    summary = run(listings, output, DEFAULT_COLUMNS, workers=2, chunk_rows=5, progress_seconds=60)
+    assert (summary['rows'], summary['failed']) == (12, 3)
+
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    assert [record['row'] for record in records] == list(range(12))
+    assert [record['id'] for record in records] == [row['id'] for row in ROWS] * 3
+
+    for record in records[:len(ROWS)]:
+        payload = row_to_payload(ROWS[record['row']], DEFAULT_COLUMNS)
+        response = client.post('/predict', json=payload).get_json()
+        assert record['success'] == response['success']
+        if record['success']:
+            assert record['prediction']['price'] == response['prediction']['price']
+            assert record['prediction']['breakdown'] == response['prediction']['breakdown']
+
+    # A '3.0' bedrooms cell is valued as three bedrooms, not parse_property's default of two
+    three = dict(row_to_payload(ROWS[1], DEFAULT_COLUMNS), bedrooms='3')
+    three = client.post('/predict', json=three).get_json()['prediction']
+    assert records[1]['prediction']['price'] == three['price']
+
+
+def test_csv_output(app_module, tmp_path):
+    listings = str(tmp_path / 'listings.csv')
+    output = str(tmp_path / 'valued.csv')
+    write_listings(listings)
+
+    run(listings, output, DEFAULT_COLUMNS, workers=1, output_format='csv', progress_seconds=60)
+    with open(output) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 12
+    assert rows[0]['id'] == 'a1' and rows[0]['success'] == 'True' and float(rows[0]['price']) > 0
+    assert rows[2]['success'] == 'False' and rows[2]['error']
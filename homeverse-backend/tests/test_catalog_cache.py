@@ -0,0 +1,32 @@
+import gzip
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize('path', ['/zones', '/landmarks', '/localities'])
+def test_catalog_bodies_match_their_payloads(app_module, client, path):
+    builders = {
+        '/zones': app_module.build_zones_payload,
+        '/landmarks': app_module.build_landmarks_payload,
+        '/localities': app_module.build_localities_payload
+    }
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.get_json() == json.loads(json.dumps(builders[path](app_module.market_store.current)))
+
+
+def test_etag_revalidation_and_gzip(client):
+    first = client.get('/zones')
+    etag = first.headers['ETag']
+    assert etag.startswith('W/"')
+
+    revalidated = client.get('/zones', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+
+    compressed = client.get('/zones', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] in ('gzip', 'br')
+    if compressed.headers['Content-Encoding'] == 'gzip':
+        assert gzip.decompress(compressed.get_data()) == first.get_data()
+    assert compressed.headers['ETag'] == etag
@@ -0,0 +1,99 @@
+import gc
+import os
+import weakref
+
+import pytest
+
+from city_registry import City, CityRegistry, UnknownCityError
+from market_seed import LANDMARKS, NAGPUR_ZONES
+from market_store import init_database
+from retraining import ModelRetrainer
+
+
+def test_city_file_names_keep_their_case(app_module, client):
+    path = os.path.join(app_module.CITY_DATA_DIR, 'Mumbai.sqlite3')
+    init_database(path, NAGPUR_ZONES, LANDMARKS)
+
+    assert app_module.city_data_files()['mumbai'] == path
+    assert 'mumbai' in app_module.available_cities()
+
+    response = client.post('/predict?city=Mumbai', json={
+        'location': 'Dharampeth',
+        'bedrooms': 2,
+        'sqft': 1000
+    })
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['success']
+    assert app_module.city_registry.get('mumbai', count_hit=False).market_store.path == path
+
+
+class FakePredictor:
+    bundle = None
+
+
+def fake_registry(names, **kwargs):
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        return City(name, None, FakePredictor(), None)
+
+    return CityRegistry(loader, lambda: set(names), **kwargs), loads
+
+
+def test_least_recently_used_unpinned_city_is_evicted():
+    registry, loads = fake_registry(['nagpur', 'pune', 'mumbai', 'delhi'], max_resident=3)
+    registry.add(City('nagpur', None, FakePredictor(), None), pinned=True)
+
+    registry.get('pune')
+    registry.get('Mumbai ')
+    registry.get('pune')
+    registry.get('delhi')
+    assert [city.name for city in registry.resident()] == ['nagpur', 'pune', 'delhi']
+    assert registry.stats()['cities']['mumbai']['evictions'] == 1
+
+    registry.get('mumbai')
+    assert loads == ['pune', 'mumbai', 'delhi', 'mumbai']
+    assert 'nagpur' in [city.name for city in registry.resident()]
+
+    with pytest.raises(UnknownCityError):
+        registry.get('atlantis')
+
+
+def test_evicted_city_is_freed(tmp_path):
+    def loader(name):
+        predictor = FakePredictor()
+        retrainer = ModelRetrainer(predictor, str(tmp_path / f'{name}.joblib'), dict, reload_check_seconds=0.01)
+        retrainer.start_background()
+        return City(name, None, predictor, None, retrainer=retrainer)
+
+    registry = CityRegistry(loader, lambda: {'pune', 'nashik'}, max_resident=1)
+    pune = registry.get('pune')
+    predictor = weakref.ref(pune.predictor)
+    thread = pune.retrainer._thread
+    assert thread.is_alive()
+    del pune
+
+    registry.get('nashik')
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    del thread
+    gc.collect()
+    assert predictor() is None
+
+
+def test_busiest_cities_are_preloaded_next_boot(tmp_path):
+    hits_path = str(tmp_path / 'hits.json')
+    registry, _ = fake_registry(['nagpur', 'pune', 'mumbai'], hits_path=hits_path)
+    for name in ('pune', 'mumbai', 'mumbai'):
+        registry.get(name)
+    registry.save_hits()
+
+    restarted, _ = fake_registry(['nagpur', 'pune', 'mumbai'], hits_path=hits_path)
+    assert restarted.hottest(1) == ['mumbai']
+
+
+def test_unknown_city_is_a_bad_request(client):
+    response = client.post('/predict?city=atlantis', json={'sqft': 1000})
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Unknown city: atlantis'}
@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pytest
+
+from comparables import ZONE_PENALTY, ComparablesIndex
+
+
+def featurize(listing):
+    # zone, bedrooms, sqft, property type, age, floor, amenities
+    return [listing['zone'], listing.get('bedrooms', 2), float(listing['sqft']), 1.0, 1.0, 1, 0]
+
+
+def make_index(tmp_path, **kwargs):
+    return ComparablesIndex(str(tmp_path / 'listings.jsonl'), featurize, check_seconds=0, **kwargs)
+
+
+@pytest.mark.parametrize('sqft', [0, -100, 'big', None, float('nan')])
+def test_insert_rejects_bad_sqft_without_writing(tmp_path, sqft):
+    index = make_index(tmp_path)
+    with pytest.raises(ValueError, match='sqft'):
+        index.insert([{'zone': 0, 'sqft': sqft, 'price': 5000000}])
+    assert not (tmp_path / 'listings.jsonl').exists()
+    assert index.stats()['listings'] == 0
+
+
+def test_refresh_skips_bad_lines_written_by_hand(tmp_path):
+    lines = [{'zone': 0, 'sqft': 0, 'price': 5000000}, {'zone': 0, 'sqft': 1000, 'price': 5000000}]
+    (tmp_path / 'listings.jsonl').write_text(''.join(json.dumps(line) + '\n' for line in lines))
+    index = make_index(tmp_path)
+    assert index.stats()['listings'] == 1
+    assert index.skipped == 1
+    assert [listing['sqft'] for _, _, listing, _ in index.query(featurize({'zone': 0, 'sqft': 900}), 5)] == [1000]
+
+
+def test_other_zones_are_equally_far_whatever_their_order(tmp_path):
+    index = make_index(tmp_path)
+    index.insert([
+        {'zone': 0, 'sqft': 1500, 'price': 1},
+        {'zone': 1, 'sqft': 1000, 'price': 2},
+        {'zone': 5, 'sqft': 1000, 'price': 3}
+    ])
+    found = index.query(featurize({'zone': 0, 'sqft': 1000}), 3)
+    assert [same_zone for _, _, _, same_zone in found] == [True, False, False]
+    # Same-zone listing first even though it is further away on size
+    assert found[0][1] == 1
+    assert found[1][0] == found[2][0] == pytest.approx(ZONE_PENALTY)
+
+
+def test_queries_match_brute_force_across_tree_and_tail(tmp_path):
+    rng = np.random.RandomState(0)
+    index = make_index(tmp_path, rebuild_threshold=50)
+    listings = [
+        {'zone': int(rng.randint(0, 3)), 'bedrooms': int(rng.randint(1, 5)), 'sqft': int(rng.randint(400, 3000)),
+         'price': 1000 + i}
+        for i in range(310)
+    ]
+    for start in range(0, len(listings), 30):
+        index.insert(listings[start:start + 30])
+    stats = index.stats()
+    assert stats['listings'] == 310 and 0 < stats['pending'] < 50
+
+    weights = index._snapshot.weights
+    features = np.array([featurize(listing) for listing in listings])
+    for _ in range(50):
+        probe = featurize({'zone': int(rng.randint(0, 3)), 'bedrooms': int(rng.randint(1, 5)),
+                           'sqft': int(rng.randint(400, 3000))})
+        same = features[:, 0] == probe[0]
+        distances = np.sqrt((((features[:, 1:] - probe[1:]) * weights) ** 2).sum(axis=1)) + np.where(same, 0, ZONE_PENALTY)
+        found = index.query(probe, 5)
+        assert [d for d, _, _, _ in found] == pytest.approx(sorted(distances)[:5])
+
+
+def test_api_rejects_zero_sqft_and_serves_price_per_sqft(client, admin_headers):
+    bad = client.post('/admin/comparables', json={'listings': [{'location': 'Dharampeth', 'sqft': 0, 'price': 9000000}]},
+                      headers=admin_headers)
+    assert bad.status_code == 400
+    assert 'sqft' in bad.get_json()['error']
+
+    good = client.post('/admin/comparables', json={'listings': [{'location': 'Dharampeth', 'sqft': 1200, 'price': 9000000}]},
+                       headers=admin_headers)
+    assert good.status_code == 201
+
+    response = client.post('/comparables', json={'location': 'Dharampeth', 'sqft': 1100, 'k': 1})
+    assert response.status_code == 200
+    comparable = response.get_json()['comparables'][0]
+    assert comparable['pricePerSqft'] == 7500
+    assert comparable['sameZone'] is True
@@ -0,0 +1,34 @@
+import json
+
+PROPERTIES = [
+    {'location': 'Dharampeth', 'bedrooms': 2, 'sqft': 1000},
+    {'location': 'Civil Lines', 'bedrooms': 3, 'sqft': 1500},
+    {'location': 'Sadar', 'bedrooms': 1, 'sqft': 600}
+]
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_stream_matches_the_json_response(client):
+    plain = client.post('/compare', json={'properties': PROPERTIES}).get_json()
+    response = client.post('/compare?stream=1', json={'properties': PROPERTIES})
+    assert response.mimetype == 'application/x-ndjson'
+    records = ndjson(response)
+
+    assert [r['type'] for r in records] == ['comparison'] * 3 + ['summary']
+    assert [r['index'] for r in records[:3]] == [0, 1, 2]
+    assert [{'property': r['property'], 'prediction': r['prediction']} for r in records[:3]] == plain['comparisons']
+    assert records[-1]['insights'] == plain['insights']
+    assert records[-1]['totalCompared'] == plain['totalCompared'] == 3
+
+
+def test_streaming_is_opt_in_and_reports_bad_rows(client):
+    assert client.post('/compare', json={'properties': PROPERTIES}).mimetype == 'application/json'
+
+    response = client.post('/compare', json={'properties': [PROPERTIES[0], {'sqft': 'x'}]},
+                           headers={'Accept': 'application/x-ndjson'})
+    records = ndjson(response)
+    assert [r['type'] for r in records] == ['comparison', 'error', 'summary']
+    assert records[-1]['failed'] == 1
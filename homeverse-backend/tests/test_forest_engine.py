@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from forest_engine import FlatForest, check_parity, parity_rows
+from ml_model import FEATURE_NAMES, PropertyPricePredictor
+
+
+@pytest.fixture(scope='module')
+def predictor(tmp_path_factory):
+    model_path = str(tmp_path_factory.mktemp('model') / 'price_model.joblib')
+    return PropertyPricePredictor(model_path=model_path, n_samples=400, backend='flat', profile='compact')
+
+
+def test_flat_engine_matches_sklearn_on_holdout_and_cut_offs(predictor):
+    bundle = predictor.bundle
+    engine = FlatForest(bundle.model, bundle.scaler)
+    holdout = predictor.generate_training_data(n_samples=300, seed=99)[FEATURE_NAMES].to_numpy(dtype=float)
+    rows = parity_rows(engine, holdout, n_boundary=1000, seed=3)
+    assert len(rows) > len(holdout)
+
+    expected = bundle.model.predict(bundle.scaler.transform(rows))
+    assert np.array_equal(engine.predict(rows), expected)
+    assert np.array_equal([engine.predict_one(row) for row in rows[-50:]], expected[-50:])
+    assert check_parity(engine, bundle.model, bundle.scaler, rows) == (True, 0.0)
+
+
+def test_parity_is_checked_at_build_time_and_stored(predictor, monkeypatch):
+    parity = predictor.bundle.parity
+    assert parity['identical'] and parity['maxDiff'] == 0.0
+    assert predictor.bundle.engine is not None
+
+    # Installing the saved artifact (restart or hot swap) must not rebuild probe data
+    def no_probe_data(*args, **kwargs):
+        raise AssertionError('install regenerated probe data')
+
+    monkeypatch.setattr(predictor, 'generate_training_data', no_probe_data)
+    bundle = predictor.read_bundle(predictor.model_path)
+    assert bundle.parity == parity
+    predictor.install(bundle)
+    assert predictor.bundle is bundle and bundle.engine is not None
+
+
+def test_failed_parity_falls_back_to_sklearn(predictor):
+    bundle = predictor.read_bundle(predictor.model_path)
+    bundle.parity = dict(bundle.parity, identical=False, maxDiff=1.0)
+    predictor.install(bundle)
+    assert bundle.engine is None
+    row = predictor.generate_training_data(n_samples=5, seed=5)[FEATURE_NAMES].to_numpy(dtype=float)[0]
+    price, _ = predictor.predict(row.tolist())
+    assert price > 0
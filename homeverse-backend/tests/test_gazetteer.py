@@ -0,0 +1,34 @@
+import random
+
+from gazetteer import Gazetteer
+from market_seed import LANDMARKS, NAGPUR_ZONES
+
+
+def linear_match(gazetteer, location):
+    """The scan the automaton replaced: first entry, in priority order, named in the text"""
+    text = location.lower()
+    found = [entry for entry in gazetteer.entries if entry[1].lower() in text]
+    if not found:
+        return gazetteer.default_zone, 'low', None, NAGPUR_ZONES[gazetteer.default_zone]['base_price'], None
+    landmark_mult = next((entry[4] for entry in found if entry[0] == 'landmark'), None)
+    return found[0][2], 'high', found[0][1], found[0][3], landmark_mult
+
+
+def test_automaton_agrees_with_a_linear_scan():
+    gazetteer = Gazetteer(NAGPUR_ZONES, LANDMARKS)
+    names = [entry[1] for entry in gazetteer.entries]
+    rng = random.Random(0)
+    locations = ['', 'nowhere in particular', 'Flat near VCA Stadium, Dharampeth', 'SADAR']
+    for _ in range(300):
+        words = rng.sample(names, rng.randint(1, 3)) + ['road', 'near', '2BHK']
+        rng.shuffle(words)
+        locations.append(' '.join(word.upper() if rng.random() < 0.2 else word for word in words))
+
+    for location in locations:
+        assert gazetteer.match(location) == linear_match(gazetteer, location), location
+
+
+def test_fuzzy_matching_is_opt_in():
+    assert Gazetteer(NAGPUR_ZONES, LANDMARKS).match('Dharampet')[1] == 'low'
+    zone, confidence, name, rate, _ = Gazetteer(NAGPUR_ZONES, LANDMARKS, fuzzy=True).match('Dharampet')
+    assert (zone, confidence, name, rate) == ('central', 'medium', 'Dharampeth', 7800)
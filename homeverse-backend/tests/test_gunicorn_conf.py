@@ -0,0 +1,42 @@
+import importlib.util
+import logging
+import os
+from types import SimpleNamespace
+
+from process_stats import format_memory, memory_usage
+
+CONF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+
+def load_conf(monkeypatch, workers):
+    monkeypatch.setenv('WEB_CONCURRENCY', str(workers))
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', CONF_PATH)
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+    return conf
+
+
+def test_app_is_preloaded_for_copy_on_write_sharing(monkeypatch):
+    conf = load_conf(monkeypatch, 3)
+    assert conf.preload_app
+    assert conf.workers == 3
+
+
+def test_forked_workers_predict_single_threaded(app_module, monkeypatch):
+    server = SimpleNamespace(log=logging.getLogger('test'))
+    monkeypatch.setattr(app_module.ml_predictor, 'inference_jobs', None)
+
+    load_conf(monkeypatch, 1).post_fork(server, SimpleNamespace(age=1))
+    assert app_module.ml_predictor.inference_jobs is None
+
+    worker = SimpleNamespace(age=2)
+    load_conf(monkeypatch, 4).post_fork(server, worker)
+    assert app_module.ml_predictor.inference_jobs == 1
+    assert app_module.ml_predictor.model.n_jobs == 1
+    assert worker.requests_seen == 0
+
+
+def test_worker_stats_reports_this_process(client):
+    worker = client.get('/worker-stats').get_json()['worker']
+    assert worker['pid'] == os.getpid()
+    assert format_memory(memory_usage()).startswith(f'pid {os.getpid()}')
@@ -0,0 +1,61 @@
+import threading
+
+import numpy as np
+import pytest
+
+from inference_scheduler import MicroBatcher
+from ml_model import FEATURE_NAMES
+
+
+def run_concurrently(batcher, rows):
+    results = [None] * len(rows)
+    barrier = threading.Barrier(len(rows))
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = batcher.predict(rows[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(rows))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_concurrent_rows_are_batched_and_answered_in_order():
+    calls = []
+
+    def predict_batch(features):
+        calls.append(len(features))
+        return features.sum(axis=1), 'importance'
+
+    batcher = MicroBatcher(predict_batch, window_ms=50, max_batch=8)
+    rows = [[i, i * 10.0] for i in range(20)]
+    results = run_concurrently(batcher, rows)
+
+    assert results == [(i * 11.0, 'importance') for i in range(20)]
+    assert sum(calls) == 20 and max(calls) <= 8
+    assert len(calls) < 20
+    assert batcher.stats()['requests'] == 20
+
+
+def test_a_failed_batch_fails_each_caller():
+    def predict_batch(features):
+        raise ValueError('model exploded')
+
+    batcher = MicroBatcher(predict_batch, window_ms=20)
+    results = run_concurrently(batcher, [[1.0], [2.0], [3.0]])
+    assert all(isinstance(result, ValueError) for result in results)
+    assert batcher.errors >= 1
+
+
+def test_matches_the_model_directly(app_module):
+    predictor = app_module.ml_predictor
+    rows = predictor.generate_training_data(n_samples=12, seed=8)[FEATURE_NAMES].to_numpy(dtype=float)
+    results = run_concurrently(MicroBatcher(predictor.predict_batch, window_ms=20), rows.tolist())
+    direct, _ = predictor.predict_batch(rows)
+    assert np.array([price for price, _ in results]) == pytest.approx(direct, rel=1e-12)
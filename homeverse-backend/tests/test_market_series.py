@@ -0,0 +1,40 @@
+from datetime import date
+
+from market_seed import NAGPUR_ZONES
+from market_series import BASE_YEAR, MarketSeriesStore
+
+
+def test_windows_are_slices_of_the_compounded_history():
+    store = MarketSeriesStore(NAGPUR_ZONES, as_of=date(2026, 3, 15))
+    zone = NAGPUR_ZONES['central']
+    growth = zone['growth_rate'] / 100
+    series = store.series('central')
+
+    monthly = series.monthly(12)
+    assert [m['month'] for m in monthly[:2]] == ['2025-03', '2025-04']
+    assert monthly[-1]['month'] == '2026-02'
+    for steps_back, month in zip(range(12, 0, -1), monthly):
+        assert month['avgPrice'] == int(zone['base_price'] / (1 + growth / 12) ** steps_back)
+    assert series.monthly(3) == monthly[-3:]
+
+    yearly = series.yearly(5)
+    assert [y['year'] for y in yearly] == list(range(BASE_YEAR - 5, BASE_YEAR + 1))
+    assert yearly[-1]['avgPrice'] == zone['base_price']
+    assert yearly[0]['avgPrice'] == int(zone['base_price'] / (1 + growth) ** 5)
+    assert series.yearly(2) == yearly[-3:]
+
+    locality = store.series('central', 'dharampeth')
+    assert locality.current_price == zone['localities']['Dharampeth']
+
+
+def test_trend_endpoints(client):
+    trends = client.get('/market-trends?zones=central,west&months=6').get_json()['trends']
+    assert set(trends) == {'central', 'west'}
+    assert len(trends['west']['historical']) == 6
+
+    history = client.get('/historical-data?locality=Dharampeth&years=3').get_json()
+    assert history['zone'] == 'central' and len(history['data']) == 4
+
+    response = client.get('/market-trends?locality=Atlantis')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unknown locality: Atlantis'
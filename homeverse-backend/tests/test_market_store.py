@@ -0,0 +1,59 @@
+import pytest
+
+from market_seed import LANDMARKS, NAGPUR_ZONES
+from market_store import MarketDataStore, read_market_data, set_locality, set_zone_field
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MarketDataStore(str(tmp_path / 'market.sqlite3'), seed=(NAGPUR_ZONES, LANDMARKS), check_seconds=0)
+
+
+def test_seeded_store_round_trips_the_seed(store):
+    market = store.current
+    assert market.version == 1
+    assert list(market.zones) == list(NAGPUR_ZONES)
+    assert market.zones['central']['localities'] == NAGPUR_ZONES['central']['localities']
+    assert market.matcher.match('Dharampeth')[:4] == ('central', 'high', 'Dharampeth', 7800)
+
+
+def test_edits_are_swapped_in_and_announced(store):
+    seen = []
+    store.listeners.append(lambda previous, current: seen.append((previous.version, current.version)))
+    before = store.current
+    assert not store.reload_if_changed()
+
+    assert set_zone_field(store.path, 'central', 'base_price', 7600) == 2
+    assert set_locality(store.path, 'Nandanvan', 'east', 5400) == 3
+    assert store.reload_if_changed()
+
+    after = store.current
+    assert seen == [(1, 3)]
+    assert after.zones['central']['base_price'] == 7600
+    assert after.fingerprint != before.fingerprint
+    assert after.matcher.match('flat in Nandanvan')[:3] == ('east', 'high', 'Nandanvan')
+    # The old snapshot is untouched for requests still reading it
+    assert before.zones['central']['base_price'] == NAGPUR_ZONES['central']['base_price']
+
+
+def test_bad_edits_are_refused(store):
+    with pytest.raises(ValueError, match="unknown zone field"):
+        set_zone_field(store.path, 'central', 'price; DROP TABLE zones', 1)
+    with pytest.raises(ValueError, match="unknown zone 'atlantis'"):
+        set_zone_field(store.path, 'atlantis', 'base_price', 1)
+    assert read_market_data(store.path).version == 1
+
+
+def test_reload_picks_up_market_data_in_the_app(app_module, client):
+    store = app_module.market_store
+    etag = client.get('/zones').headers['ETag']
+    rate = store.current.zones['west']['growth_rate']
+    try:
+        set_zone_field(store.path, 'west', 'growth_rate', rate + 1)
+        assert store.reload_if_changed()
+        zones = client.get('/zones')
+        assert zones.headers['ETag'] != etag
+        assert zones.get_json()['zones']['west']['growth_rate'] == rate + 1
+    finally:
+        set_zone_field(store.path, 'west', 'growth_rate', rate)
+        store.reload_if_changed()
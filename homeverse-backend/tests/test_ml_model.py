@@ -0,0 +1,81 @@
+import pytest
+
+from ml_model import (
+    DEFAULT_ZONE_RATES,
+    FEATURE_NAMES,
+    PropertyPricePredictor,
+    forest_nbytes,
+    trim_to_budget,
+    tree_nbytes
+)
+
+
+def small_predictor(model_path, **kwargs):
+    return PropertyPricePredictor(model_path=model_path, n_samples=300, profile='compact', **kwargs)
+
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('model') / 'price_model.joblib')
+    small_predictor(path)
+    return path
+
+
+def test_saved_model_loads_without_retraining(model_path, monkeypatch):
+    def no_training(self):
+        raise AssertionError('trained although a current artifact exists')
+
+    monkeypatch.setattr(PropertyPricePredictor, 'train_model', no_training)
+    predictor = small_predictor(model_path)
+    assert predictor.status == 'ready'
+    assert predictor.bundle.metrics['holdoutRows'] > 0
+    assert predictor.predict([0, 3, 1400, 1.0, 1.0, 4, 3])[0] > 0
+
+
+def test_stale_artifact_is_retrained(model_path):
+    rates = {zone: rate * 1.1 for zone, rate in DEFAULT_ZONE_RATES.items()}
+    assert small_predictor(model_path).read_bundle(model_path, zone_rates=rates) is None
+
+    predictor = small_predictor(model_path, zone_rates=rates)
+    assert predictor.bundle.zone_rates == rates
+    assert predictor.read_bundle(model_path, zone_rates=rates) is not None
+
+
+def test_missing_artifact_without_training_leaves_model_unloaded(tmp_path):
+    predictor = small_predictor(str(tmp_path / 'missing.joblib'), train=False)
+    assert predictor.status == 'not_trained'
+
+
+def test_training_data_is_reproducible_and_follows_zone_rates():
+    predictor = PropertyPricePredictor(train=False, n_samples=1000)
+    df = predictor.generate_training_data(seed=3)
+    assert list(df.columns) == FEATURE_NAMES + ['price']
+    assert len(df) == 1000
+    assert df.equals(predictor.generate_training_data(seed=3))
+    assert not df.equals(predictor.generate_training_data(seed=4))
+
+    assert set(df['zone']) == set(range(len(DEFAULT_ZONE_RATES)))
+    assert df['sqft'].between(450, 3499).all() and df['bedrooms'].between(1, 5).all()
+    assert (df['price'] > 0).all()
+
+    # Same draws, every rate doubled: every price doubles
+    doubled = {zone: rate * 2 for zone, rate in DEFAULT_ZONE_RATES.items()}
+    ratio = predictor.generate_training_data(seed=3, zone_rates=doubled)['price'] / df['price']
+    assert ratio.round(9).eq(2).all()
+
+
+def test_memory_budget_keeps_a_prefix_of_trees(tmp_path):
+    full = PropertyPricePredictor(train=False, n_samples=300, profile='compact')
+    full.train_model()
+    sizes = [tree_nbytes(estimator) for estimator in full.model.estimators_]
+
+    budget_mb = sum(sizes[:10]) / 1e6
+    trimmed = small_predictor(str(tmp_path / 'trimmed.joblib'), memory_budget_mb=budget_mb)
+    assert len(trimmed.model.estimators_) == 10
+    assert forest_nbytes(trimmed.model) <= budget_mb * 1e6
+    # Same seed, so the kept trees are the full forest's first ten
+    for kept, original in zip(trimmed.model.estimators_, full.model.estimators_):
+        assert (kept.tree_.threshold == original.tree_.threshold).all()
+
+    with pytest.raises(ValueError, match='A single tree needs'):
+        trim_to_budget(full.model, 1)
@@ -0,0 +1,19 @@
+from ml_model import TRAINING_SAMPLES
+from model_report import render
+
+
+def result(label, rss):
+    return {
+        'label': label, 'trees': 10, 'forestBytes': 1e6, 'fileBytes': 1e6, 'rssBytes': rss, 'flatEngineBytes': 5e5,
+        'singleMs': 1.0, 'flatSingleMs': 0.1, 'batch256Ms': 2.0, 'batch2000Ms': 8.0,
+        'holdout': {'r2': 0.92, 'mape': 12.0, 'rmse': 2.5e6}
+    }
+
+
+def test_summary_states_the_training_size():
+    results = [result('full', 10e6), result('compact', 2e6)]
+    served = render(results, TRAINING_SAMPLES).splitlines()[2]
+    assert served.startswith(f'**Measured on {TRAINING_SAMPLES:,} training rows, the row count')
+
+    reduced = render(results, TRAINING_SAMPLES // 4).splitlines()[2]
+    assert 'so these are not the served artifacts' in reduced
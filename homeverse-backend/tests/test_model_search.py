@@ -0,0 +1,71 @@
+import json
+import os
+
+import sklearn
+
+import ml_model
+from model_search import DEFAULT_GRID, config_label, grid_configs, pareto_front, pick_winner
+
+
+def current_artifact(profile='tuned'):
+    return {
+        'format': ml_model.ARTIFACT_FORMAT,
+        'data_version': ml_model.DATA_VERSION,
+        'training_samples': ml_model.TRAINING_SAMPLES,
+        'profile': profile,
+        'memory_budget_mb': 0,
+        'model_params': ml_model.MODEL_PROFILES[profile],
+        'zone_rates': dict(ml_model.DEFAULT_ZONE_RATES),
+        'sklearn_version': sklearn.__version__,
+        'feature_names': list(ml_model.FEATURE_NAMES)
+    }
+
+
+def test_search_result_is_committed_and_served_as_tuned():
+    path = ml_model.MODEL_SEARCH_PATH
+    assert os.path.relpath(path, os.path.dirname(ml_model.__file__)) == 'model_search.json'
+    with open(path) as f:
+        params = json.load(f)['params']
+    assert ml_model.MODEL_PROFILES['tuned'] == params
+
+    render = open(os.path.join(os.path.dirname(ml_model.__file__), '..', 'render.yaml')).read()
+    assert 'key: MODEL_PROFILE\n        value: tuned' in render
+
+
+def test_artifact_staleness_covers_forest_settings():
+    artifact = current_artifact()
+    assert ml_model.artifact_stale_reason(artifact, profile='tuned', memory_budget_mb=0) is None
+
+    # Artifacts from before model_params was recorded are rebuilt
+    assert ml_model.artifact_stale_reason(dict(artifact, format=4), profile='tuned',
+                                          memory_budget_mb=0) == 'unknown artifact format'
+    changed = dict(artifact, model_params=dict(artifact['model_params'], max_depth=3))
+    assert ml_model.artifact_stale_reason(changed, profile='tuned',
+                                          memory_budget_mb=0) == "'tuned' forest settings changed"
+
+
+def test_winner_is_lowest_mape_on_the_front():
+    def result(label, mape, size, ms):
+        return {'label': label, 'crossValidation': {'mape': mape}, 'forestBytes': size, 'singleMs': ms}
+
+    results = [result('a', 12.0, 10e6, 2.0), result('b', 13.0, 2e6, 0.5), result('c', 14.0, 3e6, 0.6)]
+    front = pareto_front(results)
+    assert front == {'a', 'b'}
+    for r in results:
+        r['pareto'] = r['label'] in front
+    assert pick_winner(results)['label'] == 'a'
+    assert pick_winner(results, max_forest_mb=5)['label'] == 'b'
+
+
+def test_grid_scores_the_incumbent_full_profile():
+    configs = grid_configs(DEFAULT_GRID)
+    assert configs[0] == ml_model.MODEL_PROFILES['full']
+    assert config_label(configs[0]) == 'full (current)'
+    assert len(configs) == 1 + 3 * 3 * 2
+    assert len(grid_configs(dict(DEFAULT_GRID, min_samples_leaf=[2]), incumbent=configs[1])) == 9
+
+
+def test_search_figures_are_only_reported_for_the_same_sample_count():
+    search = {'trainingSamples': 2000, 'crossValidation': {'mape': 12.0}}
+    assert ml_model.search_cross_validation(2000, search) == {'mape': 12.0}
+    assert ml_model.search_cross_validation(50000, search) is None
@@ -0,0 +1,40 @@
+import math
+
+import pytest
+
+
+@pytest.mark.parametrize('price', [0, -2500000, 'nan'])
+def test_non_positive_price_is_rejected(client, price):
+    response = client.post('/portfolio-analysis', json={
+        'holdings': [{'price': 5000000, 'zone': 'central'}, {'price': price, 'zone': 'central'}],
+        'years': 5
+    })
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Each holding needs a positive price'}
+
+
+def test_portfolio_roi_is_finite(client):
+    response = client.post('/portfolio-analysis', json={
+        'holdings': [{'price': 5000000, 'zone': 'central'}, {'price': 8000000, 'zone': 'central'}],
+        'years': 3
+    })
+    assert response.status_code == 200
+    portfolio = response.get_json()['portfolio']
+    assert portfolio['totalInvested'] == 13000000
+    assert all(math.isfinite(p['roi']) and p['roi'] > 0 for p in portfolio['projections'])
+
+
+def test_holdings_match_investment_analysis(client):
+    holdings = [{'id': 'a', 'price': 5000000, 'zone': 'central'}, {'id': 'b', 'price': 7300000, 'zone': 'west'}]
+    portfolio = client.post('/portfolio-analysis', json={'holdings': holdings, 'years': 10}).get_json()
+
+    for holding, result in zip(holdings, portfolio['holdings']):
+        single = client.post('/investment-analysis', json=holding).get_json()['analysis']
+        assert result['id'] == holding['id']
+        assert result['projections'] == single['projections']
+        assert (result['investmentScore'], result['recommendation']) == (
+            single['investmentScore'], single['recommendation'])
+
+    total = portfolio['portfolio']
+    assert total['projections'][-1]['value'] == pytest.approx(
+        sum(h['finalValue'] for h in portfolio['holdings']), abs=2)
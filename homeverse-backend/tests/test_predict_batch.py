@@ -0,0 +1,33 @@
+PROPERTIES = [
+    {'location': 'Dharampeth', 'bedrooms': 2, 'sqft': 1000},
+    {'location': 'Wardha Road', 'bedrooms': 3, 'sqft': 1650, 'floor': 6, 'amenities': ['gym', 'pool']},
+    {'location': 'Somewhere unknown', 'bedrooms': 1, 'sqft': 540, 'propertyType': {'multiplier': 1.18}}
+]
+
+
+def test_batch_matches_single_predictions(client):
+    response = client.post('/predict-batch', json={'properties': PROPERTIES})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['total'], body['succeeded'], body['failed']) == (3, 3, 0)
+
+    for prop, result in zip(PROPERTIES, body['results']):
+        single = client.post('/predict', json=prop).get_json()['prediction']
+        assert result['success']
+        assert result['prediction']['price'] == single['price']
+        assert result['prediction']['breakdown'] == single['breakdown']
+
+
+def test_bad_items_fail_alone(client):
+    response = client.post('/predict-batch', json={'properties': [PROPERTIES[0], {'sqft': 'x'}, 'not an object']})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [r['success'] for r in body['results']] == [True, False, False]
+    assert body['results'][1]['error']
+
+
+def test_oversized_batch_is_rejected(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_BATCH_SIZE', 2)
+    response = client.post('/predict-batch', json={'properties': PROPERTIES})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Batch too large: 3 properties (max 2)'
@@ -0,0 +1,61 @@
+from city_registry import City, CityRegistry
+from prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put('a', 1, 'v1')
+    cache.put('b', 2, 'v1')
+    assert cache.get('a', 'v1') == 1
+    cache.put('c', 3, 'v1')
+    # 'b' was least recently used
+    assert cache.get('b', 'v1') is None
+    assert cache.get('a', 'v1') == 1
+
+    clock.now = 10
+    assert cache.get('a', 'v1') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['evictions'], stats['expirations']) == (2, 1, 1)
+
+
+def test_new_version_drops_everything():
+    cache = PredictionCache()
+    cache.put('a', 1, ('model-1', 'market-1'))
+    assert cache.get('a', ('model-2', 'market-1')) is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_equivalent_payloads_share_an_entry(app_module, client):
+    cache = app_module.prediction_cache
+    cache.clear()
+    first = client.post('/predict', json={'location': 'Ramdaspeth', 'bedrooms': 2, 'sqft': 1100}).get_json()
+    hits = cache.hits
+    # Same inputs once normalized: case, number formatting and defaults
+    second = client.post('/predict', json={
+        'location': 'RAMDASPETH', 'bedrooms': 2, 'sqft': 1100.0, 'floor': 1, 'amenities': []
+    }).get_json()
+    assert cache.hits == hits + 1
+    assert second['prediction'] == first['prediction']
+
+
+def test_cache_stats_cover_every_resident_city(app_module, client, monkeypatch):
+    registry = CityRegistry(app_module.load_city, app_module.available_cities)
+    registry.add(app_module.nagpur, pinned=True)
+    pune_cache = PredictionCache()
+    pune_cache.put('a', 1, 'v1')
+    registry.add(City('pune', None, app_module.ml_predictor, pune_cache))
+    monkeypatch.setattr(app_module, 'city_registry', registry)
+
+    body = client.get('/cache-stats').get_json()
+    assert body['predictionCache'] == body['cities']['nagpur']
+    assert set(body['cities']) == {'nagpur', 'pune'}
+    assert body['cities']['pune']['size'] == 1
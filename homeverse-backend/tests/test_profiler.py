@@ -0,0 +1,71 @@
+import os
+import time
+
+from profiler import SamplingProfiler
+
+
+def test_settings_reach_other_workers(tmp_path):
+    path = str(tmp_path / 'profiler.json')
+    first = SamplingProfiler(settings_path=path, check_seconds=0)
+    second = SamplingProfiler(settings_path=path, check_seconds=0)
+
+    first.configure(sample_rate=0.25, interval_ms=10)
+    second.should_profile()
+    assert second.sample_rate == 0.25
+    assert second.interval == 0.01
+
+    second.stacks['GET:/zones;app:zones'] += 3
+    second.samples = 3
+    first.configure(reset=True)
+    second.sync()
+    assert second.samples == 0 and not second.stacks
+    assert second.sample_rate == 0.25
+
+
+def test_settings_from_an_earlier_run_are_ignored(tmp_path):
+    path = str(tmp_path / 'profiler.json')
+    SamplingProfiler(settings_path=path).configure(sample_rate=1.0)
+
+    restarted = SamplingProfiler(sample_rate=0.0, settings_path=path, check_seconds=0)
+    assert not restarted.should_profile()
+    assert restarted.sample_rate == 0.0
+
+
+def test_admin_endpoints_report_the_worker(client, admin_headers):
+    response = client.post('/admin/profiler', json={'sampleRate': 0.5}, headers=admin_headers)
+    assert response.status_code == 200
+    profiler = response.get_json()['profiler']
+    assert profiler['pid'] == os.getpid()
+    assert profiler['sampleRate'] == 0.5
+    assert os.path.exists(os.environ['PROFILER_SETTINGS_PATH'])
+
+    collapsed = client.get('/admin/profiler/collapsed', headers=admin_headers)
+    assert collapsed.headers['X-Profiler-Pid'] == str(os.getpid())
+
+    response = client.post('/admin/profiler', json={'sampleRate': 0, 'reset': True}, headers=admin_headers)
+    assert response.get_json()['profiler']['samples'] == 0
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+def test_profiled_requests_are_sampled_as_collapsed_stacks():
+    profiler = SamplingProfiler(interval_ms=1)
+    profiler.begin('POST:/predict')
+    busy_loop(0.2)
+    profiler.end()
+
+    stats = profiler.stats()
+    assert stats['profiledRequests'] == 1 and stats['activeRequests'] == 0
+    assert stats['samples'] > 0
+    lines = profiler.collapsed().splitlines()
+    assert all(line.startswith('POST:/predict;') for line in lines)
+    assert any('test_profiler:busy_loop' in line for line in lines)
+
+    time.sleep(0.05)
+    samples = profiler.samples
+    busy_loop(0.05)
+    assert profiler.samples == samples
@@ -0,0 +1,63 @@
+import os
+
+from metrics import MetricsRegistry
+
+
+def metric_lines(client, name):
+    return [line for line in client.get('/metrics').get_data(as_text=True).splitlines() if line.startswith(name)]
+
+
+def test_requests_refused_while_loading_are_counted_and_leave_gauge_at_zero(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module.ml_predictor, 'loading', True)
+    for _ in range(3):
+        response = client.post('/predict', json={'location': 'Dharampeth', 'sqft': 1200})
+        assert response.status_code == 503
+
+    # The scrape itself is the only request in flight
+    assert metric_lines(client, 'homeverse_http_requests_in_flight') == [
+        f'homeverse_http_requests_in_flight{{pid="{os.getpid()}"}} 1'
+    ]
+    refused = [line for line in metric_lines(client, 'homeverse_http_requests_total')
+               if 'route="/predict"' in line and 'status="503"' in line]
+    assert refused and refused[0].endswith(' 3')
+
+
+def test_in_flight_gauge_returns_to_zero_after_requests(app_module, client):
+    client.get('/zones')
+    client.post('/predict', json={'location': 'Dharampeth', 'sqft': 1200})
+    assert app_module.requests_in_flight._values.get((), 0) == 0
+
+
+def test_series_carry_the_scraping_workers_pid(monkeypatch):
+    registry = MetricsRegistry()
+    registry.counter('requests_total', 'Requests', ('route',)).inc('/predict')
+    registry.histogram('seconds', 'Latency', buckets=(0.1,)).observe(0.05)
+    registry.gauge('up', 'Up', callback=lambda: 1)
+
+    # Read at scrape time, so workers forked after the registry was built report their own pid
+    monkeypatch.setattr(os, 'getpid', lambda: 4242)
+    lines = registry.render().splitlines()
+    assert 'requests_total{route="/predict",pid="4242"} 1' in lines
+    assert 'seconds_bucket{pid="4242",le="0.1"} 1' in lines
+    assert 'seconds_count{pid="4242"} 1' in lines
+    assert 'up{pid="4242"} 1' in lines
+
+    plain = MetricsRegistry(pid_label=False)
+    plain.gauge('up', 'Up', callback=lambda: 1)
+    assert plain.render().splitlines()[-1] == 'up 1'
+
+
+def test_pricing_stages_and_requests_are_timed(app_module, client):
+    app_module.prediction_cache.clear()
+    client.post('/predict', json={'location': 'Mahal', 'bedrooms': 4, 'sqft': 2100})
+
+    def count(stage):
+        # Histogram series are per-bucket counts followed by the sum
+        return sum(app_module.stage_seconds._values.get((stage,), [0, 0.0])[:-1])
+
+    for stage in ('parse_payload', 'predict_zone', 'cache_lookup', 'market_calc', 'build_prediction',
+                  'json_serialize'):
+        assert count(stage) > 0, stage
+    durations = [line for line in metric_lines(client, 'homeverse_http_request_duration_seconds_count')
+                 if 'route="/predict"' in line]
+    assert durations and not durations[0].endswith(' 0')
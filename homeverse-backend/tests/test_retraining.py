@@ -0,0 +1,82 @@
+import os
+import time
+
+from ml_model import DEFAULT_ZONE_RATES, PropertyPricePredictor
+from retraining import ModelRetrainer
+
+SAMPLES = 300
+
+
+def wait_idle(*retrainers, timeout=120):
+    deadline = time.monotonic() + timeout
+    while any(r.state == 'training' for r in retrainers):
+        assert time.monotonic() < deadline, 'retrain did not finish'
+        time.sleep(0.05)
+
+
+def worker(model_path, zone_rates, **kwargs):
+    """A retrainer as one gunicorn worker would have it"""
+    predictor = PropertyPricePredictor(model_path=model_path, n_samples=SAMPLES, zone_rates=zone_rates())
+    return ModelRetrainer(predictor, model_path, zone_rates, min_r2=0, max_mape=100, **kwargs)
+
+
+def test_market_data_change_trains_once_across_workers(tmp_path):
+    model_path = str(tmp_path / 'price_model.joblib')
+    rates = dict(DEFAULT_ZONE_RATES)
+    workers = [worker(model_path, lambda: rates) for _ in range(3)]
+
+    rates['central'] += 500
+    for retrainer in workers:
+        assert retrainer.trigger('market data')
+    wait_idle(*workers)
+
+    outcomes = sorted(retrainer.last_run['outcome'] for retrainer in workers)
+    assert outcomes == ['skipped', 'skipped', 'swapped']
+    # Every worker ends up serving the one published model, trained on the new rates
+    versions = {retrainer.predictor.model_version for retrainer in workers}
+    assert len(versions) == 1
+    assert all(retrainer.predictor.zone_rates == rates for retrainer in workers)
+
+
+def test_scheduled_retrain_is_skipped_when_another_worker_just_published(tmp_path):
+    model_path = str(tmp_path / 'price_model.joblib')
+    retrainer = worker(model_path, lambda: DEFAULT_ZONE_RATES, interval_hours=1)
+    assert retrainer.trigger('schedule')
+    wait_idle(retrainer)
+    assert retrainer.last_run['outcome'] == 'skipped'
+
+
+def test_admin_retrain_in_one_worker_reaches_the_others(tmp_path):
+    model_path = str(tmp_path / 'price_model.joblib')
+    first, second = (worker(model_path, lambda: DEFAULT_ZONE_RATES) for _ in range(2))
+    assert first.trigger('admin')
+    wait_idle(first)
+    assert first.last_run['outcome'] == 'swapped'
+
+    assert second.reload_if_changed()
+    assert second.predictor.model_version == first.predictor.model_version
+
+
+def test_app_watches_the_artifact_by_default(app_module):
+    assert app_module.model_retrainer.reload_check_seconds > 0
+
+
+def test_candidate_missing_the_thresholds_is_discarded(tmp_path):
+    model_path = str(tmp_path / 'price_model.joblib')
+    retrainer = worker(model_path, lambda: DEFAULT_ZONE_RATES)
+    retrainer.min_r2 = 1.01
+    live = retrainer.predictor.bundle
+    mtime = os.stat(model_path).st_mtime
+
+    assert retrainer.trigger('admin')
+    wait_idle(retrainer)
+    assert retrainer.last_run['outcome'] == 'rejected'
+    assert 'misses r2 >= 1.01' in retrainer.last_run['error']
+    assert retrainer.predictor.bundle is live
+    assert os.stat(model_path).st_mtime == mtime
+    assert not [name for name in os.listdir(tmp_path) if '.candidate-' in name]
+
+
+def test_admin_retrain_needs_the_token(client):
+    assert client.post('/admin/retrain').status_code == 403
+    assert client.get('/admin/retrain', headers={'X-Admin-Token': 'wrong'}).status_code == 403
@@ -0,0 +1,46 @@
+import scenarios
+
+ZONE = {'growth_rate': 8.0, 'supply_index': 60, 'demand_index': 80}
+
+
+def test_paths_are_capped_server_side():
+    result = scenarios.simulate(5000000, ZONE, 10, paths=10 ** 7, budget_ms=10000)
+    assert result['requestedPaths'] == scenarios.MAX_PATHS
+
+    result = scenarios.simulate(5000000, ZONE, 30, paths=10 ** 7, budget_ms=10000)
+    assert result['requestedPaths'] == scenarios.MAX_CELLS // 30
+
+
+def test_budget_covers_the_summary():
+    # The old chunk check let paths=1000000 run ~1.3 s against a 250 ms budget
+    result = scenarios.simulate(5000000, ZONE, 10, paths=10 ** 6, budget_ms=50)
+    assert result['truncated']
+    assert scenarios.PILOT_PATHS <= result['paths'] < result['requestedPaths']
+    assert result['computeMs'] < 150
+    assert len(result['value']['p50']) == 10
+
+
+def test_same_seed_same_answer():
+    first = scenarios.simulate(5000000, ZONE, 5, paths=5000, seed=7, budget_ms=10000)
+    second = scenarios.simulate(5000000, ZONE, 5, paths=5000, seed=7, budget_ms=10000)
+    assert not first['truncated']
+    for key in ('value', 'cumulativeRent', 'roiWithRent', 'probabilityOfLoss', 'probabilityBeatsFD'):
+        assert first[key] == second[key]
+
+
+def test_investment_endpoints_add_scenarios_on_request(client):
+    plain = client.post('/investment-analysis', json={'price': 6000000, 'zone': 'west'}).get_json()
+    assert 'scenarioAnalysis' not in plain['analysis']
+
+    body = client.post('/investment-analysis', json={
+        'price': 6000000, 'zone': 'west', 'scenarios': True, 'paths': 5000, 'seed': 1
+    }).get_json()
+    scenario = body['analysis']['scenarioAnalysis']
+    assert scenario['paths'] == 5000 and len(scenario['years']) == 10
+    for low, mid, high in zip(*(scenario['value'][p] for p in ('p10', 'p50', 'p90'))):
+        assert low <= mid <= high
+
+    roi = client.post('/roi-calculator', json={
+        'purchasePrice': 4000000, 'holdingPeriod': 3, 'scenarios': True, 'paths': 2000
+    }).get_json()
+    assert len(roi['calculation']['scenarios']['years']) == 3
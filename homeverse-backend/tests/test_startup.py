@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+from ml_model import PropertyPricePredictor
+
+
+def test_model_module_defers_heavy_imports():
+    imported = subprocess.run(
+        [sys.executable, '-c', "import sys, ml_model; print(sorted({'sklearn', 'pandas', 'joblib'} & set(sys.modules)))"],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert imported == '[]'
+
+
+def test_background_load_reports_loading_then_ready(tmp_path):
+    predictor = PropertyPricePredictor(model_path=str(tmp_path / 'model.joblib'), n_samples=300, profile='compact',
+                                       background=True)
+    assert predictor.status in ('loading', 'ready')
+    assert predictor.wait_until_loaded(timeout=120)
+    assert predictor.status == 'ready' and not predictor.loading
+
+
+def test_ready_probe(app_module, client, monkeypatch):
+    response = client.get('/ready')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['ready'] and body['model'] == 'ready'
+    assert body['startup']
+
+    monkeypatch.setattr(app_module.ml_predictor, 'bundle', None)
+    monkeypatch.setattr(app_module.ml_predictor, 'loading', True)
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.get_json()['model'] == 'loading'
+    # Catalog endpoints don't need the model
+    assert client.get('/zones').status_code == 200
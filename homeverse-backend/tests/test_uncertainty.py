@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from ml_model import FEATURE_NAMES, SPREAD_QUANTILES, tree_spread
+
+
+def test_tree_spread_matches_numpy():
+    values = np.random.RandomState(0).normal(5e6, 4e5, (40, 37))
+    spread = tree_spread(values)
+    assert spread['trees'] == 37
+    assert np.allclose(spread['quantiles'], np.quantile(values, SPREAD_QUANTILES, axis=1).T)
+    assert np.allclose(spread['std'], values.std(axis=1))
+    assert np.allclose(spread['mean'], values.mean(axis=1))
+
+
+def test_spread_mean_is_the_forest_prediction(app_module):
+    predictor = app_module.ml_predictor
+    rows = predictor.generate_training_data(n_samples=30, seed=11)[FEATURE_NAMES].to_numpy(dtype=float)
+    spread, _ = predictor.predict_spread(rows)
+    predicted = predictor.model.predict(predictor.scaler.transform(rows))
+    assert spread['mean'] == pytest.approx(predicted, rel=1e-9)
+
+
+def test_uncertainty_mode_in_predict(client):
+    payload = {'location': 'Civil Lines', 'bedrooms': 3, 'sqft': 1800}
+    plain = client.post('/predict', json=payload).get_json()['prediction']
+    assert 'uncertainty' not in plain
+
+    prediction = client.post('/predict', json=dict(payload, uncertainty=True)).get_json()['prediction']
+    uncertainty = prediction['uncertainty']
+    labels = ['p5', 'p25', 'p50', 'p75', 'p95']
+    assert set(uncertainty['mlQuantiles']) == set(labels)
+    quantiles = [uncertainty['mlQuantiles'][label] for label in labels]
+    prices = [uncertainty['priceRange'][label] for label in labels]
+    assert quantiles == sorted(quantiles) and prices == sorted(prices)
+    assert prices[0] <= prediction['price'] <= prices[-1]
+    assert abs(prediction['breakdown']['mlPrediction'] - plain['breakdown']['mlPrediction']) <= 1
+
+    batch = client.post('/predict-batch', json={'properties': [payload], 'uncertainty': True}).get_json()
+    assert batch['results'][0]['prediction']['uncertainty'] == uncertainty